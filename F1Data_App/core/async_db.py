@@ -0,0 +1,120 @@
+# G:\Learning\F1Data\F1Data_App\core\async_db.py
+# Acesso assíncrono ao PostgreSQL para as views async (servidas via ASGI, ver f1data_project/asgi.py).
+# O ORM assíncrono do Django (aget, aiterator, ...) ainda executa cada consulta numa única thread
+# compartilhada, então consultas lentas de telemetria continuariam enfileiradas. Aqui as consultas
+# continuam sendo montadas com o ORM (queryset.query.sql_with_params()), mas são executadas num pool
+# de conexões psycopg 3 próprio, com I/O não bloqueante: um processo mantém várias consultas em
+# andamento ao mesmo tempo, limitadas por ASYNC_DB_POOL_MAX_SIZE.
+import asyncio
+import itertools
+
+from django.conf import settings
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+# Um pool por event loop (conexões async não podem ser usadas fora do loop em que foram abertas)
+_pools = {}
+_pool_locks = {}
+_cursor_ids = itertools.count(1)
+
+
+def pool_conninfo():
+    """String de conexão a partir de DATABASES['default'], em UTC como as conexões do Django (USE_TZ=True)."""
+    db = settings.DATABASES['default']
+    params = {
+        'dbname': db.get('NAME'),
+        'user': db.get('USER'),
+        'password': db.get('PASSWORD'),
+        'host': db.get('HOST'),
+        'port': db.get('PORT'),
+        'client_encoding': db.get('OPTIONS', {}).get('client_encoding', 'UTF8'),
+        'options': '-c TimeZone=UTC',
+    }
+    return make_conninfo(**{k: v for k, v in params.items() if v not in (None, '')})
+
+
+async def get_pool():
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is not None:
+        return pool
+    # Várias corrotinas podem chegar aqui antes de o pool abrir: só a primeira cria o pool,
+    # as demais esperam o lock e encontram o pool já aberto
+    async with _pool_locks.setdefault(loop, asyncio.Lock()):
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = AsyncConnectionPool(
+                pool_conninfo(),
+                min_size=settings.ASYNC_DB_POOL_MIN_SIZE,
+                max_size=settings.ASYNC_DB_POOL_MAX_SIZE,
+                timeout=settings.ASYNC_DB_POOL_TIMEOUT,
+                check=AsyncConnectionPool.check_connection, # Descarta conexões derrubadas antes de entregá-las
+                open=False,
+            )
+            await pool.open()
+            _pools[loop] = pool
+    return pool
+
+
+async def close_pools():
+    for pool in list(_pools.values()):
+        await pool.close()
+    _pools.clear()
+    _pool_locks.clear()
+
+
+def compile_queryset(queryset):
+    """(sql, params) do queryset, como o Django o executaria."""
+    return queryset.query.sql_with_params()
+
+
+async def fetch_all(queryset):
+    """Todas as linhas do queryset como tuplas (use com values_list)."""
+    sql, params = compile_queryset(queryset)
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        cursor = await conn.execute(sql, params)
+        return await cursor.fetchall()
+
+
+async def fetch_dicts(queryset):
+    """Todas as linhas do queryset como dicts (use com values; as chaves são os aliases da consulta)."""
+    sql, params = compile_queryset(queryset)
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cursor:
+            await cursor.execute(sql, params)
+            return await cursor.fetchall()
+
+
+async def fetch_one(queryset):
+    """Primeira linha do queryset (tupla), ou None."""
+    sql, params = compile_queryset(queryset[:1])
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        cursor = await conn.execute(sql, params)
+        return await cursor.fetchone()
+
+
+async def exists(queryset):
+    return await fetch_one(queryset.values_list('pk')) is not None
+
+
+async def iter_chunks(queryset, chunk_size):
+    """
+    Versão async de telemetry.iter_chunks: cursor do lado do servidor (cursor nomeado numa
+    transação) que devolve listas de até 'chunk_size' tuplas. A conexão volta ao pool quando
+    o gerador termina ou é fechado (cliente desconectado).
+    """
+    sql, params = compile_queryset(queryset)
+    pool = await get_pool()
+    async with pool.connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor(name=f'f1data_stream_{next(_cursor_ids)}') as cursor:
+                await cursor.execute(sql, params)
+                while True:
+                    chunk = await cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
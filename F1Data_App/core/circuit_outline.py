@@ -0,0 +1,111 @@
+# G:\Learning\F1Data\F1Data_App\core\circuit_outline.py
+# Traçado do circuito derivado da tabela location.
+# Usa uma única volta limpa (a volta mais rápida da sessão, que não é volta de saída dos boxes),
+# suaviza com média móvel circular e simplifica para algumas centenas de pontos.
+# O resultado fica em CircuitOutline (um registro por circuit_key) e é calculado uma vez só, pela
+# importação da location ou pelo comando build_circuit_outline (o endpoint só lê a tabela).
+from datetime import timedelta
+
+import numpy as np
+
+from .downsampling import path_indices
+from .models import CircuitOutline, Laps, Location, Sessions
+
+OUTLINE_POINTS = 300
+SMOOTHING_WINDOW = 5
+
+
+def find_reference_lap(session_key):
+    """Volta mais rápida e limpa da sessão (com date_start e lap_duration conhecidos)."""
+    return (
+        Laps.objects.filter(
+            session_key=session_key,
+            date_start__isnull=False,
+            lap_duration__isnull=False,
+        )
+        .exclude(is_pit_out_lap=True)
+        .order_by('lap_duration')
+        .values('driver_number', 'lap_number', 'date_start', 'lap_duration')
+        .first()
+    )
+
+
+def smooth_closed_path(xy, window=SMOOTHING_WINDOW):
+    """Média móvel circular (o traçado é fechado, então as bordas dão a volta)."""
+    if xy.shape[0] <= window:
+        return xy
+    pad = window // 2
+    kernel = np.ones(window) / window
+    padded = np.concatenate((xy[-pad:], xy, xy[:pad]))
+    return np.column_stack([np.convolve(padded[:, i], kernel, mode='valid') for i in range(2)])
+
+
+def compute_outline(session_key):
+    """
+    Calcula o traçado a partir de uma sessão. Devolve um dict com os campos de
+    CircuitOutline (sem circuit_key) ou None se a sessão não tiver volta/location suficientes.
+    """
+    lap = find_reference_lap(session_key)
+    if not lap:
+        return None
+
+    lap_end = lap['date_start'] + timedelta(seconds=float(lap['lap_duration']))
+    rows = list(
+        Location.objects.filter(
+            session_key=session_key,
+            driver_number=lap['driver_number'],
+            date__gte=lap['date_start'],
+            date__lt=lap_end,
+        )
+        .exclude(x=0, y=0)
+        .order_by('date')
+        .values_list('x', 'y')
+    )
+    xy = np.array(rows, dtype=np.float64)
+    if xy.shape[0] < 10 or np.isnan(xy).any():
+        return None
+
+    xy = smooth_closed_path(xy)
+    xy = xy[path_indices(xy[:, 0], xy[:, 1], OUTLINE_POINTS)]
+    points = np.rint(xy).astype(int).tolist()
+
+    # Linha de largada/chegada: primeiro ponto da volta e a direção do movimento ali
+    direction = xy[min(1, len(xy) - 1)] - xy[0]
+    norm = float(np.hypot(*direction)) or 1.0
+    return {
+        'session_key': session_key,
+        'driver_number': lap['driver_number'],
+        'lap_number': lap['lap_number'],
+        'points': points,
+        'start_finish': {
+            'x': points[0][0],
+            'y': points[0][1],
+            'dx': round(float(direction[0]) / norm, 4),
+            'dy': round(float(direction[1]) / norm, 4),
+        },
+    }
+
+
+def ensure_circuit_outline(circuit_key, force=False):
+    """
+    Devolve o CircuitOutline do circuito, calculando-o a partir da sessão mais recente
+    do circuito que tenha dados suficientes, caso ainda não exista (ou force=True).
+    """
+    if circuit_key is None:
+        return None
+    if not force:
+        outline = CircuitOutline.objects.filter(circuit_key=circuit_key).first()
+        if outline:
+            return outline
+
+    session_keys = (
+        Sessions.objects.filter(circuit_key=circuit_key)
+        .order_by('-date_start')
+        .values_list('session_key', flat=True)
+    )
+    for session_key in session_keys:
+        fields = compute_outline(session_key)
+        if fields:
+            outline, _ = CircuitOutline.objects.update_or_create(circuit_key=circuit_key, defaults=fields)
+            return outline
+    return None
@@ -0,0 +1,175 @@
+# G:\Learning\F1Data\F1Data_App\core\classification.py
+# Classificação da sessão (resultado ordenado + posições em Q1/Q2 + dados do piloto).
+# É calculada uma vez, na importação dos resultados (e dos pilotos), e gravada em
+# SessionClassification; o endpoint de resultados só lê a tabela já ordenada.
+import math
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Drivers, SessionClassification, SessionResult, Sessions
+
+# --- CONSTANTES PARA ORDENAÇÃO ---
+POS_MAX_FINISHER = 99
+
+# Bases para STATUS (valores ABSOLUTOS de rank baixo)
+STATUS_NC_BASE = 100 # Not Classified (manter para fallback, mas o user disse que não vai ocorrer)
+STATUS_DNF_BASE = 200 # Did Not Finish
+STATUS_DNS_BASE = 300 # Did Not Start (agora inclui NULLs)
+STATUS_DSQ_BASE = 400 # Disqualified (O MAIOR valor = O PIOR RANK)
+POS_NULL_BASE = 500 # Para strings inesperadas que não são status conhecidos
+
+# Bases para Qualificação
+BASE_Q2 = 1000
+BASE_Q1 = 2000
+BASE_NO_TIME = 9000 # Base para DNQ / Sem tempo em Qualificação
+
+MAX_LAPS_VAL = 1000
+
+# Índices de cada etapa no array 'duration' da qualificação
+Q3_INDEX, Q2_INDEX, Q1_INDEX = 0, 1, 2
+
+UNKNOWN_DRIVER_FIELD = 'Desconhecido'
+
+
+def segment_time(duration, index):
+    """Tempo (float) da etapa 'index' do array duration, ou math.inf se não houver."""
+    if not duration or len(duration) <= index or duration[index] is None:
+        return math.inf
+    try:
+        return float(duration[index])
+    except (ValueError, TypeError):
+        return math.inf
+
+
+def sort_position_value(result, session_type):
+    """Valor de ordenação de um SessionResult (menor = melhor colocado)."""
+    num_laps = result.number_of_laps if result.number_of_laps is not None else 0
+    try:
+        return int(result.position)
+    except (ValueError, TypeError): # Se position não é um número (ex: 'DQ', 'NC', None)
+        pass
+
+    if session_type == 'Race':
+        # Ordem: Normal -> DNF (por laps) -> DNS (inclui NULLs) -> DSQ (último)
+        if result.dnf or result.position == 'DNF':
+            return STATUS_DNF_BASE - num_laps
+        if result.dns or result.position == 'DNS' or result.position is None:
+            return STATUS_DNS_BASE - num_laps
+        if result.dsq or result.position == 'DQ':
+            return STATUS_DSQ_BASE - num_laps
+        return POS_NULL_BASE - num_laps
+
+    if session_type == 'Practice':
+        # Non-numéricos/null/status vão depois dos classificados, ordenados por laps
+        return (POS_MAX_FINISHER + 1) + (MAX_LAPS_VAL - num_laps)
+
+    if session_type == 'Qualifying':
+        q3 = segment_time(result.duration, Q3_INDEX)
+        q2 = segment_time(result.duration, Q2_INDEX)
+        q1 = segment_time(result.duration, Q1_INDEX)
+        if q3 != math.inf:
+            return q3
+        if q2 != math.inf:
+            return BASE_Q2 + q2
+        if q1 != math.inf:
+            return BASE_Q1 + q1
+        return BASE_NO_TIME + (MAX_LAPS_VAL - num_laps) # Sem tempo em nenhuma etapa (DNQ)
+
+    # Outros tipos de sessão vão para o final
+    return POS_NULL_BASE - num_laps
+
+
+def segment_ranks(results, index):
+    """{driver_number: posição} na etapa 'index' da qualificação, só para quem tem tempo nela."""
+    timed = [(segment_time(r.duration, index), r.driver_number) for r in results]
+    timed = sorted((t, d) for t, d in timed if t != math.inf)
+    return {driver_number: rank for rank, (_, driver_number) in enumerate(timed, 1)}
+
+
+def build_classification(session_key):
+    """Linhas de SessionClassification (não salvas) da sessão, ou None se a sessão não existir."""
+    session = Sessions.objects.filter(session_key=session_key).values('session_type').first()
+    if session is None:
+        return None
+    session_type = session['session_type']
+
+    results = list(SessionResult.objects.filter(session_key=session_key))
+    drivers = {d.driver_number: d for d in Drivers.objects.filter(session_key=session_key)}
+
+    pos_q1, pos_q2 = {}, {}
+    if session_type == 'Qualifying':
+        pos_q1 = segment_ranks(results, Q1_INDEX)
+        pos_q2 = segment_ranks(results, Q2_INDEX)
+
+    rows = []
+    for sr in results:
+        driver = drivers.get(sr.driver_number)
+        rows.append(SessionClassification(
+            session_key=sr.session_key,
+            meeting_key=sr.meeting_key,
+            driver_number=sr.driver_number,
+            session_type=session_type,
+            position=sr.position,
+            sort_key=sort_position_value(sr, session_type),
+            pos_q1=pos_q1.get(sr.driver_number),
+            pos_q2=pos_q2.get(sr.driver_number),
+            number_of_laps=sr.number_of_laps,
+            dnf=sr.dnf,
+            dns=sr.dns,
+            dsq=sr.dsq,
+            duration=sr.duration,
+            gap_to_leader=sr.gap_to_leader,
+            broadcast_name=driver.broadcast_name if driver and driver.broadcast_name is not None else UNKNOWN_DRIVER_FIELD,
+            team_name=driver.team_name if driver and driver.team_name is not None else UNKNOWN_DRIVER_FIELD,
+            headshot_url=driver.headshot_url if driver else None,
+        ))
+    return rows
+
+
+def refresh_session_classification(session_key):
+    """Recalcula e grava a classificação da sessão. Devolve o número de linhas gravadas."""
+    rows = build_classification(session_key)
+    if rows is None:
+        return 0
+    with transaction.atomic():
+        SessionClassification.objects.filter(session_key=session_key).delete()
+        SessionClassification.objects.bulk_create(rows)
+    return len(rows)
+
+
+# Campos no formato do SessionResultSerializer ('calculated_position' é a sort_key)
+CLASSIFICATION_FIELDS = (
+    'session_type', 'position', 'driver_number', 'number_of_laps', 'dnf', 'dns', 'dsq',
+    'duration', 'gap_to_leader', 'broadcast_name', 'team_name', 'headshot_url',
+    'meeting_key', 'session_key', 'pos_q1', 'pos_q2',
+)
+
+
+def classification_order(row):
+    """Ordem da classificação: sort_key e, no empate, o número do piloto (como no order_by da tabela)."""
+    return row.sort_key, row.driver_number
+
+
+def classification_dict(row):
+    """SessionClassification (não salva) -> dict no mesmo formato de session_classification."""
+    values = {field: getattr(row, field) for field in CLASSIFICATION_FIELDS}
+    values['calculated_position'] = row.sort_key
+    return values
+
+
+def session_classification(session_key):
+    """
+    Classificação ordenada da sessão (dicts para o SessionResultSerializer), ou None se a sessão
+    não existir. Sessões importadas antes da tabela existir são calculadas em memória a cada
+    leitura, sem gravar: só a importação (e build_session_classification) materializa a tabela.
+    """
+    classification = SessionClassification.objects.filter(session_key=session_key)
+    if classification.exists():
+        return classification.order_by('sort_key', 'driver_number').values(
+            *CLASSIFICATION_FIELDS, calculated_position=F('sort_key'),
+        )
+    rows = build_classification(session_key)
+    if rows is None:
+        return None
+    return [classification_dict(row) for row in sorted(rows, key=classification_order)]
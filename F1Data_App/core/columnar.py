@@ -0,0 +1,107 @@
+# G:\Learning\F1Data\F1Data_App\core\columnar.py
+# Formato binário colunar (MessagePack) para as respostas de telemetria.
+#
+# Estrutura do payload:
+#   {
+#     "format": "f1data-columnar/1",
+#     "count": <número de amostras>,
+#     "next": <cursor da próxima janela ou null>,
+#     "columns": {
+#       "date":  {"dtype": "<i8", "encoding": "delta", "data": <bytes>},
+#       "speed": {"dtype": "<i2", "null": -32768, "data": <bytes>},
+#       ...
+#     }
+#   }
+# 'date' são milissegundos desde a epoch (UTC) codificados em delta: o primeiro valor é
+# absoluto e a soma acumulada (cumsum) devolve os timestamps. Os demais canais são arrays
+# little-endian do dtype indicado; valores nulos viram o sentinela 'null' (mínimo do dtype).
+# Canais de ponto flutuante (ex: "<f4", canais derivados) não têm 'null': o nulo é NaN.
+#
+# Respostas em streaming são uma sequência de um ou mais objetos MessagePack concatenados
+# (um frame por chunk do cursor). Cada frame é independente e tem o formato acima; o
+# cliente lê com um Unpacker em modo streaming e concatena as colunas dos frames.
+# Uma resposta pequena tem um único frame, igual ao payload não-streaming.
+import msgpack
+import numpy as np
+
+COLUMNAR_FORMAT = 'f1data-columnar/1'
+COLUMNAR_CONTENT_TYPE = 'application/vnd.msgpack'
+COLUMNAR_ACCEPT_TYPES = ('application/vnd.msgpack', 'application/x-msgpack', 'application/msgpack')
+COLUMNAR_FORMAT_PARAMS = ('msgpack', 'columnar')
+
+
+def wants_columnar(request):
+    """Negociação de conteúdo: ?format=msgpack tem prioridade sobre o cabeçalho Accept. JSON é o padrão."""
+    fmt = request.GET.get('format')
+    if fmt:
+        return fmt.lower() in COLUMNAR_FORMAT_PARAMS
+    accept = request.headers.get('Accept', '')
+    return any(content_type in accept for content_type in COLUMNAR_ACCEPT_TYPES)
+
+
+def encode_channel(values, dtype):
+    """Converte uma coluna (com possíveis None) para bytes little-endian do dtype pedido."""
+    dtype = np.dtype(dtype)
+    arr = np.array(values, dtype=np.float64)  # None vira NaN; cópia, o sentinela não altera o array de quem chamou
+    if dtype.kind == 'f':
+        return {'dtype': dtype.str, 'data': arr.astype(dtype).tobytes()}
+    null_value = int(np.iinfo(dtype).min)
+    nulls = np.isnan(arr)
+    if nulls.any():
+        arr[nulls] = null_value
+    return {'dtype': dtype.str, 'null': null_value, 'data': arr.astype(dtype).tobytes()}
+
+
+def encode_matrix(matrix, dtype):
+    """Array n-dimensional (NaN = nulo) em ordem C, com o formato em 'shape'."""
+    column = encode_channel(np.asarray(matrix, dtype=np.float64).ravel(), dtype)
+    column['shape'] = list(np.shape(matrix))
+    return column
+
+
+def encode_dates(epoch_ms):
+    arr = np.asarray(epoch_ms, dtype='<i8')
+    deltas = np.diff(arr, prepend=np.int64(0)) if arr.size else arr
+    return {'dtype': '<i8', 'encoding': 'delta', 'data': deltas.astype('<i8').tobytes()}
+
+
+def build_columns(rows, channels):
+    """
+    'rows' são tuplas (epoch_ms, canal1, canal2, ...) na ordem de 'channels',
+    como devolvidas por values_list('epoch_ms', *channels).
+    'channels' é um dict ordenado {nome_do_canal: dtype}.
+    """
+    columns_data = list(zip(*rows)) if rows else [()] * (len(channels) + 1)
+    columns = {'date': encode_dates(columns_data[0])}
+    for (name, dtype), values in zip(channels.items(), columns_data[1:]):
+        columns[name] = encode_channel(values, dtype)
+    return columns
+
+
+def pack_columnar(rows, channels, next_cursor=None):
+    return msgpack.packb({
+        'format': COLUMNAR_FORMAT,
+        'count': len(rows),
+        'next': next_cursor,
+        'columns': build_columns(rows, channels),
+    }, use_bin_type=True)
+
+
+def iter_columnar_frames(chunks, channels, next_cursor=None):
+    """Um frame MessagePack por chunk. Uma janela vazia ainda gera um frame (count=0)."""
+    empty = True
+    for rows in chunks:
+        empty = False
+        yield pack_columnar(rows, channels, next_cursor)
+    if empty:
+        yield pack_columnar([], channels, next_cursor)
+
+
+async def aiter_columnar_frames(chunks, channels, next_cursor=None):
+    """iter_columnar_frames para chunks async (async_db.iter_chunks)."""
+    empty = True
+    async for rows in chunks:
+        empty = False
+        yield pack_columnar(rows, channels, next_cursor)
+    if empty:
+        yield pack_columnar([], channels, next_cursor)
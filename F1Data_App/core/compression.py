@@ -0,0 +1,65 @@
+# G:\Learning\F1Data\F1Data_App\core\compression.py
+# Compressão das respostas guardadas no cache de respostas (core/response_cache.py).
+# Cada entrada é comprimida uma única vez, quando entra no cache, em gzip e (se o pacote
+# 'brotli' estiver instalado) brotli; os acertos seguintes só escolhem a variante pedida
+# pelo Accept-Encoding do cliente, sem recomprimir nada.
+import gzip
+
+try:
+    import brotli
+except ImportError: # brotli é opcional: sem ele só há gzip
+    brotli = None
+
+# Respostas menores que isso não compensam a compressão
+MIN_COMPRESS_SIZE = 1024
+
+# Como a compressão acontece uma vez por versão dos dados, dá para usar níveis altos
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+IDENTITY = 'identity'
+
+
+def compress_variants(content):
+    """{encoding: bytes} com a resposta original ('identity') e as versões comprimidas que valem a pena."""
+    variants = {IDENTITY: content}
+    if len(content) < MIN_COMPRESS_SIZE:
+        return variants
+    if brotli is not None:
+        variants['br'] = brotli.compress(content, quality=BROTLI_QUALITY)
+    variants['gzip'] = gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+    # Descarta variantes que não ficaram menores
+    return {encoding: body for encoding, body in variants.items() if encoding == IDENTITY or len(body) < len(content)}
+
+
+def accepted_encodings(request):
+    """{encoding: q} do cabeçalho Accept-Encoding."""
+    accepted = {}
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        token, _, params = part.partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def choose_encoding(request, available):
+    """
+    Encoding entre 'available' com o maior q aceito pelo cliente (no empate, brotli antes de gzip),
+    ou 'identity' se nenhum for aceito.
+    """
+    accepted = accepted_encodings(request)
+    best, best_q = IDENTITY, 0.0
+    for encoding in ('br', 'gzip'):
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if encoding in available and q > best_q:
+            best, best_q = encoding, q
+    return best
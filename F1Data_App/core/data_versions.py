@@ -0,0 +1,68 @@
+# G:\Learning\F1Data\F1Data_App\core\data_versions.py
+# Versões dos dados por (dataset, sessão). Os importadores incrementam a versão sempre que
+# gravam dados de uma sessão; as views usam a versão para saber se o que está em cache
+# ainda vale. A tabela fica no banco para que o processo do importador (management command)
+# e os processos da API enxerguem o mesmo valor.
+import json
+
+from django.db import connection
+
+from . import async_db
+from .models import DataVersion
+
+# Datasets conhecidos, indexados por session_key. 'sessions' é incrementado pelo meeting_key
+# (lista de sessões do meeting) e também pelo session_key (bundle da sessão).
+DATASETS = (
+    'sessions', 'drivers', 'weather', 'session_results', 'race_control', 'laps', 'pit',
+    'stint', 'position', 'intervals', 'team_radio', 'cardata', 'location', 'derived',
+)
+
+_BUMP_SQL = """
+    INSERT INTO data_version (dataset, "key", version, updated_at)
+    VALUES (%s, %s, 1, now())
+    ON CONFLICT (dataset, "key")
+    DO UPDATE SET version = data_version.version + 1, updated_at = now();
+"""
+
+# Canal do PostgreSQL em que cada incremento de versão é anunciado (NOTIFY), com payload
+# {"dataset": ..., "key": ...}. A notificação só é entregue quando a transação do importador
+# é confirmada; o stream ao vivo (core/live.py) escuta esse canal.
+DATA_VERSION_CHANNEL = 'f1data_data_version'
+
+_NOTIFY_SQL = "SELECT pg_notify(%s, %s);"
+
+
+def bump_data_version(dataset, keys):
+    """Incrementa a versão de 'dataset' para cada chave (session_key ou meeting_key) em 'keys'."""
+    if dataset not in DATASETS:
+        raise ValueError(f"Dataset desconhecido: {dataset}")
+    if isinstance(keys, int):
+        keys = [keys]
+    keys = sorted({int(k) for k in keys if k is not None})
+    if not keys:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(_BUMP_SQL, [(dataset, key) for key in keys])
+        cursor.executemany(_NOTIFY_SQL, [
+            (DATA_VERSION_CHANNEL, json.dumps({'dataset': dataset, 'key': key})) for key in keys
+        ])
+
+
+def get_data_versions(datasets, key):
+    """{dataset: (version, updated_at)} para a chave; datasets nunca importados ficam com (0, None)."""
+    versions = {dataset: (0, None) for dataset in datasets}
+    rows = DataVersion.objects.filter(dataset__in=datasets, key=key).values_list('dataset', 'version', 'updated_at')
+    for dataset, version, updated_at in rows:
+        versions[dataset] = (version, updated_at)
+    return versions
+
+
+async def aget_data_versions(datasets, key):
+    """get_data_versions para as views async (pool de core/async_db.py)."""
+    versions = {dataset: (0, None) for dataset in datasets}
+    rows = await async_db.fetch_all(
+        DataVersion.objects.filter(dataset__in=datasets, key=key).values_list('dataset', 'version', 'updated_at')
+    )
+    for dataset, version, updated_at in rows:
+        versions[dataset] = (version, updated_at)
+    return versions
@@ -0,0 +1,274 @@
+# G:\Learning\F1Data\F1Data_App\core\derived.py
+# Canais derivados da telemetria, que a OpenF1 não fornece: distância acumulada, aceleração
+# longitudinal (da velocidade), curvatura e aceleração lateral (do traçado x/y de location),
+# número da volta e tempo dentro da volta. São calculados com NumPy por (sessão, piloto) ao final
+# das importações de car_data/location, na linha do tempo de car_data (uma linha por amostra), e
+# gravados em DerivedTelemetry em blocos de DERIVED_CHUNK_MS: as amostras de um bloco viram dois
+# arrays binários (datas em <i8 e uma matriz <f4 amostras x canais).
+# O endpoint de car_data devolve esses canais com ?derived=distance,lat_accel (ou ?derived=all).
+# lap_number/lap_time dependem da tabela laps, então import_laps também recalcula os pilotos
+# importados (update_derived_telemetry); build_derived_telemetry recalcula sessões inteiras.
+import numpy as np
+from django.db import transaction
+
+from .data_versions import bump_data_version
+from .laps import MAX_OPEN_LAP_DURATION
+from .models import CarData, DerivedTelemetry, Laps, Location
+from .telemetry import TelemetryParamError, epoch_ms_expression
+
+# {canal: dtype no formato colunar}; a ordem é a das colunas gravadas
+DERIVED_CHANNELS = {
+    'distance': '<f4',    # m desde a primeira amostra da sessão
+    'long_accel': '<f4',  # m/s², positiva acelerando
+    'lat_accel': '<f4',   # m/s², positiva em curva para a esquerda (no plano x/y)
+    'curvature': '<f4',   # 1/m (inverso do raio), com o mesmo sinal de lat_accel
+    'lap_number': '<i2',
+    'lap_time': '<f4',    # s desde o início da volta
+}
+
+# Casas decimais na resposta JSON
+DERIVED_DECIMALS = {'distance': 1, 'long_accel': 2, 'lat_accel': 2, 'curvature': 5, 'lap_number': 0, 'lap_time': 3}
+
+# Duração de cada bloco gravado (uma janela de telemetria lê poucos blocos)
+DERIVED_CHUNK_MS = 5 * 60 * 1000
+
+KMH_TO_MS = 1 / 3.6
+
+# Coordenadas de location estão em décimos de metro
+LOCATION_UNITS_PER_M = 10.0
+
+# Amostras na média móvel aplicada antes de derivar (velocidade inteira em km/h e x/y em
+# décimos de metro, a ~4 Hz, têm degraus que viram ruído na derivada)
+SMOOTHING_SAMPLES = 5
+
+# Abaixo desta velocidade (m/s) a curvatura do traçado não é definida (carro parado nos boxes)
+MIN_CURVATURE_SPEED_MS = 5.0
+
+
+def parse_derived_channels(params):
+    """'derived' = lista de canais de DERIVED_CHANNELS separada por vírgulas, ou 'all'. Vazio = nenhum."""
+    value = params.get('derived')
+    if not value:
+        return []
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    if 'all' in names:
+        return list(DERIVED_CHANNELS)
+    unknown = [name for name in names if name not in DERIVED_CHANNELS]
+    if unknown:
+        raise TelemetryParamError(f"Canais derivados desconhecidos: {', '.join(unknown)}. Use: {', '.join(DERIVED_CHANNELS)} ou all.")
+    return list(dict.fromkeys(names))
+
+
+def moving_average(values, window=SMOOTHING_SAMPLES):
+    """Média móvel centrada; nas bordas a média é só das amostras disponíveis."""
+    if len(values) < window:
+        return values
+    kernel = np.ones(window)
+    return np.convolve(values, kernel, mode='same') / np.convolve(np.ones(len(values)), kernel, mode='same')
+
+
+def integrate_distance(t_s, speed_kmh):
+    """Distância acumulada (m) em cada amostra, pela regra do trapézio sobre a velocidade."""
+    speed_ms = np.asarray(speed_kmh, dtype=np.float64) * KMH_TO_MS
+    segments = 0.5 * (speed_ms[1:] + speed_ms[:-1]) * np.diff(t_s)
+    return np.concatenate(([0.0], np.cumsum(segments)))
+
+
+def path_curvature(t_s, x, y):
+    """Curvatura com sinal (1/m) do traçado x/y (m) em cada amostra; nan com o carro quase parado."""
+    x, y = moving_average(x), moving_average(y)
+    dx, dy = np.gradient(x, t_s), np.gradient(y, t_s)
+    ddx, ddy = np.gradient(dx, t_s), np.gradient(dy, t_s)
+    speed_sq = dx * dx + dy * dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curvature = (dx * ddy - dy * ddx) / speed_sq ** 1.5
+    curvature[speed_sq < MIN_CURVATURE_SPEED_MS ** 2] = np.nan
+    return curvature
+
+
+def lap_position(epoch_ms, laps):
+    """
+    (lap_number, lap_time) de cada amostra. 'laps' são tuplas (lap_number, início em epoch_ms,
+    lap_duration ou None) em ordem de início. Fora de qualquer volta os dois ficam nan.
+    """
+    lap_number = np.full(len(epoch_ms), np.nan)
+    lap_time = np.full(len(epoch_ms), np.nan)
+    if not laps:
+        return lap_number, lap_time
+    numbers = np.array([lap[0] for lap in laps], dtype=np.float64)
+    starts = np.array([lap[1] for lap in laps], dtype=np.float64)
+    durations = np.array([lap[2] if lap[2] is not None else np.nan for lap in laps], dtype=np.float64) * 1000
+    # Fim da volta: início + duração; sem duração, o início da seguinte (limitado, como em core/laps.py)
+    max_open = MAX_OPEN_LAP_DURATION.total_seconds() * 1000
+    next_starts = np.append(starts[1:], np.inf)
+    ends = np.where(np.isnan(durations), np.minimum(next_starts, starts + max_open), starts + durations)
+
+    index = np.searchsorted(starts, epoch_ms, side='right') - 1
+    inside = index >= 0
+    inside[inside] = epoch_ms[inside] < ends[index[inside]]
+    lap_number[inside] = numbers[index[inside]]
+    lap_time[inside] = (epoch_ms[inside] - starts[index[inside]]) / 1000.0
+    return lap_number, lap_time
+
+
+def compute_derived(cardata, location, laps):
+    """
+    Matriz (amostras x DERIVED_CHANNELS) na linha do tempo de car_data, ou None se houver menos
+    de duas amostras com velocidade. 'cardata' é um array (n, 2) de (epoch_ms, speed); 'location'
+    (m, 3) de (epoch_ms, x, y); 'laps' como em lap_position.
+    """
+    epoch_ms = cardata[:, 0]
+    t_s = (epoch_ms - epoch_ms[0]) / 1000.0
+    valid = ~np.isnan(cardata[:, 1])
+    if valid.sum() < 2:
+        return None
+    # Velocidade nula em alguma amostra: interpolada entre as vizinhas
+    speed_kmh = np.interp(t_s, t_s[valid], cardata[valid, 1])
+    speed_ms = speed_kmh * KMH_TO_MS
+
+    distance = integrate_distance(t_s, speed_kmh)
+    long_accel = np.gradient(moving_average(speed_ms), t_s)
+
+    curvature = np.full(len(epoch_ms), np.nan)
+    if len(location) >= SMOOTHING_SAMPLES:
+        loc_t_s = (location[:, 0] - epoch_ms[0]) / 1000.0
+        loc_curvature = path_curvature(loc_t_s, location[:, 1] / LOCATION_UNITS_PER_M, location[:, 2] / LOCATION_UNITS_PER_M)
+        # Fora do intervalo coberto por location (ou perto de trechos parados) fica nan
+        curvature = np.interp(t_s, loc_t_s, loc_curvature, left=np.nan, right=np.nan)
+    lat_accel = speed_ms * speed_ms * curvature
+
+    lap_number, lap_time = lap_position(epoch_ms, laps)
+    columns = {
+        'distance': distance, 'long_accel': long_accel, 'lat_accel': lat_accel,
+        'curvature': curvature, 'lap_number': lap_number, 'lap_time': lap_time,
+    }
+    return np.column_stack([columns[name] for name in DERIVED_CHANNELS]).astype('<f4')
+
+
+def load_driver_inputs(session_key, driver_number):
+    """Arrays de entrada de compute_derived para um piloto (três consultas em ordem de data)."""
+    cardata = np.array(list(
+        CarData.objects.filter(session_key=session_key, driver_number=driver_number)
+        .order_by('date').annotate(epoch_ms=epoch_ms_expression()).values_list('epoch_ms', 'speed')
+    ), dtype=np.float64).reshape(-1, 2)
+    location = np.array(list(
+        Location.objects.filter(session_key=session_key, driver_number=driver_number, x__isnull=False, y__isnull=False)
+        .exclude(x=0, y=0)
+        .order_by('date').annotate(epoch_ms=epoch_ms_expression()).values_list('epoch_ms', 'x', 'y')
+    ), dtype=np.float64).reshape(-1, 3)
+    laps = [
+        (lap_number, date_start.timestamp() * 1000, float(lap_duration) if lap_duration is not None else None)
+        for lap_number, date_start, lap_duration in
+        Laps.objects.filter(session_key=session_key, driver_number=driver_number, date_start__isnull=False)
+        .order_by('date_start').values_list('lap_number', 'date_start', 'lap_duration')
+    ]
+    return cardata, location, laps
+
+
+def chunk_rows(session_key, driver_number, epoch_ms, matrix):
+    """Instâncias de DerivedTelemetry, um bloco a cada DERIVED_CHUNK_MS a partir da primeira amostra."""
+    epoch_ms = epoch_ms.astype('<i8')
+    bucket = (epoch_ms - epoch_ms[0]) // DERIVED_CHUNK_MS
+    bounds = np.flatnonzero(np.diff(bucket)) + 1
+    rows = []
+    for index in np.split(np.arange(len(epoch_ms)), bounds):
+        rows.append(DerivedTelemetry(
+            session_key=session_key,
+            driver_number=driver_number,
+            start_ms=int(epoch_ms[index[0]]),
+            end_ms=int(epoch_ms[index[-1]]),
+            sample_count=len(index),
+            channels=list(DERIVED_CHANNELS),
+            epoch_ms=epoch_ms[index].tobytes(),
+            data=np.ascontiguousarray(matrix[index]).tobytes(),
+        ))
+    return rows
+
+
+def refresh_derived_telemetry(session_key, driver_numbers):
+    """
+    Recalcula os canais derivados dos pilotos da sessão. Pilotos sem car_data suficiente ficam
+    sem blocos. Devolve o número de pilotos gravados.
+    """
+    driver_numbers = sorted(set(driver_numbers))
+    written = 0
+    for driver_number in driver_numbers:
+        cardata, location, laps = load_driver_inputs(session_key, driver_number)
+        matrix = compute_derived(cardata, location, laps) if len(cardata) >= 2 else None
+        rows = chunk_rows(session_key, driver_number, cardata[:, 0], matrix) if matrix is not None else []
+        with transaction.atomic():
+            DerivedTelemetry.objects.filter(session_key=session_key, driver_number=driver_number).delete()
+            DerivedTelemetry.objects.bulk_create(rows)
+        written += bool(rows)
+    return written
+
+
+def group_drivers(pairs):
+    """{session_key: set de driver_numbers} a partir de pares (session_key, driver_number)."""
+    drivers_by_session = {}
+    for session_key, driver_number in pairs:
+        if session_key is not None and driver_number is not None:
+            drivers_by_session.setdefault(session_key, set()).add(driver_number)
+    return drivers_by_session
+
+
+def update_derived_telemetry(drivers_by_session, log=None):
+    """
+    refresh_derived_telemetry de cada sessão de {session_key: driver_numbers} e invalida o
+    cache de respostas de 'derived'. Usado pelos importadores e por build_derived_telemetry;
+    'log' (ex: self.stdout.write do comando) recebe uma linha por sessão.
+    """
+    for session_key, driver_numbers in sorted(drivers_by_session.items()):
+        rows = refresh_derived_telemetry(session_key, driver_numbers)
+        if log is not None:
+            log(f"Canais derivados atualizados para Sess {session_key}: {rows} pilotos.")
+    bump_data_version('derived', drivers_by_session.keys())
+
+
+def derived_queryset(session_key, driver_number, first_ms, last_ms):
+    """Blocos que cobrem as amostras entre first_ms e last_ms (inclusive), em ordem."""
+    return (
+        DerivedTelemetry.objects.filter(
+            session_key=session_key, driver_number=driver_number, start_ms__lte=last_ms, end_ms__gte=first_ms,
+        )
+        .order_by('start_ms')
+        .values_list('channels', 'epoch_ms', 'data')
+    )
+
+
+def join_derived(rows, blocks, names):
+    """
+    Acrescenta os canais 'names' ao fim de cada linha de epoch_rows (tuplas com epoch_ms na
+    posição 0), casando pela data da amostra. 'blocks' são as linhas de derived_queryset.
+    Amostras sem valor derivado (importadas depois do cálculo, ou nan) recebem None.
+    """
+    if not rows or not names:
+        return rows
+    epoch_parts, value_parts = [], []
+    for channels, epoch_ms, data in blocks:
+        epoch_ms = np.frombuffer(epoch_ms, dtype='<i8')
+        matrix = np.frombuffer(data, dtype='<f4').reshape(len(epoch_ms), len(channels))
+        columns = [channels.index(name) if name in channels else None for name in names]
+        value_parts.append(np.column_stack([
+            matrix[:, column] if column is not None else np.full(len(epoch_ms), np.nan, dtype='<f4')
+            for column in columns
+        ]))
+        epoch_parts.append(epoch_ms)
+
+    extra = [tuple([None] * len(names))] * len(rows)
+    if epoch_parts:
+        known_ms = np.concatenate(epoch_parts)
+        values = np.concatenate(value_parts).astype(np.float64)
+        wanted = np.array([row[0] for row in rows], dtype='<i8')
+        index = np.clip(np.searchsorted(known_ms, wanted), 0, len(known_ms) - 1)
+        found = known_ms[index] == wanted
+        for column, name in enumerate(names):
+            values[:, column] = np.round(values[:, column], DERIVED_DECIMALS[name])
+        values = values[index]
+        values[~found] = np.nan
+        integer = [np.dtype(DERIVED_CHANNELS[name]).kind == 'i' for name in names]
+        extra = [
+            tuple(None if np.isnan(v) else int(v) if is_int else v for v, is_int in zip(row, integer))
+            for row in values.tolist()
+        ]
+    return [(*row, *values) for row, values in zip(rows, extra)]
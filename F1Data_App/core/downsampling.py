@@ -0,0 +1,86 @@
+# G:\Learning\F1Data\F1Data_App\core\downsampling.py
+# Redução de pontos (downsampling) preservando a forma, para o parâmetro max_points
+# dos endpoints de telemetria. Tudo vetorizado com NumPy: cada função devolve os índices
+# (ordenados) das amostras que devem ser mantidas, para aplicar em todos os canais.
+import numpy as np
+
+MIN_POINTS = 3
+
+
+def _bucket_edges(n, n_out):
+    # Primeiro e último pontos ficam fixos; o miolo é dividido em (n_out - 2) buckets
+    return np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+
+def lttb_indices(t, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets para séries temporais.
+    Variante vetorizada: o vértice A de cada bucket é a média do bucket anterior (em vez do
+    ponto escolhido no bucket anterior), o que remove a dependência sequencial do LTTB
+    original e deixa o cálculo inteiro em operações de array. O vértice C é a média do
+    bucket seguinte, como no algoritmo original.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = t.size
+    if n_out >= n or n <= MIN_POINTS:
+        return np.arange(n)
+
+    y = np.where(np.isnan(y), 0.0, y)
+    edges = _bucket_edges(n, n_out)
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+
+    # Médias por bucket (t e y) com reduceat
+    t_mean = np.add.reduceat(t, starts) / sizes
+    y_mean = np.add.reduceat(y, starts) / sizes
+
+    # A = média do bucket anterior (o primeiro usa o ponto inicial), C = média do seguinte (o último usa o ponto final)
+    a_t = np.concatenate(([t[0]], t_mean[:-1]))
+    a_y = np.concatenate(([y[0]], y_mean[:-1]))
+    c_t = np.concatenate((t_mean[1:], [t[-1]]))
+    c_y = np.concatenate((y_mean[1:], [y[-1]]))
+
+    # Bucket de cada ponto do miolo
+    inner = np.arange(1, n - 1)
+    bucket = np.repeat(np.arange(starts.size), sizes)
+
+    area = np.abs(
+        (a_t[bucket] - c_t[bucket]) * (y[inner] - a_y[bucket])
+        - (a_t[bucket] - t[inner]) * (c_y[bucket] - a_y[bucket])
+    )
+
+    # Argmax por bucket: ordena por (bucket, área) e pega o último de cada bucket
+    order = np.lexsort((area, bucket))
+    last_of_bucket = np.cumsum(sizes) - 1
+    chosen = inner[order[last_of_bucket]]
+
+    return np.concatenate(([0], chosen, [n - 1]))
+
+
+def path_indices(x, y, n_out):
+    """
+    Decimação por distância para trajetórias x/y: mantém os pontos mais próximos de
+    posições igualmente espaçadas ao longo do comprimento acumulado do traçado.
+    Trechos parados (carro nos boxes) colapsam em poucos pontos, curvas e retas ficam
+    com densidade uniforme.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    if n_out >= n or n <= MIN_POINTS:
+        return np.arange(n)
+
+    valid = ~(np.isnan(x) | np.isnan(y))
+    step = np.hypot(np.diff(np.where(valid, x, 0.0)), np.diff(np.where(valid, y, 0.0)))
+    step[~(valid[1:] & valid[:-1])] = 0.0
+    dist = np.concatenate(([0.0], np.cumsum(step)))
+
+    if dist[-1] == 0.0:
+        return np.array([0, n - 1])
+
+    targets = np.linspace(0.0, dist[-1], n_out)
+    idx = np.searchsorted(dist, targets, side='left')
+    idx = np.clip(idx, 0, n - 1)
+    idx[0], idx[-1] = 0, n - 1
+    return np.unique(idx)
@@ -0,0 +1,111 @@
+# G:\Learning\F1Data\F1Data_App\core\extents.py
+# Extremos da telemetria por (sessão, piloto, dataset), gravados em TelemetryExtent.
+# import_location/import_cardata recalculam os pilotos importados ao final da importação;
+# MinMaxLocationDate, as janelas de telemetria e o bundle da sessão leem uma linha da tabela
+# em vez de agregar (ou sondar) a telemetria a cada requisição. A leitura nunca grava: pilotos
+# sem linha são sondados a cada requisição até a próxima importação (ou build_telemetry_extents).
+from django.db import transaction
+from django.db.models import Count, Max, Min
+
+from . import async_db
+from .models import CarData, Location, TelemetryExtent
+
+TELEMETRY_MODELS = {'location': Location, 'cardata': CarData}
+
+EXTENT_FIELDS = ('min_date', 'max_date', 'row_count', 'sample_rate_hz')
+
+
+def sample_rate(min_date, max_date, row_count):
+    """Taxa média de amostragem (Hz), ou None se não houver pelo menos duas amostras em instantes diferentes."""
+    if min_date is None or max_date is None or row_count < 2:
+        return None
+    seconds = (max_date - min_date).total_seconds()
+    return (row_count - 1) / seconds if seconds > 0 else None
+
+
+def refresh_telemetry_extents(dataset, session_key, driver_numbers=None):
+    """
+    Recalcula os extremos de 'dataset' para os pilotos da sessão (todos os que têm amostras, se
+    'driver_numbers' for None). Pilotos pedidos sem nenhuma amostra ficam com row_count=0.
+    Devolve o número de linhas gravadas.
+    """
+    queryset = TELEMETRY_MODELS[dataset].objects.filter(session_key=session_key)
+    if driver_numbers is not None:
+        driver_numbers = sorted(set(driver_numbers))
+        queryset = queryset.filter(driver_number__in=driver_numbers)
+
+    stats = {
+        row['driver_number']: row for row in
+        queryset.values('driver_number').annotate(min_date=Min('date'), max_date=Max('date'), row_count=Count('*')).order_by()
+    }
+    empty = {'min_date': None, 'max_date': None, 'row_count': 0}
+    rows = []
+    for driver_number in (driver_numbers if driver_numbers is not None else sorted(stats)):
+        stat = stats.get(driver_number, empty)
+        rows.append(TelemetryExtent(
+            session_key=session_key,
+            driver_number=driver_number,
+            dataset=dataset,
+            min_date=stat['min_date'],
+            max_date=stat['max_date'],
+            row_count=stat['row_count'],
+            sample_rate_hz=sample_rate(stat['min_date'], stat['max_date'], stat['row_count']),
+        ))
+
+    existing = TelemetryExtent.objects.filter(session_key=session_key, dataset=dataset)
+    if driver_numbers is not None:
+        existing = existing.filter(driver_number__in=driver_numbers)
+    with transaction.atomic():
+        existing.delete()
+        TelemetryExtent.objects.bulk_create(rows)
+    return len(rows)
+
+
+def extent_queryset(dataset, session_key, driver_number):
+    """values_list(EXTENT_FIELDS) da linha do piloto (uma busca na chave única)."""
+    return TelemetryExtent.objects.filter(
+        session_key=session_key, driver_number=driver_number, dataset=dataset,
+    ).values_list(*EXTENT_FIELDS)
+
+
+def as_extent(row):
+    """Linha de extent_queryset -> dict com EXTENT_FIELDS (None continua None)."""
+    return dict(zip(EXTENT_FIELDS, row)) if row is not None else None
+
+
+def probe_queries(dataset, session_key, driver_number):
+    """Primeira e última data do piloto (ORDER BY date LIMIT 1 nos dois sentidos do índice (sessão, piloto, date))."""
+    queryset = TELEMETRY_MODELS[dataset].objects.filter(session_key=session_key, driver_number=driver_number)
+    return queryset.order_by('date').values_list('date'), queryset.order_by('-date').values_list('date')
+
+
+def probed_extent(first, last):
+    """Extent de um piloto sem linha em TelemetryExtent: só as datas (contagem e taxa ficam desconhecidas)."""
+    return {
+        'min_date': first[0] if first else None,
+        'max_date': last[0] if last else None,
+        'row_count': None,
+        'sample_rate_hz': None,
+    }
+
+
+def telemetry_extent(dataset, session_key, driver_number):
+    """
+    Dict com EXTENT_FIELDS do piloto. Pilotos ainda sem linha em TelemetryExtent (importados
+    antes da tabela existir) caem nos probes de probe_queries, sem gravar nada: só os comandos de
+    importação e build_telemetry_extents escrevem na tabela.
+    """
+    row = extent_queryset(dataset, session_key, driver_number).first()
+    if row is not None:
+        return as_extent(row)
+    first, last = probe_queries(dataset, session_key, driver_number)
+    return probed_extent(first.first(), last.first())
+
+
+async def atelemetry_extent(dataset, session_key, driver_number):
+    """telemetry_extent para as views async (consultas no pool de core/async_db.py)."""
+    row = await async_db.fetch_one(extent_queryset(dataset, session_key, driver_number))
+    if row is not None:
+        return as_extent(row)
+    first, last = probe_queries(dataset, session_key, driver_number)
+    return probed_extent(await async_db.fetch_one(first), await async_db.fetch_one(last))
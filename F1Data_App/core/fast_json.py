@@ -0,0 +1,124 @@
+# G:\Learning\F1Data\F1Data_App\core\fast_json.py
+# Caminho rápido de serialização para os endpoints de listagem mais pesados.
+# Em vez de instanciar o model e passar cada valor pelo to_representation de cada campo do
+# ModelSerializer, a view lê tuplas com values_list(), converte só as colunas que precisam
+# (Decimal e datetime) e entrega a lista ao ORJSONRenderer. A saída é a mesma do
+# serializer + JSONRenderer do DRF: mesmos nomes e ordem de campos, Decimal como string com
+# as casas decimais do campo e datetime em ISO 8601 no fuso atual.
+import decimal
+
+import orjson
+from rest_framework import ISO_8601, serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Campos cujo to_representation devolve o próprio valor vindo do banco
+PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.FloatField, serializers.BooleanField)
+
+
+def _passthrough(value):
+    return value
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer com orjson: mesma saída compacta em UTF-8, datetime codificado direto pelo orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_UTC_Z)
+        # Como o JSONRenderer do DRF, escapa \u2028 e \u2029 (JSON como subconjunto de JavaScript)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+def field_converter(field):
+    """
+    Função valor do banco -> valor JSON equivalente a field.to_representation (para valores não nulos),
+    ou None quando o campo não tem caminho rápido (a view então usa o serializer normal).
+    """
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != ISO_8601:
+            return None
+        field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if field_timezone is None:
+            return None
+        # O orjson gera o mesmo texto que datetime.isoformat() (com 'Z' para UTC, ver OPT_UTC_Z)
+        return lambda value: value.astimezone(field_timezone)
+
+    if isinstance(field, serializers.DecimalField):
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+            return None
+        exponent = decimal.Decimal('.1') ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        rounding = field.rounding
+        return lambda value: f'{value.quantize(exponent, rounding=rounding, context=context):f}'
+
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return _passthrough
+
+    if isinstance(field, serializers.ListField) and isinstance(field.child, PASSTHROUGH_FIELDS):
+        return _passthrough
+
+    return None
+
+
+def row_plan(serializer_fields):
+    """(nomes, sources, [(índice, conversor)]) para os campos do serializer, ou None se algum não tiver caminho rápido."""
+    names, sources, converters = [], [], []
+    for index, (name, field) in enumerate(serializer_fields.items()):
+        converter = field_converter(field)
+        if converter is None or field.source == '*' or '.' in field.source:
+            return None
+        names.append(name)
+        sources.append(field.source)
+        if converter is not _passthrough:
+            converters.append((index, converter))
+    return names, sources, converters
+
+
+def convert_rows(tuples, plan):
+    """Tuplas na ordem de 'sources' -> lista de dicts no formato do serializer."""
+    names, _, converters = plan
+    rows = []
+    for values in tuples:
+        if converters:
+            values = list(values)
+            for index, converter in converters:
+                if values[index] is not None:
+                    values[index] = converter(values[index])
+        rows.append(dict(zip(names, values)))
+    return rows
+
+
+def fast_rows(queryset, plan):
+    return convert_rows(queryset.values_list(*plan[1]), plan)
+
+
+class FastListMixin:
+    """
+    Mixin para generics.ListAPIView com ModelSerializer: a listagem sem paginação usa o caminho
+    rápido (values_list + conversores + orjson). Respostas paginadas e serializers com campos
+    sem caminho rápido continuam no fluxo normal do DRF, também renderizadas com orjson.
+    """
+    renderer_classes = (ORJSONRenderer,)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        plan = row_plan(self.get_serializer().fields)
+        if plan is None:
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+        return Response(fast_rows(queryset, plan))
@@ -0,0 +1,54 @@
+# G:\Learning\F1Data\F1Data_App\core\fieldsets.py
+# Campos esparsos: ?fields=lap_number,lap_duration limita a resposta às colunas pedidas.
+# O serializer remove os demais campos da saída e as views de listagem buscam no banco só as
+# colunas correspondentes (.only()), então um gráfico que usa duas colunas não paga pelas outras.
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+
+
+def requested_fields(request):
+    """Campos de ?fields=a,b,c (na ordem pedida, sem repetição), ou None se o parâmetro não veio."""
+    if request is None:
+        return None
+    value = request.query_params.get(FIELDS_PARAM)
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    return list(dict.fromkeys(names)) or None
+
+
+class SparseFieldsSerializerMixin:
+    """Mixin de serializer: mantém só os campos pedidos em ?fields= (request vem no context)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get('request'))
+        if wanted is None:
+            return
+        unknown = [name for name in wanted if name not in self.fields]
+        if unknown:
+            raise ValidationError({"error": f"Campos desconhecidos em '{FIELDS_PARAM}': {', '.join(unknown)}. Disponíveis: {', '.join(self.fields)}."})
+        for name in set(self.fields) - set(wanted):
+            self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    Mixin para views de listagem (generics.ListAPIView) com serializer SparseFieldsSerializerMixin:
+    com ?fields= o queryset carrega só as colunas dos campos pedidos (mais a chave de paginação).
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if requested_fields(self.request) is None:
+            return queryset
+
+        # Instanciar o serializer já valida os nomes pedidos (400 antes de qualquer consulta)
+        sources = {field.source for field in self.get_serializer().fields.values()}
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = sources & model_fields
+        keyset_ordering = getattr(self, 'keyset_ordering', None)
+        if keyset_ordering:
+            columns.add(keyset_ordering)
+        return queryset.only(*sorted(columns)) if columns else queryset
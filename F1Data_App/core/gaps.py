@@ -0,0 +1,68 @@
+# G:\Learning\F1Data\F1Data_App\core\gaps.py
+# Diferenças de tempo (gap_to_leader / interval) em formato numérico.
+# A OpenF1 manda esses campos como número (1.234), texto ("1.234", "+1 LAP", "+2 LAPS") ou nulo, e
+# eles ficam gravados como texto. Os importadores de intervals e session_result gravam também
+# segundos e voltas de atraso já convertidos, e o gráfico de gaps (endpoint gap-chart/) lê só as
+# colunas numéricas.
+import math
+import re
+
+from .models import Intervals
+from .telemetry import epoch_ms_expression
+
+# Mesmas regras das expressões regulares da migração 0007_numeric_gaps (backfill em SQL):
+# mudou aqui, muda lá
+SECONDS_RE = re.compile(r'^[+-]?[0-9]+(\.[0-9]+)?$')
+LAPS_DOWN_RE = re.compile(r'^\+?\s*([0-9]+)\s*LAPS?$', re.IGNORECASE)
+
+# Colunas do gráfico de gaps no formato colunar (core/columnar.py)
+GAP_CHANNELS = {'gap_to_leader_s': '<f4', 'gap_laps': '<i1', 'interval_s': '<f4', 'interval_laps': '<i1'}
+
+
+def parse_gap(value):
+    """(segundos, voltas de atraso) de um gap da OpenF1; o que não se aplica (ou não se reconhece) fica None."""
+    if value is None or isinstance(value, bool):
+        return None, None
+    if isinstance(value, (int, float)):
+        return (float(value), None) if math.isfinite(value) else (None, None)
+    text = str(value).strip()
+    match = LAPS_DOWN_RE.match(text)
+    if match:
+        return None, int(match.group(1))
+    if SECONDS_RE.match(text):
+        return float(text), None
+    return None, None
+
+
+def format_gap(seconds, laps):
+    """Inverso de parse_gap: segundos, '+N LAP(S)' ou None."""
+    if seconds is not None:
+        return seconds
+    if laps is not None:
+        return f"+{laps} LAP" if laps == 1 else f"+{laps} LAPS"
+    return None
+
+
+def parse_gap_list(values):
+    """parse_gap de cada posição de um array (gap_to_leader de session_result): (segundos, voltas) ou (None, None)."""
+    if values is None:
+        return None, None
+    parsed = [parse_gap(value) for value in values]
+    return [seconds for seconds, _ in parsed], [laps for _, laps in parsed]
+
+
+def gap_series(session_key):
+    """
+    {driver_number: linhas (epoch_ms, *GAP_CHANNELS)} da sessão, em ordem de data.
+    Uma varredura do índice (session_key, driver_number, date), que já carrega as colunas numéricas.
+    """
+    series = {}
+    rows = (
+        Intervals.objects.filter(session_key=session_key)
+        .order_by('driver_number', 'date')
+        .annotate(epoch_ms=epoch_ms_expression())
+        .values_list('driver_number', 'epoch_ms', *GAP_CHANNELS)
+    )
+    for driver_number, *row in rows:
+        series.setdefault(driver_number, []).append(tuple(row))
+    return series
@@ -0,0 +1,215 @@
+# G:\Learning\F1Data\F1Data_App\core\lap_compare.py
+# Comparação de voltas alinhadas por distância (endpoint lap-comparison/).
+# A distância percorrida vem da integração da velocidade (car_data.speed, km/h) no tempo
+# (regra do trapézio); cada volta é reamostrada numa grade comum de distância (passo fixo a partir
+# da largada da volta) e o delta é a diferença de tempo acumulado em cada ponto da grade.
+# Cada par (volta de referência, volta comparada) é calculado uma vez por versão dos dados e
+# guardado no cache de respostas.
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+
+from .data_versions import get_data_versions
+from .derived import integrate_distance
+from .laps import lap_bounds
+from .models import CarData
+from .response_cache import get_response_cache
+from .telemetry import TelemetryParamError, epoch_ms_expression
+
+# Canais de car_data interpolados linearmente; os demais são discretos e usam o último valor
+# antes de cada ponto da grade (uma marcha 3,5 não faz sentido)
+LINEAR_CHANNELS = ('speed', 'throttle', 'rpm')
+STEP_CHANNELS = ('n_gear', 'drs', 'brake')
+CHANNELS = LINEAR_CHANNELS + STEP_CHANNELS
+
+DEFAULT_DISTANCE_STEP_M = 5.0
+MIN_DISTANCE_STEP_M = 1.0
+MAX_DISTANCE_STEP_M = 50.0
+
+MIN_COMPARED_LAPS = 2
+MAX_COMPARED_LAPS = 6
+
+CACHE_KEY_PREFIX = 'f1data:lapcmp:v1:'
+
+
+@dataclass(frozen=True)
+class LapRef:
+    session_key: int
+    driver_number: int
+    lap_number: int
+
+    def as_dict(self):
+        return {'session_key': self.session_key, 'driver_number': self.driver_number, 'lap_number': self.lap_number}
+
+
+def parse_lap_refs(params):
+    """'laps' = lista de session_key:driver_number:lap_number separada por vírgulas; a primeira é a referência."""
+    value = params.get('laps')
+    if not value:
+        raise TelemetryParamError("O parâmetro 'laps' é obrigatório (ex: laps=9158:1:12,9158:44:12).")
+    refs = []
+    for part in value.split(','):
+        if not part.strip():
+            continue
+        try:
+            refs.append(LapRef(*(int(v) for v in part.split(':'))))
+        except (TypeError, ValueError):
+            raise TelemetryParamError(f"Volta inválida em 'laps': '{part}'. Use session_key:driver_number:lap_number.")
+    refs = list(dict.fromkeys(refs))
+    if not MIN_COMPARED_LAPS <= len(refs) <= MAX_COMPARED_LAPS:
+        raise TelemetryParamError(f"Informe de {MIN_COMPARED_LAPS} a {MAX_COMPARED_LAPS} voltas diferentes em 'laps'.")
+    return refs
+
+
+def parse_distance_step(params):
+    value = params.get('step')
+    if value in (None, ''):
+        return DEFAULT_DISTANCE_STEP_M
+    try:
+        step = float(value)
+    except ValueError:
+        raise TelemetryParamError("O parâmetro 'step' deve ser um número (metros).")
+    if not MIN_DISTANCE_STEP_M <= step <= MAX_DISTANCE_STEP_M:
+        raise TelemetryParamError(f"O parâmetro 'step' deve estar entre {MIN_DISTANCE_STEP_M:g} e {MAX_DISTANCE_STEP_M:g} metros.")
+    return step
+
+
+def resample_lap(t_s, distance, channels, grid):
+    """
+    Tempo e canais da volta em cada ponto de 'grid' (distâncias em m, dentro da volta).
+    'channels' é {nome: array alinhado com 't_s'}.
+    """
+    # Parado (distância constante) o tempo não é função da distância e o np.interp não é definido
+    # com abscissas repetidas: interpola só na primeira amostra de cada distância (o primeiro instante)
+    _, first = np.unique(distance, return_index=True)
+    time_at = np.interp(grid, distance[first], t_s[first])
+    # Última amostra com distância <= ponto da grade, para os canais discretos
+    previous = np.clip(np.searchsorted(distance, grid, side='right') - 1, 0, len(distance) - 1)
+    resampled = {}
+    for name, values in channels.items():
+        values = np.asarray(values, dtype=np.float64)
+        resampled[name] = np.interp(grid, distance[first], values[first]) if name in LINEAR_CHANNELS else values[previous]
+    return time_at, resampled
+
+
+def lap_profile(lap, step):
+    """
+    Volta reamostrada na grade de distância: {'lap_distance_m', 'lap_time_s', 'time', canais...},
+    com arrays NumPy, ou None se a volta não tiver limites ou amostras suficientes.
+    Uma consulta em laps e uma varredura de range em car_data.
+    """
+    bounds = lap_bounds(lap.session_key, lap.driver_number, [lap.lap_number]).get(lap.lap_number)
+    if bounds is None:
+        return None
+    rows = list(
+        CarData.objects.filter(
+            session_key=lap.session_key, driver_number=lap.driver_number, date__gte=bounds.start, date__lt=bounds.end,
+        )
+        .order_by('date')
+        .annotate(epoch_ms=epoch_ms_expression())
+        .values_list('epoch_ms', *CHANNELS)
+    )
+    if len(rows) < 2:
+        return None
+
+    data = np.array(rows, dtype=np.float64) # Valores nulos viram nan
+    data = data[~np.isnan(data[:, 1])] # Amostras sem velocidade não entram na integração
+    if len(data) < 2:
+        return None
+    t_s = (data[:, 0] - data[0, 0]) / 1000.0
+    distance = integrate_distance(t_s, data[:, 1])
+    grid = np.arange(0.0, distance[-1], step)
+    time_at, channels = resample_lap(t_s, distance, {name: data[:, i + 1] for i, name in enumerate(CHANNELS)}, grid)
+    return {
+        'lap_distance_m': float(distance[-1]),
+        'lap_time_s': float(t_s[-1]),
+        'time': time_at,
+        **channels,
+    }
+
+
+def pair_cache_key(reference, other, step):
+    versions = []
+    for session_key in sorted({reference.session_key, other.session_key}):
+        session_versions = get_data_versions(('laps', 'cardata'), session_key)
+        versions.append(f"{session_key}:{session_versions['laps'][0]}.{session_versions['cardata'][0]}")
+    raw = f"{reference}|{other}|{step}|{'|'.join(versions)}"
+    return CACHE_KEY_PREFIX + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def compare_pair(reference, other, step, profiles):
+    """
+    (perfil da referência, perfil da outra volta, delta) na mesma grade, truncados ao comprimento
+    da volta mais curta; delta = tempo da outra volta - tempo da referência em cada ponto
+    (positivo = mais lenta). Perfis que não puderem ser calculados vêm como None (e nada vai
+    para o cache). 'profiles' guarda os perfis já calculados nesta requisição. Cacheado por par.
+    """
+    cache = get_response_cache()
+    key = pair_cache_key(reference, other, step)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    for lap in (reference, other):
+        if lap not in profiles:
+            profiles[lap] = lap_profile(lap, step)
+    ref_profile, other_profile = profiles[reference], profiles[other]
+    if ref_profile is None or other_profile is None:
+        return ref_profile, other_profile, None
+
+    n = min(len(ref_profile['time']), len(other_profile['time']))
+    ref_profile = truncate_profile(ref_profile, n)
+    other_profile = truncate_profile(other_profile, n)
+    result = (ref_profile, other_profile, other_profile['time'] - ref_profile['time'])
+    cache.set(key, result, timeout=settings.API_RESPONSE_CACHE_TIMEOUT)
+    return result
+
+
+def truncate_profile(profile, n):
+    return {name: value[:n] if isinstance(value, np.ndarray) else value for name, value in profile.items()}
+
+
+def rounded(values, decimals):
+    """Lista arredondada para o JSON; nan (canal nulo na amostra) vira None."""
+    values = np.round(values, decimals)
+    return [None if np.isnan(v) else v for v in values.tolist()]
+
+
+def compare_laps(refs, step):
+    """
+    Resposta do endpoint: a primeira volta é a referência; todas são cortadas na menor distância
+    comum. Devolve (dados, []) ou (None, voltas sem limites/amostras suficientes).
+    """
+    reference, others = refs[0], refs[1:]
+    profiles = {}
+    pairs = [(other, compare_pair(reference, other, step, profiles)) for other in others]
+
+    missing = [reference] if any(result[0] is None for _, result in pairs) else []
+    missing += [other for other, result in pairs if result[1] is None]
+    if missing:
+        return None, missing
+
+    n = min(len(delta) for _, (_, _, delta) in pairs)
+    ref_profile = pairs[0][1][0]
+
+    def lap_entry(lap, profile, delta):
+        return {
+            **lap.as_dict(),
+            'lap_distance_m': round(profile['lap_distance_m'], 1),
+            'lap_time_s': round(profile['lap_time_s'], 3),
+            'time': rounded(profile['time'][:n], 3),
+            'delta': rounded(delta[:n], 3),
+            'channels': {name: rounded(profile[name][:n], 1) for name in CHANNELS},
+        }
+
+    laps = [lap_entry(reference, ref_profile, np.zeros(n))]
+    laps += [lap_entry(other, profile, delta) for other, (_, profile, delta) in pairs]
+    data = {
+        'reference': reference.as_dict(),
+        'distance_step_m': step,
+        'distance': rounded(np.arange(n) * step, 1),
+        'laps': laps,
+    }
+    return data, []
@@ -0,0 +1,69 @@
+# G:\Learning\F1Data\F1Data_App\core\laps.py
+# Limites (início/fim) das voltas de um piloto, resolvidos no servidor a partir da tabela laps,
+# para recortar a telemetria por volta (endpoint lap-telemetry/).
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from .models import Laps
+from .telemetry import TelemetryParamError
+
+# Máximo de voltas por requisição
+MAX_LAPS_PER_REQUEST = 20
+
+# Fim de uma volta sem lap_duration e sem a volta seguinte (ex: última volta, volta abandonada)
+MAX_OPEN_LAP_DURATION = timedelta(minutes=3)
+
+
+@dataclass
+class LapBounds:
+    lap_number: int
+    start: datetime
+    end: datetime      # Exclusivo
+    lap_duration: float = None
+
+
+def parse_lap_numbers(params):
+    """'lap_number' (uma volta ou lista separada por vírgulas, ex: 3,4,10) -> lista sem repetição, na ordem pedida."""
+    value = params.get('lap_number')
+    if value in (None, ''):
+        raise TelemetryParamError("O parâmetro 'lap_number' é obrigatório.")
+    try:
+        lap_numbers = list(dict.fromkeys(int(part) for part in value.split(',') if part.strip()))
+    except ValueError:
+        raise TelemetryParamError("O parâmetro 'lap_number' deve ser um número inteiro ou uma lista separada por vírgulas.")
+    if not lap_numbers:
+        raise TelemetryParamError("O parâmetro 'lap_number' é obrigatório.")
+    if len(lap_numbers) > MAX_LAPS_PER_REQUEST:
+        raise TelemetryParamError(f"No máximo {MAX_LAPS_PER_REQUEST} voltas por requisição.")
+    return lap_numbers
+
+
+def lap_bounds(session_key, driver_number, lap_numbers):
+    """
+    {lap_number: LapBounds} das voltas pedidas que têm date_start, numa única consulta.
+    O fim é date_start + lap_duration; sem lap_duration, o início da volta seguinte (que vem
+    na mesma consulta); sem nenhum dos dois, date_start + MAX_OPEN_LAP_DURATION.
+    """
+    wanted = set(lap_numbers) | {n + 1 for n in lap_numbers}
+    starts, durations = {}, {}
+    for lap_number, date_start, lap_duration in (
+        Laps.objects.filter(session_key=session_key, driver_number=driver_number, lap_number__in=wanted, date_start__isnull=False)
+        .values_list('lap_number', 'date_start', 'lap_duration')
+    ):
+        starts[lap_number] = date_start
+        durations[lap_number] = float(lap_duration) if lap_duration is not None else None
+
+    bounds = {}
+    for lap_number in lap_numbers:
+        start = starts.get(lap_number)
+        if start is None:
+            continue
+        duration = durations[lap_number]
+        if duration is not None:
+            end = start + timedelta(seconds=duration)
+        elif lap_number + 1 in starts:
+            end = starts[lap_number + 1]
+        else:
+            end = start + MAX_OPEN_LAP_DURATION
+        bounds[lap_number] = LapBounds(lap_number, start, end, duration)
+    return bounds
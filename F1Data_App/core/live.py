@@ -0,0 +1,266 @@
+# G:\Learning\F1Data\F1Data_App\core\live.py
+# Live timing por Server-Sent Events (endpoint live-timing/, só via ASGI).
+# Os importadores anunciam cada gravação com NOTIFY no canal DATA_VERSION_CHANNEL
+# (core/data_versions.py). Cada processo da API mantém um único LISTEN nesse canal (LiveHub):
+# a cada notificação de um dataset ao vivo para uma sessão com clientes conectados, o hub busca
+# uma vez só as linhas novas (a partir da última já enviada) e entrega o mesmo evento a todos
+# os clientes da sessão. O banco não é consultado por cliente nem por intervalo de tempo.
+# A marca d'água de cada dataset é o cursor da última linha enviada mais as linhas já enviadas
+# nesse mesmo instante: a busca é inclusiva (cursor >= marca) e descarta só essas, para que
+# linhas com o mesmo cursor gravadas em importações diferentes não se percam.
+# Voltas são gravadas quando começam e completadas depois (tempo, setores): o cursor delas é
+# updated_at, então uma volta atualizada é enviada de novo (o cliente substitui pela chave
+# driver_number + lap_number).
+import asyncio
+import json
+import logging
+
+import psycopg
+from django.db.models import F
+
+from . import async_db
+from .data_versions import DATA_VERSION_CHANNEL
+from .fast_json import ORJSONRenderer
+from .models import Intervals, Laps, Position, RaceControl
+from .race_control import MESSAGE_KEY_FIELDS, format_race_control_row, race_control_queryset
+from .serializers import IntervalsSerializer, LapsSerializer, PositionSerializer, RaceControlSerializer
+
+logger = logging.getLogger(__name__)
+
+# Eventos pendentes por cliente; um cliente que não acompanha recebe 'resync' (ver LiveHub.publish)
+CLIENT_QUEUE_SIZE = 100
+
+# Comentário SSE enviado quando não há eventos, para manter a conexão (e os proxies) abertos
+HEARTBEAT_SECONDS = 15
+
+# Espera antes de reabrir o LISTEN depois de uma falha de conexão
+RECONNECT_DELAY_SECONDS = 3
+
+# Tempo (ms) que o EventSource espera antes de reconectar
+CLIENT_RETRY_MS = 3000
+
+
+class LiveDataset:
+    """
+    Dataset ao vivo: linhas novas são as de 'cursor_field' a partir da última enviada, menos as já
+    enviadas naquele instante. 'key_fields' identificam uma linha entre as de mesmo cursor.
+    """
+
+    def __init__(self, name, model, cursor_field, serializer_class, key_fields=('driver_number',)):
+        self.name = name # Nome do dataset em data_versions e do evento SSE
+        self.model = model
+        self.cursor_field = cursor_field
+        self.serializer_class = serializer_class
+        self.key_fields = key_fields
+
+    def queryset(self, session_key, since=None):
+        sources = [field.source for field in self.serializer_class().fields.values()]
+        # Linhas sem cursor não entram na marca d'água (e voltariam a cada busca)
+        queryset = self.model.objects.filter(session_key=session_key, **{f'{self.cursor_field}__isnull': False})
+        if since is not None:
+            queryset = queryset.filter(**{f'{self.cursor_field}__gte': since})
+        return queryset.order_by(self.cursor_field).values(*dict.fromkeys([*sources, self.cursor_field, *self.key_fields]))
+
+    def latest_queryset(self, session_key):
+        return (
+            self.model.objects.filter(session_key=session_key)
+            .order_by(F(self.cursor_field).desc(nulls_last=True))
+            .values_list(self.cursor_field)
+        )
+
+    def prepare(self, rows):
+        return rows
+
+    def cursor_of(self, row):
+        return row[self.cursor_field]
+
+    def key_of(self, row):
+        return tuple(row[field] for field in self.key_fields)
+
+    def advance(self, watermark, rows):
+        """
+        (linhas ainda não enviadas, nova marca d'água) a partir das linhas da busca inclusiva
+        (já preparadas). A marca é (cursor, frozenset das chaves já enviadas nesse cursor).
+        """
+        since, sent = watermark
+        rows = [row for row in rows if self.cursor_of(row) != since or self.key_of(row) not in sent]
+        if not rows:
+            return rows, watermark
+        last = self.cursor_of(rows[-1])
+        at_last = {self.key_of(row) for row in rows if self.cursor_of(row) == last}
+        return rows, (last, frozenset(at_last | sent if last == since else at_last))
+
+
+class RaceControlLiveDataset(LiveDataset):
+    """Race control usa a mesma consulta do endpoint de listagem (nome do piloto e data formatada)."""
+
+    def queryset(self, session_key, since=None):
+        return race_control_queryset(session_key, since)
+
+    def prepare(self, rows):
+        return [format_race_control_row(row) for row in rows]
+
+    def cursor_of(self, row):
+        return row['session_date_value']
+
+
+LIVE_DATASETS = {
+    dataset.name: dataset for dataset in (
+        LiveDataset('position', Position, 'date', PositionSerializer),
+        LiveDataset('intervals', Intervals, 'date', IntervalsSerializer),
+        LiveDataset('laps', Laps, 'updated_at', LapsSerializer, ('driver_number', 'lap_number')),
+        RaceControlLiveDataset('race_control', RaceControl, 'session_date', RaceControlSerializer, MESSAGE_KEY_FIELDS),
+    )
+}
+
+
+def format_event(event, data):
+    """Evento SSE (bytes) com 'data' em JSON compacto (uma única linha)."""
+    return b'event: ' + event.encode() + b'\ndata: ' + ORJSONRenderer().render(data) + b'\n\n'
+
+
+class LiveHub:
+    """Um LISTEN por processo (event loop) e a lista de clientes conectados por sessão."""
+
+    def __init__(self):
+        self.subscribers = {}  # session_key -> set de asyncio.Queue (uma por cliente)
+        self.watermarks = {}   # (dataset, session_key) -> (cursor da última linha enviada, chaves já enviadas nele)
+        self.locks = {}        # (dataset, session_key) -> asyncio.Lock (uma busca por vez, em ordem)
+        self.listener = None
+        self.tasks = set()
+
+    def start(self):
+        if self.listener is None or self.listener.done():
+            self.listener = asyncio.create_task(self.listen())
+
+    async def initial_watermark(self, dataset, session_key):
+        """Marca d'água no fim do que já está no banco (o estado atual vem dos endpoints REST)."""
+        row = await async_db.fetch_one(dataset.latest_queryset(session_key))
+        if row is None:
+            return None, frozenset()
+        rows = await async_db.fetch_dicts(dataset.queryset(session_key, row[0]))
+        return dataset.advance((row[0], frozenset()), dataset.prepare(rows))[1]
+
+    async def subscribe(self, session_key):
+        self.start()
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        if session_key in self.subscribers:
+            self.subscribers[session_key].add(queue)
+            return queue
+
+        # Primeiro cliente da sessão: as marcas d'água são lidas antes de a sessão aparecer em
+        # 'subscribers' (publish só busca sessões registradas, então nunca parte de uma marca vazia)
+        watermarks = {}
+        for dataset in LIVE_DATASETS.values():
+            watermarks[(dataset.name, session_key)] = await self.initial_watermark(dataset, session_key)
+        # Registro sem await no meio: uma falha (ou desconexão) durante as consultas acima não
+        # deixa conjunto vazio nem marcas pela metade; um cliente concorrente pode ter registrado antes
+        for key, watermark in watermarks.items():
+            self.watermarks.setdefault(key, watermark)
+        self.subscribers.setdefault(session_key, set()).add(queue)
+        # Notificações que chegaram enquanto a sessão ainda não estava registrada
+        for name in LIVE_DATASETS:
+            self.schedule(name, session_key)
+        return queue
+
+    def unsubscribe(self, session_key, queue):
+        queues = self.subscribers.get(session_key)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            self.forget(session_key)
+
+    def forget(self, session_key):
+        self.subscribers.pop(session_key, None)
+        for name in LIVE_DATASETS:
+            self.watermarks.pop((name, session_key), None)
+            self.locks.pop((name, session_key), None)
+
+    async def listen(self):
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(async_db.pool_conninfo(), autocommit=True)
+                async with conn:
+                    await conn.execute(f'LISTEN {DATA_VERSION_CHANNEL}')
+                    # Notificações perdidas enquanto o LISTEN estava fora do ar
+                    for session_key in list(self.subscribers):
+                        for name in LIVE_DATASETS:
+                            self.schedule(name, session_key)
+                    async for notify in conn.notifies():
+                        self.handle(notify.payload)
+            except (psycopg.Error, OSError) as e:
+                logger.warning("Live timing: LISTEN interrompido (%s); reconectando em %ss.", e, RECONNECT_DELAY_SECONDS)
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    def handle(self, payload):
+        try:
+            message = json.loads(payload)
+            name, session_key = message['dataset'], int(message['key'])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Live timing: notificação inválida: %r", payload)
+            return
+        if name in LIVE_DATASETS and session_key in self.subscribers:
+            self.schedule(name, session_key)
+
+    def schedule(self, name, session_key):
+        # A busca roda fora do loop do LISTEN, que continua recebendo notificações
+        task = asyncio.create_task(self.publish(name, session_key))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def publish(self, name, session_key):
+        dataset = LIVE_DATASETS[name]
+        lock = self.locks.setdefault((name, session_key), asyncio.Lock())
+        async with lock:
+            if session_key not in self.subscribers:
+                return
+            watermark = self.watermarks.get((name, session_key), (None, frozenset()))
+            try:
+                rows = await async_db.fetch_dicts(dataset.queryset(session_key, watermark[0]))
+            except psycopg.Error as e:
+                logger.warning("Live timing: erro ao buscar %s da sessão %s: %s", name, session_key, e)
+                return
+            rows, watermark = dataset.advance(watermark, dataset.prepare(rows))
+            if not rows:
+                return
+            self.watermarks[(name, session_key)] = watermark
+            data = dataset.serializer_class(rows, many=True).data
+            event = format_event(name, {'session_key': session_key, 'rows': data})
+
+        for queue in list(self.subscribers.get(session_key, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Cliente lento: descarta o que estava pendente e pede para recarregar pelos endpoints REST
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(format_event('resync', {'session_key': session_key}))
+
+
+# Um hub por event loop, como os pools de core/async_db.py
+_hubs = {}
+
+
+def get_hub():
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = LiveHub()
+    return hub
+
+
+async def event_stream(session_key):
+    """Corpo da resposta SSE de um cliente; a inscrição é desfeita quando o cliente desconecta."""
+    hub = get_hub()
+    yield f'retry: {CLIENT_RETRY_MS}\n\n'.encode()
+    queue = await hub.subscribe(session_key)
+    try:
+        yield format_event('ready', {'session_key': session_key, 'datasets': list(LIVE_DATASETS)})
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b': ping\n\n'
+    finally:
+        hub.unsubscribe(session_key, queue)
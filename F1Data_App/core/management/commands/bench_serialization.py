@@ -0,0 +1,86 @@
+# G:\Learning\F1Data\F1Data_App\core\management\commands\bench_serialization.py
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from core.fast_json import ORJSONRenderer, convert_rows, row_plan
+from core.models import Laps, Weather
+from core.serializers import LapsSerializer, WeatherSerializer
+
+
+def fake_laps(n):
+    start = datetime(2024, 3, 2, 15, 3, tzinfo=timezone.utc)
+    laps = []
+    for i in range(n):
+        sectors = [Decimal(f"{random.uniform(25, 40):.3f}") for _ in range(3)]
+        laps.append(Laps(
+            meeting_key=1229, session_key=9472, driver_number=1 + i % 20, lap_number=1 + i // 20,
+            date_start=start + timedelta(seconds=i * 4.5, microseconds=random.randint(0, 999) * 1000),
+            duration_sector_1=sectors[0], duration_sector_2=sectors[1], duration_sector_3=sectors[2],
+            i1_speed=random.randint(250, 320), i2_speed=random.randint(250, 320), is_pit_out_lap=(i % 25 == 0),
+            lap_duration=sum(sectors), segments_sector_1=[2049] * 8, segments_sector_2=[2051] * 8,
+            segments_sector_3=[2049] * 9, st_speed=random.randint(280, 340),
+        ))
+    return laps
+
+
+def fake_weather(n):
+    start = datetime(2024, 3, 2, 15, 3, tzinfo=timezone.utc)
+    return [
+        Weather(
+            session_key=9472, meeting_key=1229, session_date=start + timedelta(minutes=i), wind_direction=random.randint(0, 359),
+            air_temperature=Decimal(f"{random.uniform(15, 35):.1f}"), humidity=Decimal(f"{random.uniform(20, 90):.1f}"),
+            pressure=Decimal(f"{random.uniform(1000, 1020):.1f}"), rainfall=Decimal('0'), wind_speed=Decimal(f"{random.uniform(0, 5):.1f}"),
+            track_temperature=Decimal(f"{random.uniform(20, 55):.1f}"),
+        )
+        for i in range(n)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de serialização (serializer + JSONRenderer do DRF x caminho rápido values_list + orjson) por N linhas, sem banco.'
+
+    DATASETS = {
+        'laps': (LapsSerializer, fake_laps),
+        'weather': (WeatherSerializer, fake_weather),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Linhas por rodada (padrão 10000).')
+        parser.add_argument('--repeat', type=int, default=5, help='Rodadas por caminho; vale a melhor (padrão 5).')
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        random.seed(42)
+
+        for name, (serializer_class, factory) in self.DATASETS.items():
+            instances = factory(rows)
+            plan = row_plan(serializer_class().fields)
+            if plan is None:
+                raise CommandError(f"{serializer_class.__name__} não tem caminho rápido.")
+            # O caminho rápido recebe tuplas, como o values_list() devolveria
+            tuples = [tuple(getattr(obj, source) for source in plan[1]) for obj in instances]
+
+            slow_time, slow_body = self.best_of(repeat, lambda: JSONRenderer().render(serializer_class(instances, many=True).data))
+            fast_time, fast_body = self.best_of(repeat, lambda: ORJSONRenderer().render(convert_rows(tuples, plan)))
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({rows} linhas, melhor de {repeat})"))
+            self.stdout.write(f"  DRF serializer + JSONRenderer: {slow_time * 1000:8.1f} ms")
+            self.stdout.write(f"  values_list + orjson:          {fast_time * 1000:8.1f} ms  ({slow_time / fast_time:.1f}x)")
+            if slow_body == fast_body:
+                self.stdout.write(self.style.SUCCESS(f"  Saídas idênticas ({len(fast_body)} bytes)."))
+            else:
+                self.stdout.write(self.style.ERROR("  Saídas diferentes!"))
@@ -0,0 +1,38 @@
+# G:\Learning\F1Data\F1Data_App\core\management\commands\build_circuit_outline.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Sessions
+from core.circuit_outline import ensure_circuit_outline
+
+
+class Command(BaseCommand):
+    help = 'Calcula (ou recalcula) o traçado simplificado dos circuitos a partir da tabela location.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--circuit_key', type=int, help='Circuit key a processar. (Opcional, se omitido, processa todos os circuitos com sessões)')
+        parser.add_argument('--force', action='store_true', help='Recalcula mesmo que o traçado já exista.')
+
+    def handle(self, *args, **options):
+        circuit_key = options.get('circuit_key')
+        force = options.get('force')
+
+        if circuit_key:
+            circuit_keys = [circuit_key]
+        else:
+            circuit_keys = sorted(set(
+                Sessions.objects.filter(circuit_key__isnull=False).values_list('circuit_key', flat=True)
+            ))
+
+        if not circuit_keys:
+            raise CommandError("Nenhum circuito encontrado na tabela Sessions.")
+
+        built = 0
+        for key in circuit_keys:
+            outline = ensure_circuit_outline(key, force=force)
+            if outline:
+                built += 1
+                self.stdout.write(self.style.SUCCESS(f"Circuito {key}: {len(outline.points)} pontos (Sess {outline.session_key}, Driver {outline.driver_number}, Lap {outline.lap_number})."))
+            else:
+                self.stdout.write(self.style.WARNING(f"Circuito {key}: sem volta de referência com location suficiente."))
+
+        self.stdout.write(self.style.SUCCESS(f"Traçados disponíveis: {built}/{len(circuit_keys)}"))
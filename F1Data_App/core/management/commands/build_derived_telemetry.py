@@ -0,0 +1,28 @@
+# G:\Learning\F1Data\F1Data_App\core\management\commands\build_derived_telemetry.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Drivers
+from core.derived import group_drivers, update_derived_telemetry
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os canais derivados da telemetria (derived_telemetry) a partir de cardata, location e laps.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting_key', type=int, help='Meeting key a processar. (Opcional)')
+        parser.add_argument('--session_key', type=int, help='Session key a processar. (Opcional, se omitido, processa todas as sessões com pilotos)')
+
+    def handle(self, *args, **options):
+        drivers = Drivers.objects.all()
+        if options.get('meeting_key'):
+            drivers = drivers.filter(meeting_key=options['meeting_key'])
+        if options.get('session_key'):
+            drivers = drivers.filter(session_key=options['session_key'])
+
+        drivers_by_session = group_drivers(drivers.values_list('session_key', 'driver_number'))
+        if not drivers_by_session:
+            raise CommandError("Nenhuma sessão com pilotos encontrada para os parâmetros informados.")
+
+        update_derived_telemetry(drivers_by_session, log=lambda line: self.stdout.write(self.style.SUCCESS(line)))
+
+        self.stdout.write(self.style.SUCCESS(f"Canais derivados recalculados: {len(drivers_by_session)} sessões."))
@@ -0,0 +1,32 @@
+# G:\Learning\F1Data\F1Data_App\core\management\commands\build_session_classification.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import SessionResult
+from core.classification import refresh_session_classification
+from core.data_versions import bump_data_version
+
+
+class Command(BaseCommand):
+    help = 'Recalcula a classificação materializada (session_classification) a partir de sessionresult.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting_key', type=int, help='Meeting key a processar. (Opcional)')
+        parser.add_argument('--session_key', type=int, help='Session key a processar. (Opcional, se omitido, processa todas as sessões com resultados)')
+
+    def handle(self, *args, **options):
+        results = SessionResult.objects.all()
+        if options.get('meeting_key'):
+            results = results.filter(meeting_key=options['meeting_key'])
+        if options.get('session_key'):
+            results = results.filter(session_key=options['session_key'])
+
+        session_keys = sorted(set(results.values_list('session_key', flat=True)))
+        if not session_keys:
+            raise CommandError("Nenhuma sessão com resultados encontrada para os parâmetros informados.")
+
+        for session_key in session_keys:
+            rows = refresh_session_classification(session_key)
+            self.stdout.write(self.style.SUCCESS(f"Sess {session_key}: {rows} pilotos classificados."))
+
+        bump_data_version('session_results', session_keys)
+        self.stdout.write(self.style.SUCCESS(f"Classificações recalculadas: {len(session_keys)}"))
@@ -0,0 +1,37 @@
+# G:\Learning\F1Data\F1Data_App\core\management\commands\build_telemetry_extents.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Drivers
+from core.extents import TELEMETRY_MODELS, refresh_telemetry_extents
+from core.data_versions import bump_data_version
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os extremos da telemetria (telemetry_extent) a partir de location e cardata.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting_key', type=int, help='Meeting key a processar. (Opcional)')
+        parser.add_argument('--session_key', type=int, help='Session key a processar. (Opcional, se omitido, processa todas as sessões com pilotos)')
+        parser.add_argument('--dataset', choices=sorted(TELEMETRY_MODELS), help='Só este dataset. (Opcional, padrão: location e cardata)')
+
+    def handle(self, *args, **options):
+        drivers = Drivers.objects.all()
+        if options.get('meeting_key'):
+            drivers = drivers.filter(meeting_key=options['meeting_key'])
+        if options.get('session_key'):
+            drivers = drivers.filter(session_key=options['session_key'])
+
+        drivers_by_session = {}
+        for session_key, driver_number in drivers.values_list('session_key', 'driver_number'):
+            drivers_by_session.setdefault(session_key, set()).add(driver_number)
+        if not drivers_by_session:
+            raise CommandError("Nenhuma sessão com pilotos encontrada para os parâmetros informados.")
+
+        datasets = [options['dataset']] if options.get('dataset') else sorted(TELEMETRY_MODELS)
+        for dataset in datasets:
+            for session_key, driver_numbers in sorted(drivers_by_session.items()):
+                rows = refresh_telemetry_extents(dataset, session_key, driver_numbers)
+                self.stdout.write(self.style.SUCCESS(f"{dataset} Sess {session_key}: {rows} pilotos."))
+            bump_data_version(dataset, drivers_by_session.keys())
+
+        self.stdout.write(self.style.SUCCESS(f"Extremos recalculados: {len(drivers_by_session)} sessões."))
@@ -12,6 +12,9 @@ from django.db import OperationalError, transaction
 from django.conf import settings
 
 from core.models import Sessions, Drivers, CarData, RaceControl
+from core.data_versions import bump_data_version
+from core.extents import refresh_telemetry_extents
+from core.derived import group_drivers, update_derived_telemetry
 from dotenv import load_dotenv
 import pytz
 
@@ -288,6 +291,15 @@ class Command(BaseCommand):
 
         return inserted_count, skipped_count, 0
 
+    def update_telemetry_extents(self, triplets_with_dates):
+        """Recalcula os extremos (TelemetryExtent) dos pilotos importados."""
+        drivers_by_session = {}
+        for _, s_key, d_num, _, _ in triplets_with_dates:
+            drivers_by_session.setdefault(s_key, set()).add(d_num)
+        for s_key, driver_numbers in sorted(drivers_by_session.items()):
+            rows = refresh_telemetry_extents('cardata', s_key, driver_numbers)
+            self.stdout.write(f"Extremos de car_data atualizados para Sess {s_key}: {rows} pilotos.")
+
     def handle(self, *args, **options):
         load_dotenv(dotenv_path=ENV_FILE_PATH)
 
@@ -359,6 +371,12 @@ class Command(BaseCommand):
                 self.car_data_skipped_db += skipped
                 self.api_call_errors += api_error
 
+        self.update_telemetry_extents(triplets_with_dates)
+        update_derived_telemetry(group_drivers((s_key, d_num) for _, s_key, d_num, _, _ in triplets_with_dates), log=self.stdout.write)
+
+        # Invalida o cache de respostas das sessões importadas
+        bump_data_version('cardata', {sess for _, sess, _, _, _ in triplets_with_dates})
+
         self.stdout.write(self.style.MIGRATE_HEADING("\n--- Resumo da Importacao de car_data ---"))
         self.stdout.write(self.style.SUCCESS(f"Triplets processados: {self.triplets_processed_count}"))
         self.stdout.write(self.style.SUCCESS(f"Registros inseridos: {self.car_data_inserted_db}"))
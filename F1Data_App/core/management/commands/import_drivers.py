@@ -7,7 +7,9 @@ from django.db import transaction, IntegrityError
 from django.conf import settings
 from dotenv import load_dotenv
 
-from core.models import Drivers
+from core.models import Drivers, SessionClassification
+from core.data_versions import bump_data_version
+from core.classification import refresh_session_classification
 
 # Importe o novo módulo de gerenciamento de token
 from .token_manager import get_api_token
@@ -145,6 +147,15 @@ class Command(BaseCommand):
                 continue
             time.sleep(self.API_DELAY_SECONDS)
 
+        # Invalida o cache de respostas das sessões gravadas
+        session_keys = {driver_data.get('session_key') for driver_data in all_drivers}
+        bump_data_version('drivers', session_keys)
+
+        # A classificação materializada guarda nome/equipe do piloto: recalcula as já existentes
+        classified = SessionClassification.objects.filter(session_key__in=session_keys).values_list('session_key', flat=True).distinct()
+        for session_key in classified:
+            refresh_session_classification(session_key)
+
         self.stdout.write(self.style.MIGRATE_HEADING("\n--- Resumo da Importação de Drivers ---"))
         self.stdout.write(self.style.SUCCESS(f"Drivers encontrados: {drivers_found}"))
         self.stdout.write(self.style.SUCCESS(f"Drivers inseridos: {drivers_inserted}"))
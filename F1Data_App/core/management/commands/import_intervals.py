@@ -10,6 +10,8 @@ from django.db import transaction, IntegrityError, OperationalError
 from django.conf import settings
 
 from core.models import Drivers, Intervals, Sessions 
+from core.data_versions import bump_data_version
+from core.gaps import parse_gap
 from dotenv import load_dotenv
 
 from .token_manager import get_api_token
@@ -139,9 +141,16 @@ class Command(BaseCommand):
             self.add_warning(f"Formato de data inválido para intervalo (Mtg {meeting_key}, Sess {session_key}, Driver {driver_number}): '{date_str}'.")
             return 'skipped_invalid_date'
 
+        gap_to_leader = interval_data_dict.get("gap_to_leader")
+        gap_to_leader_s, gap_laps = parse_gap(gap_to_leader)
+        interval_s, interval_laps = parse_gap(interval_api_value)
         defaults = {
-            "gap_to_leader": interval_data_dict.get("gap_to_leader"),
+            "gap_to_leader": gap_to_leader,
             "interval_value": interval_api_value,
+            "gap_to_leader_s": gap_to_leader_s,
+            "gap_laps": gap_laps,
+            "interval_s": interval_s,
+            "interval_laps": interval_laps,
         }
 
         try:
@@ -269,6 +278,9 @@ class Command(BaseCommand):
                         self.add_warning(f"Erro ao processar UM REGISTRO de intervalo (Mtg {m_key}, Sess {s_key}, Driver {d_num}): {interval_process_e}. Dados API: {interval_entry_dict}. Pulando para o próximo.")
 
 
+                # Invalida o cache de respostas das sessões gravadas nesta chamada
+                bump_data_version('intervals', [entry.get('session_key') for entry in intervals_data_from_api])
+
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
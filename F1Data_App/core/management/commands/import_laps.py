@@ -11,6 +11,8 @@ from django.db import transaction, IntegrityError
 from django.conf import settings
 
 from core.models import Drivers, Laps, Sessions, Meetings # Incluí Meetings
+from core.data_versions import bump_data_version
+from core.derived import group_drivers, update_derived_telemetry
 from dotenv import load_dotenv
 from update_token import update_api_token_if_needed
 
@@ -360,6 +362,14 @@ class Command(BaseCommand):
                     except Exception as lap_process_e:
                         self.add_warning(f"Erro ao processar UM REGISTRO de lap: {lap_process_e}. Dados API: {lap_entry_dict}. Pulando para o próximo.")
                 
+                # Invalida o cache de respostas das sessões gravadas nesta chamada
+                bump_data_version('laps', [entry.get('session_key') for entry in laps_data_from_api])
+                # lap_number/lap_time dos canais derivados vêm das voltas: recalcula os pilotos da chamada
+                update_derived_telemetry(
+                    group_drivers((entry.get('session_key'), entry.get('driver_number')) for entry in laps_data_from_api),
+                    log=self.stdout.write,
+                )
+
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
@@ -12,6 +12,10 @@ from django.db import connection, OperationalError, IntegrityError, transaction
 from django.conf import settings 
 
 from core.models import Drivers, Location, Sessions, RaceControl
+from core.circuit_outline import ensure_circuit_outline
+from core.data_versions import bump_data_version
+from core.extents import refresh_telemetry_extents
+from core.derived import group_drivers, update_derived_telemetry
 from dotenv import load_dotenv, set_key
 import pytz
 
@@ -339,6 +343,33 @@ class Command(BaseCommand):
         
         return inserted_count, skipped_count, filtered_x0
 
+    def update_telemetry_extents(self, triplets_with_dates):
+        """Recalcula os extremos (TelemetryExtent) dos pilotos importados."""
+        drivers_by_session = {}
+        for _, s_key, d_num, _, _ in triplets_with_dates:
+            drivers_by_session.setdefault(s_key, set()).add(d_num)
+        for s_key, driver_numbers in sorted(drivers_by_session.items()):
+            rows = refresh_telemetry_extents('location', s_key, driver_numbers)
+            self.stdout.write(f"Extremos de location atualizados para Sess {s_key}: {rows} pilotos.")
+
+    def update_circuit_outlines(self, session_keys):
+        """Calcula o traçado dos circuitos das sessões importadas que ainda não têm um."""
+        circuit_keys = set(
+            Sessions.objects.filter(session_key__in=session_keys, circuit_key__isnull=False)
+            .values_list('circuit_key', flat=True)
+        )
+        for circuit_key in sorted(circuit_keys):
+            try:
+                outline = ensure_circuit_outline(circuit_key)
+                if outline:
+                    self.stdout.write(self.style.SUCCESS(f"Traçado do circuito {circuit_key} disponível (Sess {outline.session_key}, Lap {outline.lap_number})."))
+                else:
+                    self.stdout.write(self.style.WARNING(f"Aviso: Não foi possível calcular o traçado do circuito {circuit_key}."))
+                    self.warnings_count += 1
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Erro ao calcular o traçado do circuito {circuit_key}: {e}"))
+                self.warnings_count += 1
+
     def handle(self, *args, **options):
         load_dotenv(dotenv_path=ENV_FILE_PATH) 
 
@@ -425,6 +456,12 @@ class Command(BaseCommand):
 
             self.stdout.write(self.style.SUCCESS("Importação de Location concluída com sucesso!"))
 
+            imported_sessions = {s_key for _, s_key, _, _, _ in triplets_to_process_with_dates}
+            self.update_telemetry_extents(triplets_to_process_with_dates)
+            update_derived_telemetry(group_drivers((s_key, d_num) for _, s_key, d_num, _, _ in triplets_to_process_with_dates), log=self.stdout.write)
+            bump_data_version('location', imported_sessions)
+            self.update_circuit_outlines(imported_sessions)
+
         except OperationalError as e:
             raise CommandError(f"Erro operacional de banco de dados durante a importação (ORM): {e}")
         except Exception as e:
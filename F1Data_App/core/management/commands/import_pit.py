@@ -11,6 +11,7 @@ from django.conf import settings
 
 # Importa os modelos necessários
 from core.models import Drivers, Sessions, Pit, Meetings 
+from core.data_versions import bump_data_version
 from dotenv import load_dotenv
 from update_token import update_api_token_if_needed
 import pytz 
@@ -396,6 +397,9 @@ class Command(BaseCommand):
                     except Exception as pit_process_e:
                         self.add_warning(f"Erro ao processar UM REGISTRO de pit stop: {pit_process_e}. Dados API: {pit_entry_dict}. Pulando para o próximo.")
                     
+                # Invalida o cache de respostas das sessões gravadas nesta chamada
+                bump_data_version('pit', [entry.get('session_key') for entry in pit_data_from_api])
+
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
@@ -11,6 +11,7 @@ from django.db import connection, OperationalError, IntegrityError, transaction
 from django.conf import settings
 
 from core.models import Drivers, Sessions, Position, Meetings
+from core.data_versions import bump_data_version
 from dotenv import load_dotenv
 from .token_manager import get_api_token
 
@@ -218,6 +219,9 @@ class Command(BaseCommand):
                 else:
                     self.stdout.write(self.style.WARNING("Nenhum registro válido para inserir."))
 
+                # Invalida o cache de respostas das sessões gravadas nesta chamada
+                bump_data_version('position', [entry.get('session_key') for entry in api_data])
+
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
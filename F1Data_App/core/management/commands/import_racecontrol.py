@@ -11,6 +11,7 @@ from django.db import transaction, IntegrityError, OperationalError
 from django.conf import settings
 
 from core.models import Sessions, RaceControl
+from core.data_versions import bump_data_version
 from dotenv import load_dotenv
 
 from .token_manager import get_api_token
@@ -269,6 +270,9 @@ class Command(BaseCommand):
                         self.add_warning(f"Erro ao processar UM REGISTRO de Race Control (Mtg {m_key}, Sess {s_key}): {rc_process_e}. Pulando para o próximo.")
 
 
+                # Invalida o cache de respostas das sessões gravadas nesta chamada
+                bump_data_version('race_control', [entry.get('session_key') for entry in rc_data_from_api])
+
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
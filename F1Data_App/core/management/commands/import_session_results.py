@@ -14,6 +14,9 @@ from django.db.models.functions import Cast
 from django.db.models import F, Case, When, Value, IntegerField
 
 from core.models import Drivers, Sessions, SessionResult, Meetings
+from core.data_versions import bump_data_version
+from core.classification import refresh_session_classification
+from core.gaps import parse_gap_list
 from dotenv import load_dotenv
 
 from .token_manager import get_api_token
@@ -148,6 +151,7 @@ class Command(BaseCommand):
             processed_gap_to_leader = raw_gap_to_leader
         else:
             processed_gap_to_leader = [raw_gap_to_leader, None, None]
+        gap_to_leader_s, gap_laps = parse_gap_list(processed_gap_to_leader)
 
         if any(val is None for val in [meeting_key, session_key, driver_number]):
             missing_fields = [k for k,v in {'meeting_key': meeting_key, 'session_key': session_key, 'driver_number': driver_number}.items() if v is None]
@@ -163,7 +167,9 @@ class Command(BaseCommand):
             dns=dns,
             dsq=dsq,
             duration=processed_duration,
-            gap_to_leader=processed_gap_to_leader
+            gap_to_leader=processed_gap_to_leader,
+            gap_to_leader_s=gap_to_leader_s,
+            gap_laps=gap_laps
         )
 
     def handle(self, *args, **options):
@@ -306,6 +312,10 @@ class Command(BaseCommand):
                     else:
                         self.stdout.write(self.style.WARNING(f"  Nenhum registro válido de resultado de sessão para processar para Mtg {current_meeting_key}, Sess {s_key}."))
                     
+                    # Recalcula a classificação materializada e invalida o cache de respostas da sessão
+                    refresh_session_classification(s_key)
+                    bump_data_version('session_results', [entry.get('session_key') for entry in sr_data_from_api])
+
                     if self.API_DELAY_SECONDS > 0:
                         time.sleep(self.API_DELAY_SECONDS)
 
@@ -10,6 +10,7 @@ from django.db import connection, OperationalError, IntegrityError, transaction
 from django.conf import settings
 
 from core.models import Sessions, Meetings
+from core.data_versions import bump_data_version
 from dotenv import load_dotenv
 
 # Importe o novo módulo de gerenciamento de token
@@ -282,6 +283,10 @@ class Command(BaseCommand):
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
+            # Invalida o cache de respostas dos meetings gravados e das sessões (bundle da sessão)
+            bump_data_version('sessions', [entry.get('meeting_key') for entry in all_sessions_from_api])
+            bump_data_version('sessions', [entry.get('session_key') for entry in all_sessions_from_api])
+
             self.stdout.write(self.style.SUCCESS("Processamento de Sessões concluído!"))
 
         except OperationalError as e:
@@ -11,6 +11,7 @@ from django.conf import settings
 
 # Importa os modelos necessários
 from core.models import Meetings, Stint, Sessions # Adicionado Sessions para consistência, embora não seja usado diretamente para filtrar stints
+from core.data_versions import bump_data_version
 from dotenv import load_dotenv
 from update_token import update_api_token_if_needed
 import pytz # Para manipulação de fusos horários (caso necessário para formatação de data)
@@ -273,6 +274,9 @@ class Command(BaseCommand):
                         self.add_warning(f"Erro ao processar UM REGISTRO de stint (Mtg {current_meeting_key}, Sess {stint_entry_dict.get('session_key', 'N/A')}, Stint {stint_entry_dict.get('stint_number', 'N/A')}, Driver {stint_entry_dict.get('driver_number', 'N/A')}): {stint_process_e}. Pulando para o próximo.")
 
 
+                # Invalida o cache de respostas das sessões gravadas nesta chamada
+                bump_data_version('stint', [entry.get('session_key') for entry in stints_data_from_api])
+
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
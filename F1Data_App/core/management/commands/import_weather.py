@@ -11,6 +11,7 @@ from django.conf import settings
 
 # Importa os modelos necessários
 from core.models import Sessions, Weather, Meetings
+from core.data_versions import bump_data_version
 from dotenv import load_dotenv
 
 # Importe o novo módulo de gerenciamento de token
@@ -226,6 +227,9 @@ class Command(BaseCommand):
                     except Exception as weather_process_e:
                         self.add_warning(f"Erro ao processar UM REGISTRO de clima (Mtg {weather_entry.get('meeting_key', 'N/A')}, Sess {weather_entry.get('session_key', 'N/A')}, Date {weather_entry.get('date', 'N/A')}): {weather_process_e}. Pulando para o próximo registro.")
 
+                # Invalida o cache de respostas das sessões gravadas nesta chamada
+                bump_data_version('weather', [entry.get('session_key') for entry in weather_data_from_api])
+
                 if self.API_DELAY_SECONDS > 0:
                     time.sleep(self.API_DELAY_SECONDS)
 
@@ -0,0 +1,35 @@
+# G:\Learning\F1Data\F1Data_App\core\migrations\0001_telemetry_indexes.py
+# As tabelas de telemetria são gerenciadas fora do Django (managed = False) e particionadas
+# por session_key. Estes índices deixam as janelas de tempo dos endpoints de car_data e
+# location virarem um index range scan em (session_key, driver_number, date).
+# O CREATE INDEX na tabela pai se propaga para todas as partições (existentes e futuras).
+# Num banco sem essas tabelas (o banco de testes, por exemplo) o comando não faz nada.
+from django.db import migrations
+
+
+def if_table_exists(table, sql):
+    """Executa 'sql' só se a tabela existir (ela não é criada pelas migrações do Django)."""
+    return f"""
+        DO $$
+        BEGIN
+            IF to_regclass('{table}') IS NOT NULL THEN
+                {sql}
+            END IF;
+        END $$;
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = []
+
+    operations = [
+        migrations.RunSQL(
+            sql=if_table_exists('location', "CREATE INDEX IF NOT EXISTS location_session_driver_date_idx ON location (session_key, driver_number, date);"),
+            reverse_sql="DROP INDEX IF EXISTS location_session_driver_date_idx;",
+        ),
+        migrations.RunSQL(
+            sql=if_table_exists('cardata', "CREATE INDEX IF NOT EXISTS cardata_session_driver_date_idx ON cardata (session_key, driver_number, date);"),
+            reverse_sql="DROP INDEX IF EXISTS cardata_session_driver_date_idx;",
+        ),
+    ]
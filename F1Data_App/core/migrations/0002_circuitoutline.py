@@ -0,0 +1,338 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:01
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0001_telemetry_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarData',
+            fields=[
+                ('date', models.DateTimeField(primary_key=True, serialize=False)),
+                ('session_key', models.IntegerField()),
+                ('meeting_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('speed', models.IntegerField(blank=True, null=True)),
+                ('n_gear', models.IntegerField(blank=True, null=True)),
+                ('drs', models.IntegerField(blank=True, null=True)),
+                ('throttle', models.IntegerField(blank=True, null=True)),
+                ('brake', models.IntegerField(blank=True, null=True)),
+                ('rpm', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Car Data',
+                'db_table': 'cardata',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Circuit',
+            fields=[
+                ('circuitid', models.IntegerField(primary_key=True, serialize=False)),
+                ('circuitref', models.CharField(max_length=50, unique=True)),
+                ('name', models.CharField(db_column='name', max_length=50, null=True)),
+                ('location', models.CharField(max_length=50, null=True)),
+                ('country', models.CharField(max_length=50, null=True)),
+                ('lat', models.FloatField(null=True)),
+                ('lng', models.FloatField(null=True)),
+                ('alt', models.IntegerField(null=True)),
+                ('url', models.CharField(max_length=128, null=True)),
+            ],
+            options={
+                'db_table': 'circuits',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Drivers',
+            fields=[
+                ('driver_number', models.IntegerField(primary_key=True, serialize=False)),
+                ('meeting_key', models.IntegerField()),
+                ('session_key', models.IntegerField()),
+                ('broadcast_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('full_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('name_acronym', models.CharField(blank=True, max_length=10, null=True)),
+                ('team_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('team_colour', models.CharField(blank=True, max_length=10, null=True)),
+                ('first_name', models.CharField(blank=True, max_length=50, null=True)),
+                ('last_name', models.CharField(blank=True, max_length=50, null=True)),
+                ('headshot_url', models.TextField(blank=True, null=True)),
+                ('country_code', models.CharField(blank=True, max_length=10, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Drivers',
+                'db_table': 'drivers',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Intervals',
+            fields=[
+                ('session_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('meeting_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('date', models.DateTimeField()),
+                ('gap_to_leader', models.CharField(blank=True, max_length=20, null=True)),
+                ('interval_value', models.CharField(blank=True, db_column='interval', max_length=20, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Intervals',
+                'db_table': 'intervals',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Laps',
+            fields=[
+                ('meeting_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('session_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('lap_number', models.IntegerField()),
+                ('date_start', models.DateTimeField(blank=True, null=True)),
+                ('duration_sector_1', models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True)),
+                ('duration_sector_2', models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True)),
+                ('duration_sector_3', models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True)),
+                ('i1_speed', models.IntegerField(blank=True, null=True)),
+                ('i2_speed', models.IntegerField(blank=True, null=True)),
+                ('is_pit_out_lap', models.BooleanField(blank=True, null=True)),
+                ('lap_duration', models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True)),
+                ('segments_sector_1', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, null=True, size=None)),
+                ('segments_sector_2', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, null=True, size=None)),
+                ('segments_sector_3', django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, null=True, size=None)),
+                ('st_speed', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Laps',
+                'db_table': 'laps',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('date', models.DateTimeField(primary_key=True, serialize=False)),
+                ('session_key', models.IntegerField()),
+                ('meeting_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('z', models.IntegerField(blank=True, null=True)),
+                ('x', models.IntegerField(blank=True, null=True)),
+                ('y', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Location',
+                'db_table': 'location',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Meetings',
+            fields=[
+                ('meeting_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('circuit_key', models.IntegerField(blank=True, null=True)),
+                ('circuit_short_name', models.CharField(blank=True, max_length=50, null=True)),
+                ('meeting_code', models.CharField(blank=True, max_length=10, null=True)),
+                ('location', models.CharField(blank=True, max_length=100, null=True)),
+                ('country_key', models.IntegerField(blank=True, null=True)),
+                ('country_code', models.CharField(blank=True, max_length=10, null=True)),
+                ('country_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('meeting_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('meeting_official_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('gmt_offset', models.CharField(blank=True, max_length=20, null=True)),
+                ('date_start', models.DateTimeField(blank=True, null=True)),
+                ('year', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Meetings',
+                'db_table': 'meetings',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Pit',
+            fields=[
+                ('session_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('meeting_key', models.IntegerField()),
+                ('driver_number', models.IntegerField(blank=True, null=True)),
+                ('lap_number', models.IntegerField()),
+                ('date', models.DateTimeField()),
+                ('pit_duration', models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Pit',
+                'db_table': 'pit',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Position',
+            fields=[
+                ('date', models.DateTimeField(primary_key=True, serialize=False)),
+                ('driver_number', models.IntegerField()),
+                ('meeting_key', models.IntegerField()),
+                ('session_key', models.IntegerField()),
+                ('position', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Positions',
+                'db_table': 'positions',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RaceControl',
+            fields=[
+                ('meeting_key', models.IntegerField()),
+                ('session_key', models.IntegerField()),
+                ('session_date', models.DateTimeField(primary_key=True, serialize=False)),
+                ('driver_number', models.IntegerField(blank=True, null=True)),
+                ('lap_number', models.IntegerField(blank=True, null=True)),
+                ('category', models.CharField(blank=True, max_length=50, null=True)),
+                ('flag', models.CharField(blank=True, max_length=50, null=True)),
+                ('scope', models.CharField(blank=True, db_column='"scope"', max_length=50, null=True)),
+                ('sector', models.IntegerField(blank=True, null=True)),
+                ('message', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'racecontrol',
+                'ordering': ['session_date'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SessionResult',
+            fields=[
+                ('meeting_key', models.IntegerField(help_text='O identificador único para o evento (meeting).', primary_key=True, serialize=False, verbose_name='Chave da Reunião')),
+                ('session_key', models.IntegerField(help_text='O identificador único para a sessão.', verbose_name='Chave da Sessão')),
+                ('driver_number', models.IntegerField(help_text='O número único atribuído a um piloto de F1.', verbose_name='Número do Piloto')),
+                ('position', models.CharField(blank=True, help_text='A posição final do piloto no final da sessão.', max_length=10, null=True, verbose_name='Posição Final')),
+                ('number_of_laps', models.IntegerField(blank=True, help_text='Número total de voltas completadas durante a sessão.', null=True, verbose_name='Número de Voltas')),
+                ('dnf', models.BooleanField(default=False, help_text='Indica se o piloto Não Terminou a corrida (apenas para sessões de corrida).', verbose_name='Não Terminou')),
+                ('dns', models.BooleanField(default=False, help_text='Indica se o piloto Não Iniciou a corrida (apenas para sessões de corrida ou qualificação).', verbose_name='Não Iniciou')),
+                ('dsq', models.BooleanField(default=False, help_text='Indica se o piloto foi desqualificado.', verbose_name='Desqualificado')),
+                ('duration', django.contrib.postgres.fields.ArrayField(base_field=models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True), blank=True, help_text='Melhor tempo de volta (treino/qualificação) ou tempo total (corridas), em segundos. Array de 3 valores para Q1, Q2, e Q3.', null=True, size=None, verbose_name='Duração/Melhor Tempo')),
+                ('gap_to_leader', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(blank=True, null=True), blank=True, help_text="Diferença de tempo para o líder da sessão em segundos, ou '+N LAP(S)' se o piloto foi voltado. Array de 3 valores para Q1, Q2, e Q3.", null=True, size=None, verbose_name='Diferença para o Líder')),
+            ],
+            options={
+                'verbose_name': 'Resultado da Sessão',
+                'verbose_name_plural': 'Resultados da Sessão',
+                'db_table': 'sessionresult',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Sessions',
+            fields=[
+                ('session_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('meeting_key', models.IntegerField()),
+                ('location', models.CharField(max_length=100, null=True)),
+                ('date_start', models.DateTimeField(null=True)),
+                ('date_end', models.DateTimeField(null=True)),
+                ('session_type', models.CharField(max_length=50, null=True)),
+                ('session_name', models.CharField(max_length=100)),
+                ('country_key', models.IntegerField(null=True)),
+                ('country_code', models.CharField(max_length=10, null=True)),
+                ('country_name', models.CharField(max_length=100, null=True)),
+                ('circuit_key', models.IntegerField(null=True)),
+                ('circuit_short_name', models.CharField(max_length=100, null=True)),
+                ('gmt_offset', models.CharField(max_length=10, null=True)),
+                ('year', models.IntegerField(null=True)),
+            ],
+            options={
+                'db_table': 'sessions',
+                'ordering': ['date_start'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='StartingGrid',
+            fields=[
+                ('meeting_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('session_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('position', models.IntegerField(blank=True, null=True)),
+                ('lap_duration', models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Starting Grid',
+                'db_table': 'startinggrid',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Stint',
+            fields=[
+                ('meeting_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('session_key', models.IntegerField()),
+                ('stint_number', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('lap_start', models.IntegerField(blank=True, null=True)),
+                ('lap_end', models.IntegerField(blank=True, null=True)),
+                ('compound', models.CharField(blank=True, max_length=50, null=True)),
+                ('tyre_age_at_start', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Stints',
+                'db_table': 'stint',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TeamRadio',
+            fields=[
+                ('meeting_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('session_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('date', models.DateTimeField()),
+                ('recording_url', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Team Radio',
+                'db_table': 'teamradio',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Weather',
+            fields=[
+                ('session_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('meeting_key', models.IntegerField()),
+                ('session_date', models.DateTimeField()),
+                ('wind_direction', models.IntegerField(blank=True, null=True)),
+                ('air_temperature', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('humidity', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('pressure', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('rainfall', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('wind_speed', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('track_temperature', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Weather',
+                'db_table': 'weather',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CircuitOutline',
+            fields=[
+                ('circuit_key', models.IntegerField(primary_key=True, serialize=False)),
+                ('session_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('lap_number', models.IntegerField()),
+                ('points', models.JSONField()),
+                ('start_finish', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Circuit Outlines',
+                'db_table': 'circuit_outline',
+            },
+        ),
+    ]
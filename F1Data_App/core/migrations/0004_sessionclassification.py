@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:06
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionClassification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('meeting_key', models.IntegerField()),
+                ('session_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('position', models.CharField(blank=True, max_length=10, null=True)),
+                ('sort_key', models.FloatField()),
+                ('pos_q1', models.IntegerField(blank=True, null=True)),
+                ('pos_q2', models.IntegerField(blank=True, null=True)),
+                ('number_of_laps', models.IntegerField(blank=True, null=True)),
+                ('dnf', models.BooleanField(default=False)),
+                ('dns', models.BooleanField(default=False)),
+                ('dsq', models.BooleanField(default=False)),
+                ('duration', django.contrib.postgres.fields.ArrayField(base_field=models.DecimalField(blank=True, decimal_places=3, max_digits=8, null=True), blank=True, null=True, size=None)),
+                ('gap_to_leader', django.contrib.postgres.fields.ArrayField(base_field=models.TextField(blank=True, null=True), blank=True, null=True, size=None)),
+                ('broadcast_name', models.CharField(max_length=100)),
+                ('team_name', models.CharField(max_length=100)),
+                ('headshot_url', models.TextField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Session Classifications',
+                'db_table': 'session_classification',
+                'indexes': [models.Index(fields=['session_key', 'sort_key'], name='classification_order_idx')],
+                'unique_together': {('session_key', 'driver_number')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_sessionclassification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelemetryExtent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('dataset', models.CharField(max_length=20)),
+                ('min_date', models.DateTimeField(blank=True, null=True)),
+                ('max_date', models.DateTimeField(blank=True, null=True)),
+                ('row_count', models.BigIntegerField(default=0)),
+                ('sample_rate_hz', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Telemetry Extents',
+                'db_table': 'telemetry_extent',
+                'unique_together': {('session_key', 'driver_number', 'dataset')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:28
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_telemetryextent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DerivedTelemetry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('start_ms', models.BigIntegerField()),
+                ('end_ms', models.BigIntegerField()),
+                ('sample_count', models.IntegerField()),
+                ('channels', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=30), size=None)),
+                ('epoch_ms', models.BinaryField()),
+                ('data', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Derived Telemetry',
+                'db_table': 'derived_telemetry',
+                'unique_together': {('session_key', 'driver_number', 'start_ms')},
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+# G:\Learning\F1Data\F1Data_App\core\migrations\0007_numeric_gaps.py
+# Colunas numéricas de gap/interval em intervals e sessionresult (tabelas gerenciadas fora do
+# Django, por isso DDL direto). As linhas já importadas são convertidas aqui com a mesma regra
+# de core/gaps.py (número -> segundos; '+N LAP(S)' -> voltas de atraso); as novas vêm prontas
+# dos importadores. O índice de intervals cobre o gráfico de gaps e a listagem por piloto
+# (index-only scan em session_key, driver_number, date).
+# Num banco sem essas tabelas (o banco de testes, por exemplo) as operações não fazem nada.
+from django.db import migrations
+
+# Estas expressões repetem em SQL as regras de core/gaps.parse_gap (SECONDS_RE e LAPS_DOWN_RE)
+# e precisam continuar iguais a elas: linhas convertidas aqui e linhas convertidas pelos
+# importadores têm que dar o mesmo resultado (casos em core/tests.py, GapParsingTests).
+SECONDS_SQL = r"CASE WHEN {col} ~ '^\s*[+-]?[0-9]+(\.[0-9]+)?\s*$' THEN trim({col})::double precision END"
+LAPS_SQL = r"CASE WHEN {col} ~* '^\s*\+?\s*[0-9]+\s*LAPS?\s*$' THEN substring({col} from '[0-9]+')::smallint END"
+
+
+def array_sql(expression):
+    return f"ARRAY(SELECT {expression.format(col='g.value')} FROM unnest(gap_to_leader) WITH ORDINALITY AS g(value, i) ORDER BY g.i)"
+
+
+def if_table_exists(table, sql):
+    """Executa 'sql' só se a tabela existir (ela não é criada pelas migrações do Django)."""
+    return f"""
+        DO $guard$
+        BEGIN
+            IF to_regclass('{table}') IS NOT NULL THEN
+                {sql}
+            END IF;
+        END $guard$;
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_derivedtelemetry'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE IF EXISTS intervals
+                    ADD COLUMN IF NOT EXISTS gap_to_leader_s double precision,
+                    ADD COLUMN IF NOT EXISTS gap_laps smallint,
+                    ADD COLUMN IF NOT EXISTS interval_s double precision,
+                    ADD COLUMN IF NOT EXISTS interval_laps smallint;
+            """,
+            reverse_sql="""
+                ALTER TABLE IF EXISTS intervals
+                    DROP COLUMN IF EXISTS gap_to_leader_s,
+                    DROP COLUMN IF EXISTS gap_laps,
+                    DROP COLUMN IF EXISTS interval_s,
+                    DROP COLUMN IF EXISTS interval_laps;
+            """,
+        ),
+        migrations.RunSQL(
+            sql=if_table_exists('intervals', f"""
+                UPDATE intervals SET
+                    gap_to_leader_s = {SECONDS_SQL.format(col='gap_to_leader')},
+                    gap_laps = {LAPS_SQL.format(col='gap_to_leader')},
+                    interval_s = {SECONDS_SQL.format(col='"interval"')},
+                    interval_laps = {LAPS_SQL.format(col='"interval"')};
+            """),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=if_table_exists('intervals', """
+                CREATE INDEX IF NOT EXISTS intervals_session_driver_date_gap_idx ON intervals (session_key, driver_number, date)
+                    INCLUDE (gap_to_leader_s, gap_laps, interval_s, interval_laps);
+            """),
+            reverse_sql="DROP INDEX IF EXISTS intervals_session_driver_date_gap_idx;",
+        ),
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE IF EXISTS sessionresult
+                    ADD COLUMN IF NOT EXISTS gap_to_leader_s double precision[],
+                    ADD COLUMN IF NOT EXISTS gap_laps smallint[];
+            """,
+            reverse_sql="""
+                ALTER TABLE IF EXISTS sessionresult
+                    DROP COLUMN IF EXISTS gap_to_leader_s,
+                    DROP COLUMN IF EXISTS gap_laps;
+            """,
+        ),
+        migrations.RunSQL(
+            sql=if_table_exists('sessionresult', f"""
+                UPDATE sessionresult SET
+                    gap_to_leader_s = {array_sql(SECONDS_SQL)},
+                    gap_laps = {array_sql(LAPS_SQL)}
+                WHERE gap_to_leader IS NOT NULL;
+            """),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
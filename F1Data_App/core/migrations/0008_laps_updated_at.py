@@ -0,0 +1,37 @@
+# G:\Learning\F1Data\F1Data_App\core\migrations\0008_laps_updated_at.py
+# Coluna updated_at em laps (tabela gerenciada fora do Django, por isso DDL direto). Uma volta é
+# gravada quando começa e atualizada depois (lap_duration, setores, velocidades); o live timing
+# (core/live.py) usa updated_at como cursor para reenviar as voltas atualizadas. As linhas já
+# importadas ficam com o instante da migração. O índice cobre a busca por sessão a partir do cursor.
+# Num banco sem a tabela (o banco de testes, por exemplo) as operações não fazem nada.
+from django.db import migrations
+
+
+def if_table_exists(table, sql):
+    """Executa 'sql' só se a tabela existir (ela não é criada pelas migrações do Django)."""
+    return f"""
+        DO $guard$
+        BEGIN
+            IF to_regclass('{table}') IS NOT NULL THEN
+                {sql}
+            END IF;
+        END $guard$;
+    """
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_numeric_gaps'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="ALTER TABLE IF EXISTS laps ADD COLUMN IF NOT EXISTS updated_at timestamp with time zone NOT NULL DEFAULT now();",
+            reverse_sql="ALTER TABLE IF EXISTS laps DROP COLUMN IF EXISTS updated_at;",
+        ),
+        migrations.RunSQL(
+            sql=if_table_exists('laps', "CREATE INDEX IF NOT EXISTS laps_session_updated_idx ON laps (session_key, updated_at);"),
+            reverse_sql="DROP INDEX IF EXISTS laps_session_updated_idx;",
+        ),
+    ]
@@ -185,6 +185,12 @@ class Intervals(models.Model):
     date = models.DateTimeField() # NOT NULL na PK composta
     gap_to_leader = models.CharField(max_length=20, null=True, blank=True)
     interval_value = models.CharField(max_length=20, db_column='interval', null=True, blank=True)
+    # Versões numéricas de gap_to_leader/interval, preenchidas na importação (core/gaps.py):
+    # segundos, ou o número de voltas de atraso quando o texto é '+N LAP(S)'
+    gap_to_leader_s = models.FloatField(null=True, blank=True)
+    gap_laps = models.SmallIntegerField(null=True, blank=True)
+    interval_s = models.FloatField(null=True, blank=True)
+    interval_laps = models.SmallIntegerField(null=True, blank=True)
     class Meta:
         managed = False
         db_table = 'intervals'
@@ -212,6 +218,7 @@ class Laps(models.Model):
     segments_sector_2 = ArrayField(models.IntegerField(), null=True, blank=True)
     segments_sector_3 = ArrayField(models.IntegerField(), null=True, blank=True)
     st_speed = models.IntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True) # Coluna criada pela migração 0008; cursor do live timing
     class Meta:
         managed = False  # Django NÃO vai gerenciar a criação/alteração desta tabela
         db_table = 'laps'  # Nome exato da tabela no banco de dados
@@ -341,6 +348,20 @@ class SessionResult(models.Model):
         verbose_name="Diferença para o Líder",
         help_text="Diferença de tempo para o líder da sessão em segundos, ou '+N LAP(S)' se o piloto foi voltado. Array de 3 valores para Q1, Q2, e Q3."
     )
+    gap_to_leader_s = ArrayField(
+        models.FloatField(null=True, blank=True),
+        blank=True,
+        null=True,
+        verbose_name="Diferença para o Líder (s)",
+        help_text="gap_to_leader convertido na importação: segundos, ou nulo quando o piloto foi voltado. Mesmas posições de gap_to_leader."
+    )
+    gap_laps = ArrayField(
+        models.SmallIntegerField(null=True, blank=True),
+        blank=True,
+        null=True,
+        verbose_name="Voltas de Atraso",
+        help_text="Número de voltas de atraso quando gap_to_leader é '+N LAP(S)', ou nulo. Mesmas posições de gap_to_leader."
+    )
 
     class Meta:
         db_table = 'sessionresult'  # Nome real da tabela no banco de dados
@@ -390,4 +411,102 @@ class Circuit(models.Model):
         unique_together = (('circuitref',),)  # índice único para circuitref (opcional, já tem unique=True)
 
     def __str__(self):
-        return f"{self.name} ({self.circuitref})"
\ No newline at end of file
+        return f"{self.name} ({self.circuitref})"
+
+# --- Tabelas derivadas (calculadas pela aplicação, gerenciadas pelo Django via migrations) ---
+
+class CircuitOutline(models.Model):
+    # Traçado simplificado do circuito, derivado de uma volta limpa da tabela location (core/circuit_outline.py)
+    circuit_key = models.IntegerField(primary_key=True)
+    session_key = models.IntegerField() # Sessão de onde a volta de referência foi tirada
+    driver_number = models.IntegerField()
+    lap_number = models.IntegerField()
+    points = models.JSONField() # Lista de [x, y] na ordem do traçado, começando na linha de chegada
+    start_finish = models.JSONField() # {'x', 'y', 'dx', 'dy'}: ponto e direção da linha de largada/chegada
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        db_table = 'circuit_outline'
+        verbose_name_plural = 'Circuit Outlines'
+    def __str__(self):
+        return f"Outline: Circuit {self.circuit_key} (Sess {self.session_key}, Driver {self.driver_number}, Lap {self.lap_number})"
+
+class DataVersion(models.Model):
+    # Versão (contador crescente) dos dados de um dataset para uma sessão, incrementada pelos importadores.
+    # Para o dataset 'sessions' a chave é o meeting_key ou o session_key; para os demais, o session_key.
+    dataset = models.CharField(max_length=30)
+    key = models.IntegerField()
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        db_table = 'data_version'
+        unique_together = (('dataset', 'key'),)
+        verbose_name_plural = 'Data Versions'
+    def __str__(self):
+        return f"DataVersion: {self.dataset} {self.key} v{self.version}"
+
+class SessionClassification(models.Model):
+    # Classificação da sessão já calculada (ordem, posições em Q1/Q2 e dados do piloto),
+    # gravada na importação dos resultados (core/classification.py)
+    session_key = models.IntegerField()
+    driver_number = models.IntegerField()
+    meeting_key = models.IntegerField()
+    session_type = models.CharField(max_length=50, null=True, blank=True)
+    position = models.CharField(max_length=10, null=True, blank=True)
+    sort_key = models.FloatField() # Valor de ordenação (menor = melhor colocado)
+    pos_q1 = models.IntegerField(null=True, blank=True)
+    pos_q2 = models.IntegerField(null=True, blank=True)
+    number_of_laps = models.IntegerField(null=True, blank=True)
+    dnf = models.BooleanField(default=False)
+    dns = models.BooleanField(default=False)
+    dsq = models.BooleanField(default=False)
+    duration = ArrayField(models.DecimalField(max_digits=8, decimal_places=3, null=True, blank=True), null=True, blank=True)
+    gap_to_leader = ArrayField(models.TextField(null=True, blank=True), null=True, blank=True)
+    broadcast_name = models.CharField(max_length=100)
+    team_name = models.CharField(max_length=100)
+    headshot_url = models.TextField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        db_table = 'session_classification'
+        unique_together = (('session_key', 'driver_number'),)
+        indexes = [models.Index(fields=['session_key', 'sort_key'], name='classification_order_idx')]
+        verbose_name_plural = 'Session Classifications'
+    def __str__(self):
+        return f"Classification: Sess {self.session_key} - Driver {self.driver_number} ({self.sort_key})"
+
+class TelemetryExtent(models.Model):
+    # Primeira/última amostra, número de linhas e taxa média de amostragem da telemetria de um piloto
+    # numa sessão, por dataset ('location' ou 'cardata'). Atualizada pelos importadores (core/extents.py)
+    session_key = models.IntegerField()
+    driver_number = models.IntegerField()
+    dataset = models.CharField(max_length=20)
+    min_date = models.DateTimeField(null=True, blank=True) # Nulos quando o piloto não tem amostras
+    max_date = models.DateTimeField(null=True, blank=True)
+    row_count = models.BigIntegerField(default=0)
+    sample_rate_hz = models.FloatField(null=True, blank=True) # (row_count - 1) / (max_date - min_date)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        db_table = 'telemetry_extent'
+        unique_together = (('session_key', 'driver_number', 'dataset'),)
+        verbose_name_plural = 'Telemetry Extents'
+    def __str__(self):
+        return f"TelemetryExtent: {self.dataset} Sess {self.session_key} - Driver {self.driver_number} ({self.row_count})"
+
+class DerivedTelemetry(models.Model):
+    # Canais derivados (distância, acelerações, curvatura, volta) de um piloto numa sessão, na linha do
+    # tempo de car_data, em blocos de alguns minutos (core/derived.py). 'epoch_ms' são as datas das
+    # amostras (<i8) e 'data' a matriz amostras x 'channels' (<f4), ambos em bytes little-endian
+    session_key = models.IntegerField()
+    driver_number = models.IntegerField()
+    start_ms = models.BigIntegerField() # Primeira e última amostra do bloco (ms desde a epoch, UTC)
+    end_ms = models.BigIntegerField()
+    sample_count = models.IntegerField()
+    channels = ArrayField(models.CharField(max_length=30))
+    epoch_ms = models.BinaryField()
+    data = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        db_table = 'derived_telemetry'
+        unique_together = (('session_key', 'driver_number', 'start_ms'),)
+        verbose_name_plural = 'Derived Telemetry'
+    def __str__(self):
+        return f"DerivedTelemetry: Sess {self.session_key} - Driver {self.driver_number} ({self.start_ms}, {self.sample_count} amostras)"
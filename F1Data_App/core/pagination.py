@@ -0,0 +1,26 @@
+# G:\Learning\F1Data\F1Data_App\core\pagination.py
+# Paginação por chave (keyset/seek) opcional para os endpoints de listagem.
+# Sem 'limit' nem 'cursor' na query a resposta continua sendo a lista completa, como antes.
+# Com eles a resposta vira {"next", "previous", "results"}; o cursor é opaco e guarda o último
+# valor da chave de ordenação, então a página N é um "WHERE chave > valor LIMIT n" no índice,
+# com o mesmo custo da primeira (sem OFFSET).
+from rest_framework.pagination import CursorPagination
+
+KEYSET_DEFAULT_LIMIT = 500
+KEYSET_MAX_LIMIT = 5000
+
+
+class KeysetPagination(CursorPagination):
+    page_size = None # Paginação só quando pedida (ver get_page_size)
+    page_size_query_param = 'limit'
+    max_page_size = KEYSET_MAX_LIMIT
+
+    def get_page_size(self, request):
+        page_size = super().get_page_size(request)
+        if page_size is None and self.cursor_query_param in request.query_params:
+            return KEYSET_DEFAULT_LIMIT
+        return page_size
+
+    def get_ordering(self, request, queryset, view):
+        # Cada view declara sua chave natural em 'keyset_ordering' (ex: 'date', 'lap_number')
+        return (view.keyset_ordering,)
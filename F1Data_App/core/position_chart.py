@@ -0,0 +1,96 @@
+# G:\Learning\F1Data\F1Data_App\core\position_chart.py
+# Matriz de posições piloto x volta para o gráfico de posições (endpoint position-chart/).
+# A posição de um piloto na volta N é a última posição registrada (tabela positions) até o fim
+# da volta N dele: o date_start da volta N + 1, ou date_start + lap_duration na última volta.
+# A coluna 0 é a posição na largada (no date_start da volta 1).
+# O "as-of join" é feito de uma vez para todos os pilotos: datas de posições e de fim de volta
+# viram chaves (piloto, instante) numa única linha do tempo e um searchsorted encontra, para cada
+# fim de volta, a última posição do mesmo piloto.
+from datetime import timedelta
+
+import numpy as np
+
+from .models import Laps, Position
+from .telemetry import epoch_ms_expression
+
+
+def lap_ends(session_key):
+    """Tuplas (driver_number, volta, fim da volta em epoch_ms); volta 0 = largada."""
+    starts, durations = {}, {}
+    for driver_number, lap_number, date_start, lap_duration in (
+        Laps.objects.filter(session_key=session_key, date_start__isnull=False)
+        .values_list('driver_number', 'lap_number', 'date_start', 'lap_duration')
+    ):
+        starts[(driver_number, lap_number)] = date_start
+        durations[(driver_number, lap_number)] = lap_duration
+
+    ends = []
+    for (driver_number, lap_number), date_start in starts.items():
+        if lap_number == 1:
+            ends.append((driver_number, 0, date_start.timestamp() * 1000))
+        next_start = starts.get((driver_number, lap_number + 1))
+        if next_start is not None:
+            end = next_start
+        elif durations[(driver_number, lap_number)] is not None:
+            end = date_start + timedelta(seconds=float(durations[(driver_number, lap_number)]))
+        else:
+            continue
+        ends.append((driver_number, lap_number, end.timestamp() * 1000))
+    return ends
+
+
+def asof_positions(positions, ends):
+    """
+    Última posição de cada piloto até cada instante de 'ends'. 'positions' é um array (n, 3) de
+    (índice do piloto, epoch_ms, posição) e 'ends' (m, 2) de (índice do piloto, epoch_ms).
+    Devolve um array (m,) com nan onde o piloto ainda não tinha posição.
+    """
+    if not len(positions) or not len(ends):
+        return np.full(len(ends), np.nan)
+    # Chave única por (piloto, instante): o piloto ocupa a parte alta, então a ordem da chave é
+    # a ordem por piloto e depois por data
+    t0 = min(positions[:, 1].min(), ends[:, 1].min())
+    span = max(positions[:, 1].max(), ends[:, 1].max()) - t0 + 1
+    position_keys = positions[:, 0] * span + (positions[:, 1] - t0)
+    order = np.argsort(position_keys, kind='stable')
+    position_keys, positions = position_keys[order], positions[order]
+    end_keys = ends[:, 0] * span + (ends[:, 1] - t0)
+
+    index = np.searchsorted(position_keys, end_keys, side='right') - 1
+    found = index >= 0
+    found[found] = positions[index[found], 0] == ends[found, 0]
+    result = np.full(len(ends), np.nan)
+    result[found] = positions[index[found], 2]
+    return result
+
+
+def position_matrix(session_key):
+    """
+    (pilotos, matriz) da sessão: 'matriz' é um array (pilotos, voltas + 1) de posições (nan = sem
+    volta/posição), com os pilotos ordenados pela última posição conhecida.
+    """
+    ends = lap_ends(session_key)
+    rows = list(
+        Position.objects.filter(session_key=session_key, position__isnull=False)
+        .annotate(epoch_ms=epoch_ms_expression())
+        .values_list('driver_number', 'epoch_ms', 'position')
+    )
+    drivers = sorted({driver_number for driver_number, _, _ in ends} | {row[0] for row in rows})
+    if not drivers or not ends:
+        return drivers, np.full((len(drivers), 0), np.nan)
+    driver_index = {driver_number: i for i, driver_number in enumerate(drivers)}
+
+    positions = np.array([(driver_index[d], t, p) for d, t, p in rows], dtype=np.float64).reshape(-1, 3)
+    ends_array = np.array([(driver_index[d], t) for d, _, t in ends], dtype=np.float64)
+    lap_numbers = np.array([lap for _, lap, _ in ends], dtype=np.int64)
+
+    matrix = np.full((len(drivers), lap_numbers.max() + 1), np.nan)
+    matrix[ends_array[:, 0].astype(np.int64), lap_numbers] = asof_positions(positions, ends_array)
+
+    # Ordem do gráfico: última posição conhecida de cada piloto (sem nenhuma, no fim)
+    known = ~np.isnan(matrix)
+    last_column = np.where(known.any(axis=1), matrix.shape[1] - 1 - np.argmax(known[:, ::-1], axis=1), -1)
+    last_position = np.where(last_column >= 0, matrix[np.arange(len(drivers)), last_column], np.inf)
+    # Quem ficou para trás (menos voltas) vem depois de quem terminou com mais voltas
+    order = np.lexsort((last_position, -last_column))
+    return [drivers[i] for i in order], matrix[order]
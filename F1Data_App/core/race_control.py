@@ -0,0 +1,57 @@
+# G:\Learning\F1Data\F1Data_App\core\race_control.py
+# Consulta das mensagens de Race Control de uma sessão, compartilhada pelo endpoint de listagem,
+# pelo bundle da sessão e pelo stream ao vivo (core/live.py).
+from django.db.models import CharField, F, Func, OuterRef, Subquery, Value
+
+from .models import Drivers, RaceControl
+
+
+def race_control_queryset(session_key, since=None):
+    """
+    Mensagens da sessão (values, ordenadas por session_date), opcionalmente só as de 'since' em
+    diante. O filtro é inclusivo: várias mensagens podem ter a mesma session_date (a tabela não tem
+    outra chave para desempate) e chegar em importações diferentes, então as do instante 'since'
+    voltam de novo e quem consome descarta as que já tinha (ver same_message_key).
+    """
+    race_control_queryset = RaceControl.objects.filter(session_key=session_key)
+    if since is not None:
+        race_control_queryset = race_control_queryset.filter(session_date__gte=since)
+
+    # Nome do piloto pelo driver da própria sessão (subquery correlacionada, resolvida pelo banco)
+    session_driver = Drivers.objects.filter(
+        meeting_key=OuterRef('meeting_key'),
+        session_key=OuterRef('session_key'),
+        driver_number=OuterRef('driver_number'),
+    )
+    return (
+        race_control_queryset
+        .annotate(
+            broadcast_name=Subquery(session_driver.values('broadcast_name')[:1]),
+            session_date_text=Func(F('session_date'), Value('YYYY-MM-DD HH24:MI:SS'), function='to_char', output_field=CharField()),
+        )
+        .order_by('session_date')
+        .values(
+            'meeting_key', 'session_key', 'session_date', 'session_date_text', 'driver_number', 'broadcast_name',
+            'lap_number', 'category', 'flag', 'scope', 'sector', 'message',
+        )
+    )
+
+
+# Campos que identificam uma mensagem (os da chave única de racecontrol, mais o texto)
+MESSAGE_KEY_FIELDS = ('driver_number', 'lap_number', 'category', 'flag', 'sector', 'message')
+
+
+def same_message_key(row):
+    """Identidade de uma mensagem dentro do mesmo instante (session_date), para descartar repetidas."""
+    return tuple(row[field] for field in MESSAGE_KEY_FIELDS)
+
+
+def format_race_control_row(row):
+    """'session_date' vira o texto do to_char (formato do RaceControlSerializer); o datetime fica em 'session_date_value'."""
+    row['session_date_value'] = row['session_date']
+    row['session_date'] = row.pop('session_date_text')
+    return row
+
+
+def race_control_rows(session_key, since=None):
+    return [format_race_control_row(row) for row in race_control_queryset(session_key, since)]
@@ -0,0 +1,282 @@
+# G:\Learning\F1Data\F1Data_App\core\replay.py
+# Replay da sessão inteira: posições de todos os pilotos num relógio comum.
+# As amostras de location de cada piloto chegam em instantes diferentes (~3.7 Hz, sem
+# sincronismo entre carros), então cada piloto é interpolado linearmente no mesmo relógio.
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import timedelta
+
+import numpy as np
+
+from .data_versions import get_data_versions
+from .gaps import format_gap
+from .models import CarData, Intervals, Laps, Location, Position, Sessions
+from .telemetry import TelemetryParamError, epoch_ms_expression
+
+# Janela máxima por requisição de replay (20 pilotos x 4 Hz x 5 min = 24 mil posições)
+REPLAY_MAX_WINDOW = timedelta(minutes=5)
+
+# Margem buscada antes/depois da janela para interpolar os primeiros e últimos instantes
+REPLAY_EDGE_MARGIN = timedelta(seconds=2)
+
+DEFAULT_REPLAY_HZ = 4
+MAX_REPLAY_HZ = 10
+
+# Buracos maiores que isso na telemetria de um piloto não são interpolados (carro na garagem,
+# perda de sinal): os instantes dentro do buraco ficam nulos.
+MAX_INTERPOLATION_GAP_MS = 5000
+
+
+def parse_hz(params):
+    value = params.get('hz')
+    if value in (None, ''):
+        return DEFAULT_REPLAY_HZ
+    try:
+        hz = float(value)
+    except ValueError:
+        raise TelemetryParamError("O parâmetro 'hz' deve ser numérico.")
+    if not 0 < hz <= MAX_REPLAY_HZ:
+        raise TelemetryParamError(f"O parâmetro 'hz' deve estar entre 0 e {MAX_REPLAY_HZ}.")
+    return hz
+
+
+def build_clock(start_ms, end_ms, hz):
+    """Instantes (epoch ms) do relógio comum, alinhados a múltiplos do período e com fim exclusivo."""
+    period = 1000.0 / hz
+    first = np.ceil(start_ms / period) * period
+    return np.arange(first, end_ms, period)
+
+
+def interpolate_track(t, values, clock, max_gap_ms=MAX_INTERPOLATION_GAP_MS):
+    """
+    Interpola 'values' (amostrados em 't', crescente) nos instantes de 'clock'.
+    Fora do intervalo das amostras ou dentro de buracos maiores que 'max_gap_ms' o resultado é NaN.
+    """
+    out = np.full(clock.size, np.nan)
+    valid = ~np.isnan(values)
+    t, values = t[valid], values[valid]
+    if t.size == 0:
+        return out
+
+    inside = (clock >= t[0]) & (clock <= t[-1])
+    out[inside] = np.interp(clock[inside], t, values)
+
+    # Distância entre as amostras vizinhas de cada instante
+    right = np.clip(np.searchsorted(t, clock, side='left'), 1, max(t.size - 1, 1))
+    gap = t[right] - t[right - 1] if t.size > 1 else np.zeros(clock.size)
+    out[inside & (gap > max_gap_ms)] = np.nan
+    return out
+
+
+def resample_positions(rows, clock):
+    """
+    'rows' são tuplas (driver_number, epoch_ms, x, y) ordenadas por driver_number e epoch_ms.
+    Devolve (driver_numbers, matriz float64 de formato (tempo, piloto, 2)) com NaN onde não há posição.
+    """
+    if not rows:
+        return [], np.full((clock.size, 0, 2), np.nan)
+
+    data = np.array(rows, dtype=np.float64)
+    drivers, starts = np.unique(data[:, 0], return_index=True)
+    ends = np.append(starts[1:], data.shape[0])
+
+    matrix = np.full((clock.size, drivers.size, 2), np.nan)
+    for column, (start, end) in enumerate(zip(starts, ends)):
+        track = data[start:end]
+        matrix[:, column, 0] = interpolate_track(track[:, 1], track[:, 2], clock)
+        matrix[:, column, 1] = interpolate_track(track[:, 1], track[:, 3], clock)
+
+    return [int(d) for d in drivers], matrix
+
+
+def matrix_to_lists(matrix):
+    """Matriz (tempo, piloto, 2) para listas aninhadas JSON, com [x, y] arredondados ou None."""
+    out = []
+    for frame in matrix:
+        out.append([None if np.isnan(pos[0]) else [int(round(pos[0])), int(round(pos[1]))] for pos in frame])
+    return out
+
+
+# --- Índice temporal por sessão (replay frame) ---
+# Para cada sessão, guarda por piloto e por dataset um array ordenado de timestamps
+# (epoch ms) e as colunas correspondentes. Um "frame" num instante t é uma busca binária
+# (np.searchsorted) em cada array, sem tocar no banco. O índice é montado na primeira vez
+# que a sessão é pedida e as sessões menos usadas saem do cache (LRU).
+
+SESSION_INDEX_MAX_SESSIONS = 4
+
+# Amostras mais antigas que isso em relação a t não valem para o frame (carro parado sem telemetria)
+FRAME_MAX_STALENESS_MS = 5000
+
+
+def scalar(value, kind):
+    """Valor de uma coluna do índice (float64, nulo = NaN) como no banco: int, float ou None."""
+    if np.isnan(value):
+        return None
+    return int(value) if kind == 'int' else float(value)
+
+
+class DriverSeries:
+    """Série de um piloto num dataset: timestamps ordenados (int64) + colunas float64 alinhadas."""
+
+    def __init__(self, t, columns, kinds, max_staleness_ms=None):
+        self.t = t
+        self.columns = columns
+        self.kinds = kinds
+        self.max_staleness_ms = max_staleness_ms
+
+    def at(self, t_ms):
+        """Valores vigentes em t_ms (última amostra com timestamp <= t_ms), ou None."""
+        idx = int(np.searchsorted(self.t, t_ms, side='right')) - 1
+        if idx < 0:
+            return None
+        if self.max_staleness_ms is not None and t_ms - self.t[idx] > self.max_staleness_ms:
+            return None
+        return {name: scalar(column[idx], self.kinds[name]) for name, column in self.columns.items()}
+
+
+def build_series(rows, fields, max_staleness_ms=None):
+    """
+    'rows' são tuplas (driver_number, epoch_ms, *colunas) ordenadas por driver_number e epoch_ms;
+    'fields' é {coluna: 'int' | 'float'} na ordem das colunas. Devolve {driver_number: DriverSeries}.
+    As colunas ficam num único array float64 (nulo = NaN; inteiros e epoch_ms cabem exatos),
+    sem um objeto Python por amostra.
+    """
+    series = {}
+    if not rows:
+        return series
+    data = np.array(rows, dtype=np.float64)  # None vira NaN
+    drivers = data[:, 0].astype(np.int64)
+    t = data[:, 1].astype(np.int64)
+
+    unique, starts = np.unique(drivers, return_index=True)
+    ends = np.append(starts[1:], len(rows))
+    for driver_number, start, end in zip(unique, starts, ends):
+        series[int(driver_number)] = DriverSeries(
+            t[start:end],
+            {name: data[start:end, 2 + i] for i, name in enumerate(fields)},
+            fields,
+            max_staleness_ms,
+        )
+    return series
+
+
+class SessionTimeIndex:
+    """Todas as séries de uma sessão, montadas de uma vez a partir do banco."""
+
+    # dataset: ({campo: tipo}, staleness máxima). Intervals usa as colunas numéricas de core/gaps.py
+    DATASETS = {
+        'location': ({'x': 'int', 'y': 'int'}, FRAME_MAX_STALENESS_MS),
+        'cardata': ({'speed': 'int', 'n_gear': 'int'}, FRAME_MAX_STALENESS_MS),
+        'laps': ({'lap_number': 'int'}, None),
+        'position': ({'position': 'int'}, None),
+        'intervals': ({'gap_to_leader_s': 'float', 'gap_laps': 'int', 'interval_s': 'float', 'interval_laps': 'int'}, None),
+    }
+
+    def __init__(self, session_key, querysets):
+        """'querysets' mapeia cada dataset para um queryset de linhas (driver_number, epoch_ms, *campos)."""
+        self.session_key = session_key
+        self.series = {
+            name: build_series(list(querysets[name]), fields, staleness)
+            for name, (fields, staleness) in self.DATASETS.items()
+        }
+        self.driver_numbers = sorted(set().union(*(s.keys() for s in self.series.values())))
+
+    def frame(self, t_ms):
+        cars = []
+        for driver_number in self.driver_numbers:
+            car = {'driver_number': driver_number}
+            for name, (fields, _) in self.DATASETS.items():
+                series = self.series[name].get(driver_number)
+                values = series.at(t_ms) if series else None
+                for field in fields:
+                    car[field] = values[field] if values else None
+            # gap_to_leader/interval no formato da OpenF1: segundos ou '+N LAP(S)'
+            car['gap_to_leader'] = format_gap(car.pop('gap_to_leader_s'), car.pop('gap_laps'))
+            car['interval'] = format_gap(car.pop('interval_s'), car.pop('interval_laps'))
+            cars.append(car)
+        # Ordena pela posição de corrida (quem não tem posição vai para o fim)
+        cars.sort(key=lambda c: (c['position'] is None, c['position'] or 0, c['driver_number']))
+        return cars
+
+
+class SessionIndexCache:
+    """
+    Cache LRU de SessionTimeIndex por session_key, seguro para threads.
+    Cada índice guarda as versões dos dados (core/data_versions.py) com que foi montado; quando
+    uma importação (ou o live timing) incrementa alguma delas, o próximo acesso remonta o índice.
+    Acessos simultâneos à mesma sessão esperam uma única montagem.
+    """
+
+    def __init__(self, builder, versions, max_sessions=SESSION_INDEX_MAX_SESSIONS):
+        self.builder = builder   # session_key -> SessionTimeIndex, ou None se a sessão não existir
+        self.versions = versions # session_key -> valor que muda quando os dados da sessão mudam
+        self.max_sessions = max_sessions
+        self._indexes = OrderedDict() # session_key -> (versões, índice)
+        self._building = {}           # (session_key, versões) -> Future da montagem em andamento
+        self._lock = threading.Lock()
+
+    def get(self, session_key):
+        """Índice da sessão, ou None se ela não existir (nada é guardado nesse caso)."""
+        versions = self.versions(session_key)
+        key = (session_key, versions)
+        with self._lock:
+            cached = self._indexes.get(session_key)
+            if cached is not None and cached[0] == versions:
+                self._indexes.move_to_end(session_key)
+                return cached[1]
+            future = self._building.get(key)
+            owner = future is None
+            if owner:
+                future = self._building[key] = Future()
+        if not owner:
+            return future.result()
+
+        # Montagem fora do lock para não bloquear as outras sessões
+        try:
+            index = self.builder(session_key)
+        except BaseException as e:
+            with self._lock:
+                del self._building[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._building[key]
+            if index is not None:
+                self._indexes[session_key] = (versions, index)
+                self._indexes.move_to_end(session_key)
+                while len(self._indexes) > self.max_sessions:
+                    self._indexes.popitem(last=False)
+        future.set_result(index)
+        return index
+
+
+def session_data_versions(session_key):
+    """Versões dos datasets do índice, na ordem de SessionTimeIndex.DATASETS."""
+    versions = get_data_versions(tuple(SessionTimeIndex.DATASETS), session_key)
+    return tuple(versions[name][0] for name in SessionTimeIndex.DATASETS)
+
+
+def build_session_index(session_key):
+    if not Sessions.objects.filter(session_key=session_key).exists():
+        return None
+
+    def rows(model, *fields, date_field='date'):
+        return (
+            model.objects.filter(session_key=session_key, **{f'{date_field}__isnull': False})
+            .annotate(epoch_ms=epoch_ms_expression(date_field))
+            .order_by('driver_number', date_field)
+            .values_list('driver_number', 'epoch_ms', *fields)
+        )
+
+    return SessionTimeIndex(session_key, {
+        'location': rows(Location, 'x', 'y'),
+        'cardata': rows(CarData, 'speed', 'n_gear'),
+        'laps': rows(Laps, 'lap_number', date_field='date_start'),
+        'position': rows(Position, 'position'),
+        'intervals': rows(Intervals, 'gap_to_leader_s', 'gap_laps', 'interval_s', 'interval_laps'),
+    })
+
+
+session_indexes = SessionIndexCache(build_session_index, session_data_versions)
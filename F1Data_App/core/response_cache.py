@@ -0,0 +1,302 @@
+# G:\Learning\F1Data\F1Data_App\core\response_cache.py
+# Cache de respostas HTTP para os endpoints por sessão.
+# A chave do cache inclui o endpoint, os parâmetros normalizados e as versões dos datasets
+# (core/data_versions.py). Quando um importador grava dados de uma sessão a versão muda,
+# a chave muda junto e a entrada antiga simplesmente deixa de ser usada: nada expira por
+# tempo e nada precisa ser apagado explicitamente.
+# A mesma chave serve de ETag: um If-None-Match igual é respondido com 304 antes de a view
+# rodar, com uma única consulta (indexada) na tabela data_version.
+# O navegador recebe 'Cache-Control: no-cache' (revalida a cada requisição, então um reimport
+# aparece na hora) e só as sessões já terminadas recebem um max-age longo (ver session_finished).
+# A entrada guarda o corpo já comprimido (core/compression.py); cada acerto só escolhe a
+# variante pelo Accept-Encoding. Respostas em streaming (telemetria) são copiadas para o
+# cache enquanto são enviadas, até API_RESPONSE_CACHE_MAX_BYTES.
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils import timezone
+from django.utils.http import http_date
+
+from . import async_db
+from .compression import IDENTITY, choose_encoding, compress_variants
+from .data_versions import aget_data_versions, get_data_versions
+from .models import Sessions
+
+# Cabeçalhos da resposta original que são guardados junto com o corpo
+CACHED_HEADERS = ('Content-Type', 'Vary', 'X-Next-Date')
+
+CACHE_KEY_PREFIX = 'f1data:resp:v2:'
+FINISHED_KEY_PREFIX = 'f1data:finished:v1:'
+
+# Por quanto tempo o estado "terminada" de uma sessão/meeting fica no cache (uma sessão em
+# andamento é conferida de novo logo; uma terminada praticamente não volta atrás)
+FINISHED_STATE_TIMEOUT = {True: 60 * 60, False: 60}
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'API_RESPONSE_CACHE', 'default')]
+
+
+def normalized_query(request):
+    """Query string com parâmetros e valores ordenados, para que a ordem na URL não gere chaves diferentes."""
+    items = sorted((k, sorted(v)) for k, v in request.GET.lists())
+    return urlencode([(k, value) for k, values in items for value in values])
+
+
+def build_cache_key(datasets, key, versions, request, vary_headers=()):
+    version_token = '.'.join(f"{d}{versions[d][0]}" for d in datasets)
+    header_token = '|'.join(request.headers.get(h, '') for h in vary_headers)
+    raw = f"{request.path}|{key}|{version_token}|{normalized_query(request)}|{header_token}"
+    return CACHE_KEY_PREFIX + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def last_modified_of(versions):
+    """Timestamp (epoch s) da atualização mais recente, ou None se algum dataset nunca foi versionado."""
+    dates = [updated_at for _, updated_at in versions.values()]
+    if not dates or None in dates:
+        return None
+    return int(max(dates).timestamp())
+
+
+def finished_queryset(key_param, key):
+    """
+    (sessões, sessões terminadas) da chave: session_key é uma sessão, meeting_key todas as do
+    meeting. "Terminada" = date_end há mais de API_FINISHED_SESSION_GRACE.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.API_FINISHED_SESSION_GRACE)
+    return (
+        Sessions.objects.filter(**{key_param: key})
+        .values(key_param)
+        .annotate(total=Count('pk'), ended=Count('pk', filter=Q(date_end__lt=cutoff)))
+        .order_by()
+        .values_list('total', 'ended')
+    )
+
+
+def is_finished(row):
+    return row is not None and row[0] > 0 and row[0] == row[1]
+
+
+def session_finished(key_param, key):
+    """A resposta da chave ainda pode mudar por importação? (resultado guardado no cache de respostas)"""
+    cache = get_response_cache()
+    cache_key = f"{FINISHED_KEY_PREFIX}{key_param}:{key}"
+    finished = cache.get(cache_key)
+    if finished is None:
+        finished = is_finished(next(iter(finished_queryset(key_param, key)[:1]), None))
+        cache.set(cache_key, finished, timeout=FINISHED_STATE_TIMEOUT[finished])
+    return finished
+
+
+async def asession_finished(key_param, key):
+    """session_finished para as views async (pool de core/async_db.py)."""
+    cache = get_response_cache()
+    cache_key = f"{FINISHED_KEY_PREFIX}{key_param}:{key}"
+    finished = await cache.aget(cache_key)
+    if finished is None:
+        finished = is_finished(await async_db.fetch_one(finished_queryset(key_param, key)))
+        await cache.aset(cache_key, finished, timeout=FINISHED_STATE_TIMEOUT[finished])
+    return finished
+
+
+def set_validators(response, etag, last_modified, finished=False):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    if finished:
+        patch_cache_control(response, public=True, max_age=settings.API_FINISHED_SESSION_MAX_AGE)
+    else:
+        # Pode ser guardada, mas sempre revalidada: o If-None-Match volta 304 sem rodar a view
+        patch_cache_control(response, public=True, no_cache=True)
+
+
+def build_entry(content, response):
+    return {
+        'variants': compress_variants(content),
+        'headers': {h: response[h] for h in CACHED_HEADERS if response.has_header(h)},
+    }
+
+
+def response_from_entry(request, entry):
+    """Resposta com a variante (identity/gzip/br) que o cliente aceita."""
+    encoding = choose_encoding(request, entry['variants'])
+    response = HttpResponse(entry['variants'][encoding])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    if encoding != IDENTITY:
+        response['Content-Encoding'] = encoding
+    return response
+
+
+def tee_into_cache(response, store, max_bytes):
+    """Copia o corpo de uma resposta em streaming enquanto ela é enviada e chama store(conteúdo) no fim."""
+    source = response.streaming_content
+
+    def stream():
+        chunks, size = [], 0
+        for chunk in source:
+            if chunks is not None:
+                size += len(chunk)
+                if size > max_bytes:
+                    chunks = None # Grande demais para o cache: só repassa
+                else:
+                    chunks.append(chunk)
+            yield chunk
+        # Só chega aqui se o cliente recebeu tudo
+        if chunks is not None:
+            store(b''.join(chunks))
+
+    response.streaming_content = stream()
+
+
+def atee_into_cache(response, store, max_bytes):
+    """tee_into_cache para respostas com streaming async; 'store' é uma coroutine function."""
+    source = response.streaming_content
+
+    async def stream():
+        chunks, size = [], 0
+        async for chunk in source:
+            if chunks is not None:
+                size += len(chunk)
+                if size > max_bytes:
+                    chunks = None
+                else:
+                    chunks.append(chunk)
+            yield chunk
+        if chunks is not None:
+            await store(b''.join(chunks))
+
+    response.streaming_content = stream()
+
+
+def request_key(request, key_param):
+    """Chave (int) da sessão/meeting na query, ou None quando a requisição não é cacheável."""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    try:
+        return int(request.GET.get(key_param, ''))
+    except ValueError:
+        return None
+
+
+def cache_by_data_version(*datasets, key_param='session_key', vary_headers=(), poll_params=()):
+    """
+    Decorator para o dispatch de uma view (use com method_decorator(..., name='dispatch')).
+    'datasets' são os datasets de que a resposta depende e 'key_param' o parâmetro da query
+    que identifica a sessão (ou o meeting, para o dataset 'sessions'). 'vary_headers' são
+    cabeçalhos da requisição que mudam a resposta (ex: 'Accept' nas views de telemetria).
+    Só respostas 200 vão para o cache; parâmetros inválidos passam direto para a view.
+    Respostas 200 saem com ETag/Last-Modified; requisições condicionais que batem recebem 304.
+    Cache-Control: no-cache, ou max-age longo para sessões terminadas (session_finished).
+    'poll_params' marcam requisições de polling (ex: 'since' do race control): essas sempre saem
+    com no-cache e custam só a consulta de versões (um 304 quando nada mudou).
+    Em views async decore o 'get' (method_decorator(..., name='get')): o wrapper também é async
+    e as versões são lidas pelo pool de core/async_db.py.
+    """
+    def validators(request, key, versions):
+        cache_key = build_cache_key(datasets, key, versions, request, vary_headers)
+        # ETag fraco: gzip, brotli e identity são a mesma representação para fins de validação
+        etag = f'W/"{cache_key.rsplit(":", 1)[-1]}"'
+        return cache_key, etag, last_modified_of(versions)
+
+    def is_poll(request):
+        return any(request.GET.get(param) for param in poll_params)
+
+    def finalize(response, etag, last_modified, finished):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        set_validators(response, etag, last_modified, finished)
+        return response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            return async_decorator(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = request_key(request, key_param)
+            if key is None:
+                return view(request, *args, **kwargs)
+
+            cache_key, etag, last_modified = validators(request, key, get_data_versions(datasets, key))
+            finished = not is_poll(request) and session_finished(key_param, key)
+            conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if conditional is not None:
+                set_validators(conditional, etag, last_modified, finished)
+                return conditional
+
+            cache = get_response_cache()
+            timeout = settings.API_RESPONSE_CACHE_TIMEOUT
+            max_bytes = settings.API_RESPONSE_CACHE_MAX_BYTES
+            entry = cache.get(cache_key)
+            if entry is not None:
+                response = response_from_entry(request, entry)
+            else:
+                response = view(request, *args, **kwargs)
+                # Respostas do DRF ainda não foram renderizadas neste ponto
+                if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                    response.render()
+                if response.status_code != 200:
+                    return response
+                if response.streaming:
+                    tee_into_cache(
+                        response,
+                        lambda content, headers_from=response: cache.set(cache_key, build_entry(content, headers_from), timeout=timeout),
+                        max_bytes,
+                    )
+                elif len(response.content) <= max_bytes:
+                    entry = build_entry(response.content, response)
+                    cache.set(cache_key, entry, timeout=timeout)
+                    response = response_from_entry(request, entry)
+
+            return finalize(response, etag, last_modified, finished)
+        return wrapper
+
+    def async_decorator(view):
+        # A compressão é CPU pura: roda numa thread para não travar o event loop
+        abuild_entry = sync_to_async(build_entry, thread_sensitive=False)
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            key = request_key(request, key_param)
+            if key is None:
+                return await view(request, *args, **kwargs)
+
+            cache_key, etag, last_modified = validators(request, key, await aget_data_versions(datasets, key))
+            finished = not is_poll(request) and await asession_finished(key_param, key)
+            conditional = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if conditional is not None:
+                set_validators(conditional, etag, last_modified, finished)
+                return conditional
+
+            cache = get_response_cache()
+            timeout = settings.API_RESPONSE_CACHE_TIMEOUT
+            max_bytes = settings.API_RESPONSE_CACHE_MAX_BYTES
+            entry = await cache.aget(cache_key)
+            if entry is not None:
+                response = response_from_entry(request, entry)
+            else:
+                response = await view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                if response.streaming:
+                    async def store(content, headers_from=response):
+                        await cache.aset(cache_key, await abuild_entry(content, headers_from), timeout=timeout)
+                    if response.is_async:
+                        atee_into_cache(response, store, max_bytes)
+                elif len(response.content) <= max_bytes:
+                    entry = await abuild_entry(response.content, response)
+                    await cache.aset(cache_key, entry, timeout=timeout)
+                    response = response_from_entry(request, entry)
+
+            return finalize(response, etag, last_modified, finished)
+        return wrapper
+
+    return decorator
@@ -1,9 +1,11 @@
 # G:\Learning\F1Data\F1Data_App\core\serializers.py
 from rest_framework import serializers
-from .models import Meetings, Sessions, Drivers, Weather, SessionResult, Laps, Pit, Stint, Position, Intervals, RaceControl, TeamRadio, CarData, Location, Circuit
+from .models import Meetings, Sessions, Drivers, Weather, SessionResult, Laps, Pit, Stint, Position, Intervals, RaceControl, TeamRadio, CarData, Location, Circuit, CircuitOutline
 
 from django.db.models import Model
 
+from .fieldsets import SparseFieldsSerializerMixin
+
 # Serializer para listar anos distintos
 class YearSerializer(serializers.Serializer):
     year = serializers.ListField(child=serializers.IntegerField())
@@ -36,26 +38,26 @@ class MeetingFilterSerializer(serializers.ModelSerializer):
             return obj.get('meeting_official_name', obj.get('meeting_name', 'N/A'))
 
 # Serializer para sessões
-class SessionSerializer(serializers.ModelSerializer):
+class SessionSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Sessions
         # CORREÇÃO CRÍTICA: Adicione 'date_end' aqui!
         fields = ['session_key', 'date_start', 'date_end', 'session_name']
                 
 # Serializer para Drivers
-class DriversSerializer(serializers.ModelSerializer):
+class DriversSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Drivers
         fields = ['driver_number', 'broadcast_name', 'full_name', 'name_acronym', 'team_name', 'team_colour', 'first_name', 'last_name', 'headshot_url', 'country_code']
         
 # Serializer para Weather
-class WeatherSerializer(serializers.ModelSerializer):
+class WeatherSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Weather
         fields = ['session_key', 'meeting_key', 'session_date', 'wind_direction', 'air_temperature', 'humidity', 'pressure', 'rainfall', 'wind_speed', 'track_temperature',]
         
 # Serializer para SessionResult
-class SessionResultSerializer(serializers.Serializer):
+class SessionResultSerializer(SparseFieldsSerializerMixin, serializers.Serializer):
     # Campos da Sessão e Posição
     session_type = serializers.CharField()
     position = serializers.CharField(allow_null=True, required=False)
@@ -87,7 +89,7 @@ class SessionResultSerializer(serializers.Serializer):
     pos_q2 = serializers.IntegerField(allow_null=True, required=False) # <-- NOVO CAMPO
             
 # Serializer para Laps
-class LapsSerializer(serializers.ModelSerializer):
+class LapsSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Laps
         fields = ['session_key', 'driver_number', 'lap_number', 'date_start', 'duration_sector_1', 'duration_sector_2',
@@ -95,31 +97,34 @@ class LapsSerializer(serializers.ModelSerializer):
                   'segments_sector_2', 'segments_sector_3', 'st_speed'] 
         
 #Serializer para Pit Stops
-class PitSerializer(serializers.ModelSerializer):
+class PitSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Pit
         fields = ['session_key', 'driver_number', 'lap_number', 'date', 'pit_stop_duration']
 
 #Serializer para Stints
-class StintSerializer(serializers.ModelSerializer):
+class StintSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Stint
         fields = ['session_key', 'driver_number', 'stint_number', 'lap_start', 'lap_end', 'compound', 'tyre_age_at_start']
         
 #Serializer para Position
-class PositionSerializer(serializers.ModelSerializer):
+class PositionSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Position
         fields = ['session_key', 'driver_number', 'position', 'date']
         
 #Serializer para Intervals
-class IntervalsSerializer(serializers.ModelSerializer):
+class IntervalsSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    # No model o campo é 'interval_value' (coluna 'interval')
+    interval = serializers.CharField(source='interval_value', allow_null=True, required=False)
+
     class Meta:
         model = Intervals
-        fields = ['session_key', 'driver_number', 'date', 'gap_to_leader', 'interval']
+        fields = ['session_key', 'driver_number', 'date', 'gap_to_leader', 'interval', 'gap_to_leader_s', 'gap_laps', 'interval_s', 'interval_laps']
 
 # Serializer para RaceControl
-class RaceControlSerializer(serializers.Serializer): # ALTERADO: Herda de serializers.Serializer
+class RaceControlSerializer(SparseFieldsSerializerMixin, serializers.Serializer): # ALTERADO: Herda de serializers.Serializer
     meeting_key = serializers.IntegerField()
     session_key = serializers.IntegerField()
     # session_date já vem formatada como string da View
@@ -139,7 +144,7 @@ class RaceControlSerializer(serializers.Serializer): # ALTERADO: Herda de serial
     #     fields = ['session_key', 'session_date', 'driver_number', 'lap_number', 'category', 'flag', 'scope', 'sector', 'message']
                 
 #Serializer para TeamRadio
-class TeamRadioSerializer(serializers.ModelSerializer):
+class TeamRadioSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = TeamRadio
         fields = ['session_key', 'driver_number', 'date', 'recording_url']
@@ -163,6 +168,12 @@ class CircuitSerializer(serializers.ModelSerializer):
         model = Circuit
         fields = ['circuitid','circuitref','name','location','country','lat','lng','alt','url']
 
+# Serializer para o traçado derivado do circuito
+class CircuitOutlineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CircuitOutline
+        fields = ['circuit_key', 'session_key', 'driver_number', 'lap_number', 'points', 'start_finish']
+
 # Serializer para o novo endpoint de Min/Max de datas
 class MinMaxDateSerializer(serializers.Serializer):
     min_date = serializers.DateTimeField(default_timezone=None)
@@ -170,5 +181,15 @@ class MinMaxDateSerializer(serializers.Serializer):
     # Note: default_timezone=None é para desserialização (leitura),
     # mas ajuda a documentar a intenção do campo. Para serialização (saída),
     # DRF com USE_TZ=True serializará datetimes aware em ISO.
+    # Número de amostras e taxa média de amostragem (Hz), de TelemetryExtent
+    row_count = serializers.IntegerField(required=False)
+    sample_rate_hz = serializers.FloatField(allow_null=True, required=False)
 
-        
\ No newline at end of file
+        
+# Serializer para os extremos (primeira/última amostra) da telemetria de cada piloto
+class TelemetryExtentSerializer(serializers.Serializer):
+    driver_number = serializers.IntegerField()
+    location_min_date = serializers.DateTimeField(allow_null=True)
+    location_max_date = serializers.DateTimeField(allow_null=True)
+    car_data_min_date = serializers.DateTimeField(allow_null=True)
+    car_data_max_date = serializers.DateTimeField(allow_null=True)
@@ -0,0 +1,298 @@
+# G:\Learning\F1Data\F1Data_App\core\telemetry.py
+# Funções auxiliares para os endpoints de séries temporais (car_data e location).
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import BigIntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Extract, Floor
+from django.utils.dateparse import parse_datetime
+
+from . import async_db
+from .downsampling import MIN_POINTS
+from .models import CarData, Drivers, Location, TelemetryExtent
+
+# Tamanho máximo de uma janela de telemetria. O TrackMap pede janelas de 20 minutos,
+# então esse é o teto: qualquer pedido maior (ou sem fim) é cortado aqui e o cliente
+# continua a partir do cursor 'next'.
+MAX_WINDOW = timedelta(minutes=20)
+
+# Linhas buscadas por vez no cursor do servidor (server-side cursor) ao fazer streaming
+STREAM_CHUNK_SIZE = 2000
+
+# Cabeçalho HTTP que carrega o cursor da próxima janela (ver CORS_EXPOSE_HEADERS no settings)
+NEXT_CURSOR_HEADER = 'X-Next-Date'
+
+
+class TelemetryParamError(ValueError):
+    """Parâmetro de consulta inválido; a mensagem vai direto para o corpo do 400."""
+
+
+@dataclass
+class TelemetryWindow:
+    start: datetime = None
+    end: datetime = None          # Sempre exclusivo, exceto quando end_inclusive=True
+    end_inclusive: bool = False   # 'end_date' (estilo antigo) é inclusivo, 'date__lt' não
+    next: datetime = None         # Início da próxima janela, ou None se esta for a última
+
+    def apply(self, queryset):
+        """Aplica a janela como um range em 'date' (usa o índice session_key, driver_number, date)."""
+        if self.start:
+            queryset = queryset.filter(date__gte=self.start)
+        if self.end:
+            if self.end_inclusive:
+                queryset = queryset.filter(date__lte=self.end)
+            else:
+                queryset = queryset.filter(date__lt=self.end)
+        return queryset
+
+
+def parse_int_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        raise TelemetryParamError(f"O parâmetro '{name}' é obrigatório.")
+    try:
+        return int(value)
+    except ValueError:
+        raise TelemetryParamError(f"O parâmetro '{name}' deve ser um número inteiro.")
+
+
+def parse_max_points(params):
+    """'max_points' opcional para o downsampling; None quando ausente."""
+    value = params.get('max_points')
+    if value in (None, ''):
+        return None
+    try:
+        max_points = int(value)
+    except ValueError:
+        raise TelemetryParamError("O parâmetro 'max_points' deve ser um número inteiro.")
+    if max_points < MIN_POINTS:
+        raise TelemetryParamError(f"O parâmetro 'max_points' deve ser no mínimo {MIN_POINTS}.")
+    return max_points
+
+
+def parse_date_param(params, *names):
+    """
+    Lê o primeiro parâmetro presente entre 'names' como datetime timezone-aware.
+    O frontend manda datas UTC sem sufixo de fuso (ver formatDateForDjango no TrackMap.js),
+    então datas naive são tratadas como UTC.
+    """
+    for name in names:
+        value = params.get(name)
+        if not value:
+            continue
+        value = value.strip()
+        if len(value) > 10 and value[10] == ' ':
+            value = value[:10] + 'T' + value[11:]
+        # O '+' do offset vira espaço quando não vem escapado na query string
+        dt = parse_datetime(value.replace(' ', '+'))
+        if dt is None:
+            raise TelemetryParamError(f"O parâmetro '{name}' não é uma data válida: '{value}'.")
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt, name
+    return None, None
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def epoch_ms_to_datetime(epoch_ms):
+    return EPOCH + timedelta(milliseconds=epoch_ms)
+
+
+def format_cursor(dt):
+    """
+    Formata o cursor em ISO 8601 UTC ('Z') com microssegundos: a precisão das colunas do banco.
+    (O DjangoJSONEncoder corta em milissegundos; um cursor cortado repetiria ou perderia amostras.)
+    """
+    if dt is None:
+        return None
+    return dt.astimezone(timezone.utc).isoformat(timespec='microseconds').replace('+00:00', 'Z')
+
+
+def parse_window(params):
+    """
+    Lê a janela de tempo pedida, aceitando os dois estilos de parâmetro:
+      - date__gte / date__lt  (usado pelo TrackMap.js; fim exclusivo)
+      - start_date / end_date (estilo original; fim inclusivo)
+    Não consulta o banco; ver resolve_window.
+    """
+    start, _ = parse_date_param(params, 'date__gte', 'start_date')
+    end, end_name = parse_date_param(params, 'date__lt', 'end_date')
+
+    if start and end and end < start:
+        raise TelemetryParamError("O fim da janela deve ser posterior ao início.")
+
+    return TelemetryWindow(start=start, end=end, end_inclusive=(end_name == 'end_date'))
+
+
+def first_sample_query(queryset):
+    """Data da primeira amostra (um único probe no índice)."""
+    return queryset.order_by('date').values_list('date', flat=True)
+
+
+def cap_window(window, queryset, max_window=MAX_WINDOW):
+    """
+    Limita a janela (com início já definido) a 'max_window'. Quando o corte acontece, devolve o
+    queryset das amostras entre o fim efetivo e o fim pedido: se ele não for vazio, a próxima
+    janela começa em window.end. Devolve None quando não houve corte.
+    """
+    requested_end, requested_inclusive = window.end, window.end_inclusive
+    cap_end = window.start + max_window
+    if requested_end is not None and requested_end <= cap_end:
+        return None
+
+    window.end = cap_end
+    window.end_inclusive = False
+    remaining = queryset.filter(date__gte=cap_end)
+    if requested_end is not None:
+        remaining = remaining.filter(date__lte=requested_end) if requested_inclusive else remaining.filter(date__lt=requested_end)
+    return remaining
+
+
+def has_samples_after(extent, end):
+    """Pelo TelemetryExtent (dict de core/extents.py): há amostras a partir de 'end'?"""
+    return extent['max_date'] is not None and extent['max_date'] >= end
+
+
+def resolve_window(params, queryset, max_window=MAX_WINDOW, extent=None):
+    """
+    Monta a janela de tempo pedida (ver parse_window), limitada a 'max_window' (MAX_WINDOW por
+    padrão). Quando o corte acontece e ainda existem amostras depois do fim efetivo, 'next'
+    aponta para o início da próxima janela.
+    'queryset' já deve estar filtrado pela sessão (e pelo driver, quando for o caso).
+    Com 'extent' (extremos do piloto em TelemetryExtent) o início e o 'next' saem dele, sem
+    consultar a telemetria.
+    """
+    window = parse_window(params)
+
+    if window.start is None:
+        # Sem início: a janela começa na primeira amostra
+        window.start = extent['min_date'] if extent is not None else first_sample_query(queryset).first()
+        if window.start is None:
+            return window
+
+    remaining = cap_window(window, queryset, max_window)
+    if remaining is not None:
+        if has_samples_after(extent, window.end) if extent is not None else remaining.exists():
+            window.next = window.end
+
+    return window
+
+
+async def aresolve_window(params, queryset, max_window=MAX_WINDOW, extent=None):
+    """resolve_window para as views async: as mesmas consultas, executadas no pool de core/async_db.py."""
+    window = parse_window(params)
+
+    if window.start is None:
+        if extent is not None:
+            window.start = extent['min_date']
+        else:
+            row = await async_db.fetch_one(first_sample_query(queryset))
+            window.start = row[0] if row else None
+        if window.start is None:
+            return window
+
+    remaining = cap_window(window, queryset, max_window)
+    if remaining is not None:
+        if has_samples_after(extent, window.end) if extent is not None else await async_db.exists(remaining):
+            window.next = window.end
+
+    return window
+
+
+def epoch_ms_expression(field='date'):
+    """
+    Milissegundos desde a epoch (UTC) calculados no PostgreSQL. Evita criar um datetime
+    Python por amostra quando a resposta não precisa deles (formato colunar, downsampling).
+    """
+    return Cast(Floor(Extract(field, 'epoch', tzinfo=timezone.utc) * Value(1000)), BigIntegerField())
+
+
+def iter_chunks(queryset, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Percorre o queryset com um cursor do lado do servidor (.iterator) e devolve listas de
+    até 'chunk_size' linhas. Só um chunk fica em memória por vez.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def json_array_fragment(chunk, first):
+    """Fragmento de um array JSON com as linhas de 'chunk' (mesmo encoder e separadores do JsonResponse)."""
+    body = ', '.join(json.dumps(row, cls=DjangoJSONEncoder) for row in chunk)
+    return body if first else ', ' + body
+
+
+def stream_json_array(chunks):
+    """
+    Gera um array JSON em fragmentos, idêntico ao que o JsonResponse produziria
+    para a lista inteira (mesmo encoder e mesmos separadores).
+    """
+    yield '['
+    first = True
+    for chunk in chunks:
+        yield json_array_fragment(chunk, first)
+        first = False
+    yield ']'
+
+
+async def astream_json_array(chunks, fields):
+    """stream_json_array para chunks async de tuplas (async_db.iter_chunks) na ordem de 'fields'."""
+    yield '['
+    first = True
+    async for chunk in chunks:
+        yield json_array_fragment([dict(zip(fields, row)) for row in chunk], first)
+        first = False
+    yield ']'
+
+
+def telemetry_extents(session_key):
+    """
+    Primeira e última amostra de location e car_data de cada piloto da sessão, lidas de
+    TelemetryExtent. Se algum piloto ainda não tiver extremos calculados, cai nas subqueries
+    ORDER BY date LIMIT 1 no índice (session_key, driver_number, date), que também não dependem
+    do tamanho da sessão.
+    """
+    drivers = list(Drivers.objects.filter(session_key=session_key).order_by('driver_number').values_list('driver_number', flat=True))
+    extents = {
+        (driver_number, dataset): (min_date, max_date) for driver_number, dataset, min_date, max_date in
+        TelemetryExtent.objects.filter(session_key=session_key).values_list('driver_number', 'dataset', 'min_date', 'max_date')
+    }
+    if all((d, dataset) in extents for d in drivers for dataset in ('location', 'cardata')):
+        return [
+            {
+                'driver_number': d,
+                'location_min_date': extents[(d, 'location')][0],
+                'location_max_date': extents[(d, 'location')][1],
+                'car_data_min_date': extents[(d, 'cardata')][0],
+                'car_data_max_date': extents[(d, 'cardata')][1],
+            }
+            for d in drivers
+        ]
+
+    def edge(model, ordering):
+        return Subquery(
+            model.objects.filter(session_key=OuterRef('session_key'), driver_number=OuterRef('driver_number'))
+            .order_by(ordering)
+            .values('date')[:1]
+        )
+
+    return list(
+        Drivers.objects.filter(session_key=session_key)
+        .annotate(
+            location_min_date=edge(Location, 'date'),
+            location_max_date=edge(Location, '-date'),
+            car_data_min_date=edge(CarData, 'date'),
+            car_data_max_date=edge(CarData, '-date'),
+        )
+        .order_by('driver_number')
+        .values('driver_number', 'location_min_date', 'location_max_date', 'car_data_min_date', 'car_data_max_date')
+    )
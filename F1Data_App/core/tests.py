@@ -1,3 +1,530 @@
-from django.test import TestCase
+# G:\Learning\F1Data\F1Data_App\core\tests.py
+# Testes das funções puras dos endpoints (sem banco: SimpleTestCase e querysets não avaliados).
+import gzip
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import msgpack
+import numpy as np
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import ListAPIView
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from . import compression
+from .classification import classification_order, sort_position_value
+from .columnar import COLUMNAR_FORMAT, build_columns, encode_matrix, pack_columnar
+from .compression import IDENTITY, MIN_COMPRESS_SIZE, choose_encoding, compress_variants
+from .derived import integrate_distance
+from .downsampling import lttb_indices, path_indices
+from .fieldsets import SparseFieldsMixin, requested_fields
+from .gaps import format_gap, parse_gap, parse_gap_list
+from .lap_compare import resample_lap
+from .live import LIVE_DATASETS
+from .models import CarData, Laps, SessionClassification, SessionResult
+from .pagination import KEYSET_DEFAULT_LIMIT, KEYSET_MAX_LIMIT, KeysetPagination
+from .position_chart import asof_positions
+from .race_control import race_control_queryset, same_message_key
+from .serializers import LapsSerializer
+from .telemetry import (
+    MAX_WINDOW, TelemetryParamError, cap_window, format_cursor, parse_date_param, parse_window, resolve_window,
+)
+from .views import CarDataListBySessionAndDriver, TelemetryWindowView
+
+T0 = datetime(2024, 3, 2, 15, 0, tzinfo=timezone.utc)
+
+
+def query(**params):
+    params_dict = QueryDict(mutable=True)
+    params_dict.update(params)
+    return params_dict
+
+
+def extent(min_date, max_date):
+    return {'min_date': min_date, 'max_date': max_date, 'row_count': None, 'sample_rate_hz': None}
+
+
+class TelemetryWindowTests(SimpleTestCase):
+    queryset = CarData.objects.filter(session_key=1, driver_number=44)
+
+    def test_parse_window_accepts_both_param_styles(self):
+        window = parse_window(query(date__gte='2024-03-02T15:00:00', date__lt='2024-03-02T15:05:00'))
+        self.assertEqual((window.start, window.end, window.end_inclusive), (T0, T0 + timedelta(minutes=5), False))
+        window = parse_window(query(start_date='2024-03-02 15:00:00', end_date='2024-03-02 15:05:00'))
+        self.assertEqual((window.start, window.end, window.end_inclusive), (T0, T0 + timedelta(minutes=5), True))
+
+    def test_parse_window_rejects_end_before_start(self):
+        with self.assertRaises(TelemetryParamError):
+            parse_window(query(date__gte='2024-03-02T15:05:00', date__lt='2024-03-02T15:00:00'))
+
+    def test_cap_window_keeps_short_windows(self):
+        window = parse_window(query(date__gte='2024-03-02T15:00:00', date__lt='2024-03-02T15:05:00'))
+        self.assertIsNone(cap_window(window, self.queryset))
+        self.assertEqual(window.end, T0 + timedelta(minutes=5))
+
+    def test_cap_window_cuts_long_windows(self):
+        window = parse_window(query(date__gte='2024-03-02T15:00:00', end_date='2024-03-02T16:00:00'))
+        remaining = cap_window(window, self.queryset)
+        self.assertEqual((window.end, window.end_inclusive), (T0 + MAX_WINDOW, False))
+        # O restante vai do fim efetivo até o fim pedido (inclusivo, como o end_date)
+        sql = str(remaining.query)
+        self.assertIn('"date" >= 2024-03-02 15:20:00+00:00', sql)
+        self.assertIn('"date" <= 2024-03-02 16:00:00+00:00', sql)
+
+    def test_resolve_window_starts_at_first_sample_from_extent(self):
+        window = resolve_window(query(), self.queryset, extent=extent(T0, T0 + timedelta(hours=1)))
+        self.assertEqual((window.start, window.end, window.next), (T0, T0 + MAX_WINDOW, T0 + MAX_WINDOW))
+
+    def test_resolve_window_without_samples_after_cap(self):
+        window = resolve_window(query(), self.queryset, extent=extent(T0, T0 + MAX_WINDOW - timedelta(seconds=1)))
+        self.assertEqual(window.end, T0 + MAX_WINDOW)
+        self.assertIsNone(window.next)
+
+    def test_resolve_window_without_samples(self):
+        window = resolve_window(query(), self.queryset, extent=extent(None, None))
+        self.assertIsNone(window.start)
+        self.assertIsNone(window.end)
+
+    def test_resolve_window_custom_max_window(self):
+        window = resolve_window(
+            query(date__gte='2024-03-02T15:00:00'), self.queryset, max_window=timedelta(minutes=1),
+            extent=extent(T0, T0 + timedelta(minutes=10)),
+        )
+        self.assertEqual((window.end, window.next), (T0 + timedelta(minutes=1), T0 + timedelta(minutes=1)))
+
+
+def decode_column(column):
+    """Inverso de core/columnar.py, como o cliente decodifica (nulos viram nan)."""
+    values = np.frombuffer(column['data'], dtype=column['dtype'])
+    if column.get('encoding') == 'delta':
+        return np.cumsum(values)
+    values = values.astype(np.float64)
+    if 'null' in column:
+        values[values == column['null']] = np.nan
+    return values.reshape(column['shape']) if 'shape' in column else values
+
+
+class ColumnarTests(SimpleTestCase):
+    channels = {'speed': '<i2', 'n_gear': '<i1', 'lat_accel': '<f4'}
+    rows = [
+        (1709391600000, 280, 7, 1.5),
+        (1709391600270, None, 7, None),
+        (1709391600500, 283, None, -2.25),
+    ]
+
+    def test_round_trip(self):
+        columns = build_columns(self.rows, self.channels)
+        np.testing.assert_array_equal(decode_column(columns['date']), [row[0] for row in self.rows])
+        np.testing.assert_array_equal(decode_column(columns['speed']), [280, np.nan, 283])
+        np.testing.assert_array_equal(decode_column(columns['n_gear']), [7, 7, np.nan])
+        np.testing.assert_array_equal(decode_column(columns['lat_accel']), [1.5, np.nan, -2.25])
+
+    def test_null_markers(self):
+        columns = build_columns(self.rows, self.channels)
+        self.assertEqual(columns['speed']['null'], np.iinfo(np.int16).min)
+        # Canais float: o nulo é NaN, sem sentinela
+        self.assertNotIn('null', columns['lat_accel'])
+
+    def test_empty_payload(self):
+        payload = msgpack.unpackb(pack_columnar([], self.channels, next_cursor=None), raw=False)
+        self.assertEqual((payload['format'], payload['count'], payload['next']), (COLUMNAR_FORMAT, 0, None))
+        self.assertEqual(set(payload['columns']), {'date', *self.channels})
+        self.assertEqual(decode_column(payload['columns']['speed']).size, 0)
+
+    def test_packed_payload(self):
+        payload = msgpack.unpackb(pack_columnar(self.rows, self.channels, next_cursor='2024-03-02T15:20:00.000000Z'), raw=False)
+        self.assertEqual((payload['count'], payload['next']), (3, '2024-03-02T15:20:00.000000Z'))
+        np.testing.assert_array_equal(decode_column(payload['columns']['n_gear']), [7, 7, np.nan])
+
+    def test_matrix_round_trip(self):
+        matrix = np.array([[1, np.nan, 3], [4, 5, np.nan]])
+        column = encode_matrix(matrix, '<i1')
+        self.assertEqual(column['shape'], [2, 3])
+        np.testing.assert_array_equal(decode_column(column), matrix)
+
+    def test_encoding_does_not_modify_input(self):
+        values = np.array([1.0, np.nan])
+        build_columns([(0, values[0]), (1, values[1])], {'speed': '<i2'})
+        encode_matrix(values, '<i2')
+        self.assertTrue(np.isnan(values[1]))
+
+
+class DownsamplingTests(SimpleTestCase):
+    def test_lttb_returns_all_points_when_not_reducing(self):
+        np.testing.assert_array_equal(lttb_indices(np.arange(10), np.arange(10), 10), np.arange(10))
+        np.testing.assert_array_equal(lttb_indices(np.arange(3), np.arange(3), 2), np.arange(3))
+
+    def test_lttb_indices(self):
+        t = np.arange(1000, dtype=np.float64)
+        y = np.sin(t / 50)
+        y[500] = 10.0 # Pico isolado: tem que sobreviver à redução
+        indices = lttb_indices(t, y, 100)
+        self.assertEqual(len(indices), 100)
+        self.assertEqual((indices[0], indices[-1]), (0, 999))
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(500, indices)
+
+    def test_lttb_ignores_nulls(self):
+        y = np.ones(100)
+        y[10:20] = np.nan
+        indices = lttb_indices(np.arange(100), y, 10)
+        self.assertEqual(len(indices), 10)
+
+    def test_path_indices_collapses_stationary_samples(self):
+        # 50 amostras paradas nos boxes e depois uma reta
+        x = np.concatenate((np.zeros(50), np.arange(1, 101)))
+        y = np.zeros(150)
+        indices = path_indices(x, y, 11)
+        self.assertEqual((indices[0], indices[-1]), (0, 149))
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertLessEqual(np.sum(indices < 50), 1)
+
+    def test_path_indices_without_movement(self):
+        np.testing.assert_array_equal(path_indices(np.zeros(20), np.zeros(20), 5), [0, 19])
+
+    def test_views_downsample_rows(self):
+        rows = [(T0.timestamp() * 1000 + i, i % 7, i % 5) for i in range(100)]
+        # Sem algoritmo de redução a janela sai inteira; as views de telemetria reduzem
+        self.assertEqual(TelemetryWindowView().downsample_rows(rows, 10), rows)
+        self.assertEqual(len(CarDataListBySessionAndDriver().downsample_rows(rows, 10)), 10)
+
+
+def api_request(**params):
+    return Request(APIRequestFactory().get('/api/laps-by-session-and-driver/', params))
+
+
+class ListQuerySet:
+    """O mínimo de queryset que a CursorPagination usa (order_by, filter __gt/__lt e slice), sobre uma lista."""
+
+    def __init__(self, items):
+        self.items = list(items)
+
+    def order_by(self, *fields):
+        field = fields[0].lstrip('-')
+        return ListQuerySet(sorted(self.items, key=lambda item: getattr(item, field), reverse=fields[0].startswith('-')))
+
+    def filter(self, **lookups):
+        (lookup, value), = lookups.items()
+        field, op = lookup.split('__')
+        # A posição vem do cursor como texto; o ORM converteria para o tipo do campo
+        keep = (lambda v: v > type(v)(value)) if op == 'gt' else (lambda v: v < type(v)(value))
+        return ListQuerySet(item for item in self.items if keep(getattr(item, field)))
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+
+class KeysetPaginationTests(SimpleTestCase):
+    view = SimpleNamespace(keyset_ordering='lap_number')
+    laps = ListQuerySet(SimpleNamespace(lap_number=n) for n in range(1, 58))
+
+    def paginate(self, **params):
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(self.laps, api_request(**params), self.view)
+        return paginator, page
+
+    def test_without_params_returns_full_list(self):
+        paginator, page = self.paginate()
+        self.assertIsNone(page)
+
+    def test_page_size(self):
+        self.assertEqual(KeysetPagination().get_page_size(api_request(limit=20)), 20)
+        self.assertEqual(KeysetPagination().get_page_size(api_request(limit=10 ** 6)), KEYSET_MAX_LIMIT)
+        self.assertEqual(KeysetPagination().get_page_size(api_request(cursor='x')), KEYSET_DEFAULT_LIMIT)
+
+    def test_pages_follow_the_key(self):
+        paginator, page = self.paginate(limit=20)
+        self.assertEqual([lap.lap_number for lap in page], list(range(1, 21)))
+        seen = [lap.lap_number for lap in page]
+        while paginator.get_next_link():
+            cursor = parse_qs(urlparse(paginator.get_next_link()).query)['cursor'][0]
+            paginator, page = self.paginate(limit=20, cursor=cursor)
+            seen += [lap.lap_number for lap in page]
+        self.assertEqual(seen, list(range(1, 58)))
+
+
+def result(driver_number, position=None, laps=None, duration=None, **flags):
+    return SessionResult(
+        session_key=1, driver_number=driver_number, position=position, number_of_laps=laps, duration=duration,
+        dnf=flags.get('dnf', False), dns=flags.get('dns', False), dsq=flags.get('dsq', False),
+    )
+
+
+class ClassificationOrderTests(SimpleTestCase):
+    def order(self, session_type, *results):
+        # Mesma ordenação de session_classification sobre as linhas (não salvas) da classificação
+        rows = [
+            SessionClassification(driver_number=r.driver_number, sort_key=sort_position_value(r, session_type))
+            for r in results
+        ]
+        return [row.driver_number for row in sorted(rows, key=classification_order)]
+
+    def test_race(self):
+        order = self.order(
+            'Race',
+            result(16, 'DQ', 57, dsq=True),
+            result(81, 'NC', 40),
+            result(44, None, 20, dnf=True),
+            result(4, None, 0, dns=True),
+            result(1, '2', 57),
+            result(11, 'DNF', 45),
+            result(55, '1', 57),
+        )
+        # Classificados -> DNF (mais voltas antes) -> DNS -> DSQ -> status desconhecido (NC)
+        self.assertEqual(order, [55, 1, 11, 44, 4, 16, 81])
+
+    def test_race_ties_by_driver_number(self):
+        order = self.order('Race', result(22, None, 0, dns=True), result(3, None, 0, dns=True), result(10, None, None))
+        self.assertEqual(order, [3, 10, 22])
+
+    def test_qualifying(self):
+        order = self.order(
+            'Qualifying',
+            result(2, None, 3),
+            result(14, None, 9, duration=[None, 90.5, 90.9]),
+            result(63, None, 18, duration=[89.7, 90.1, 90.8]),
+            result(18, None, 6, duration=[None, None, 91.3]),
+            result(31, None, 18, duration=[89.4, 90.2, 90.6]),
+            result(27, None, 1),
+        )
+        # Q3 pelo tempo, depois Q2 e Q1; sem tempo nenhum por voltas (mais voltas antes)
+        self.assertEqual(order, [31, 63, 14, 18, 2, 27])
+
+    def test_practice(self):
+        order = self.order('Practice', result(5, None, 12), result(7, '2', 30), result(9, None, 25), result(8, '1', 28))
+        self.assertEqual(order, [8, 7, 9, 5])
+
+
+class SparseLapsView(SparseFieldsMixin, ListAPIView):
+    serializer_class = LapsSerializer
+    keyset_ordering = 'lap_number'
+
+
+class SparseFieldsTests(SimpleTestCase):
+    def test_requested_fields(self):
+        self.assertIsNone(requested_fields(api_request()))
+        self.assertIsNone(requested_fields(api_request(fields=' , ')))
+        self.assertEqual(requested_fields(api_request(fields='lap_duration, lap_number,lap_duration')), ['lap_duration', 'lap_number'])
+
+    def test_serializer_keeps_requested_fields(self):
+        lap = Laps(session_key=1, driver_number=44, lap_number=3, lap_duration=92.5, st_speed=310)
+        data = LapsSerializer(lap, context={'request': api_request(fields='lap_number,lap_duration')}).data
+        self.assertEqual(list(data), ['lap_number', 'lap_duration'])
+
+    def test_serializer_rejects_unknown_fields(self):
+        with self.assertRaises(ValidationError):
+            LapsSerializer(context={'request': api_request(fields='lap_number,nope')})
+
+    def test_queryset_loads_only_requested_columns(self):
+        view = SparseLapsView(request=api_request(fields='lap_duration'), format_kwarg=None, kwargs={})
+        queryset = view.filter_queryset(Laps.objects.filter(session_key=1))
+        columns, defer = queryset.query.deferred_loading
+        # .only() das colunas pedidas, mais a chave de paginação
+        self.assertFalse(defer)
+        self.assertEqual(set(columns), {'lap_duration', 'lap_number'})
+
+    def test_queryset_unchanged_without_fields(self):
+        view = SparseLapsView(request=api_request(), format_kwarg=None, kwargs={})
+        queryset = Laps.objects.filter(session_key=1)
+        self.assertIs(view.filter_queryset(queryset), queryset)
+
+
+class RaceControlSinceTests(SimpleTestCase):
+    def test_cursor_keeps_microseconds(self):
+        date = T0.replace(microsecond=123456)
+        cursor = format_cursor(date)
+        self.assertEqual(cursor, '2024-03-02T15:00:00.123456Z')
+        self.assertEqual(parse_date_param(query(since=cursor), 'since'), (date, 'since'))
+
+    def test_since_is_inclusive(self):
+        sql = str(race_control_queryset(1, T0).query)
+        self.assertIn('"session_date" >= 2024-03-02 15:00:00+00:00', sql)
+        self.assertNotIn('"session_date" >', sql.replace('"session_date" >=', ''))
+
+    def test_without_since(self):
+        self.assertNotIn('"session_date" >', str(race_control_queryset(1).query))
+
+    def test_same_instant_messages_are_distinct(self):
+        flag = {'driver_number': None, 'lap_number': 12, 'category': 'Flag', 'flag': 'YELLOW', 'sector': 5, 'message': 'YELLOW IN TRACK SECTOR 5'}
+        clear = dict(flag, flag='CLEAR', message='CLEAR IN TRACK SECTOR 5')
+        self.assertNotEqual(same_message_key(flag), same_message_key(clear))
+        self.assertEqual(same_message_key(flag), same_message_key(dict(flag, session_date=T0)))
+
+
+def encoding_request(accept_encoding):
+    return APIRequestFactory().get('/api/sessions/', HTTP_ACCEPT_ENCODING=accept_encoding)
+
+
+class CompressionTests(SimpleTestCase):
+    available = {IDENTITY: b'', 'br': b'', 'gzip': b''}
+
+    def choose(self, accept_encoding, available=None):
+        return choose_encoding(encoding_request(accept_encoding), available or self.available)
+
+    def test_prefers_brotli_on_equal_q(self):
+        self.assertEqual(self.choose('gzip, deflate, br'), 'br')
+        self.assertEqual(self.choose('gzip', {IDENTITY: b'', 'gzip': b''}), 'gzip')
+
+    def test_q_zero_refuses_encoding(self):
+        self.assertEqual(self.choose('gzip;q=0'), IDENTITY)
+        self.assertEqual(self.choose('br;q=0, gzip'), 'gzip')
+        self.assertEqual(self.choose('*;q=0'), IDENTITY)
+
+    def test_highest_q_wins(self):
+        self.assertEqual(self.choose('br;q=0.5, gzip;q=1'), 'gzip')
+        self.assertEqual(self.choose('*;q=0.5, gzip;q=0.2'), 'br')
+
+    def test_without_header(self):
+        self.assertEqual(self.choose(''), IDENTITY)
+
+    def test_small_responses_are_not_compressed(self):
+        self.assertEqual(compress_variants(b'x' * (MIN_COMPRESS_SIZE - 1)), {IDENTITY: b'x' * (MIN_COMPRESS_SIZE - 1)})
+
+    def test_compressed_variants(self):
+        content = b'{"driver_number": 1}' * MIN_COMPRESS_SIZE
+        variants = compress_variants(content)
+        self.assertEqual(gzip.decompress(variants['gzip']), content)
+        self.assertEqual(variants[IDENTITY], content)
+        # Sem o pacote brotli só há gzip
+        self.assertEqual('br' in variants, compression.brotli is not None)
+
+
+class LiveWatermarkTests(SimpleTestCase):
+    dataset = LIVE_DATASETS['position']
+
+    def rows(self, *pairs):
+        return [{'date': date, 'driver_number': driver_number, 'position': driver_number} for date, driver_number in pairs]
+
+    def test_inclusive_cursor(self):
+        self.assertIn('"date" >= 2024-03-02 15:00:00+00:00', str(self.dataset.queryset(1, T0).query))
+
+    def test_same_timestamp_rows_from_later_imports_are_sent(self):
+        watermark = (T0, frozenset({(1,), (2,)}))
+        # A busca inclusiva devolve de novo as linhas do instante da marca, mais a nova do piloto 3
+        rows, watermark = self.dataset.advance(watermark, self.rows((T0, 1), (T0, 2), (T0, 3)))
+        self.assertEqual([row['driver_number'] for row in rows], [3])
+        self.assertEqual(watermark, (T0, frozenset({(1,), (2,), (3,)})))
+
+    def test_watermark_moves_to_last_instant(self):
+        later = T0 + timedelta(microseconds=1)
+        rows, watermark = self.dataset.advance((T0, frozenset({(1,)})), self.rows((T0, 1), (later, 4), (later, 5)))
+        self.assertEqual([row['driver_number'] for row in rows], [4, 5])
+        self.assertEqual(watermark, (later, frozenset({(4,), (5,)})))
+
+    def test_nothing_new(self):
+        watermark = (T0, frozenset({(1,)}))
+        self.assertEqual(self.dataset.advance(watermark, self.rows((T0, 1))), ([], watermark))
+
+    def test_updated_lap_is_sent_again(self):
+        laps = LIVE_DATASETS['laps']
+        self.assertIn('"updated_at" >= 2024-03-02 15:00:00+00:00', str(laps.queryset(1, T0).query))
+        # Volta 5 enviada ao começar; a atualização (lap_duration) muda o cursor e ela sai de novo
+        later = T0 + timedelta(seconds=90)
+        lap = {'driver_number': 1, 'lap_number': 5, 'updated_at': later, 'lap_duration': 91.2}
+        rows, watermark = laps.advance((T0, frozenset({(1, 5)})), [lap])
+        self.assertEqual(rows, [lap])
+        self.assertEqual(watermark, (later, frozenset({(1, 5)})))
+
+
+class LapCompareTests(SimpleTestCase):
+    def test_integrate_distance_constant_speed(self):
+        # 360 km/h = 100 m/s
+        np.testing.assert_allclose(integrate_distance(np.array([0.0, 1.0, 2.0]), [360, 360, 360]), [0, 100, 200])
+
+    def test_integrate_distance_trapezoid(self):
+        # De 0 a 72 km/h (20 m/s) em 2 s: 20 m; depois 1 s a 20 m/s
+        np.testing.assert_allclose(integrate_distance(np.array([0.0, 2.0, 3.0]), [0, 72, 72]), [0, 20, 40])
+
+    def test_resample_lap(self):
+        t_s = np.array([0.0, 1.0, 2.0, 3.0])
+        distance = np.array([0.0, 10.0, 30.0, 60.0])
+        channels = {'speed': [100, 200, 300, 400], 'n_gear': [3, 4, 5, 6]}
+        time_at, resampled = resample_lap(t_s, distance, channels, np.array([0.0, 5.0, 20.0, 60.0]))
+        np.testing.assert_allclose(time_at, [0.0, 0.5, 1.5, 3.0])
+        # Canais contínuos são interpolados; discretos (marcha) ficam com a última amostra
+        np.testing.assert_allclose(resampled['speed'], [100, 150, 250, 400])
+        np.testing.assert_array_equal(resampled['n_gear'], [3, 3, 4, 6])
+
+    def test_resample_lap_stationary(self):
+        # Distância constante no início (carro parado): o tempo é o do primeiro instante
+        time_at, _ = resample_lap(np.array([0.0, 1.0, 2.0]), np.array([0.0, 0.0, 10.0]), {}, np.array([0.0]))
+        self.assertEqual(time_at[0], 0.0)
+
+
+class GapParsingTests(SimpleTestCase):
+    # As mesmas regras estão em SQL na migração 0007_numeric_gaps; os casos valem para as duas
+    cases = [
+        ('1.234', (1.234, None)),
+        ('+0.512', (0.512, None)),
+        (' 12 ', (12.0, None)),
+        ('+1 LAP', (None, 1)),
+        ('+2 LAPS', (None, 2)),
+        ('+1 Lap', (None, 1)),
+        ('3 laps', (None, 3)),
+        (None, (None, None)),
+        ('', (None, None)),
+        (1.5, (1.5, None)),
+        (7, (7.0, None)),
+        (float('nan'), (None, None)),
+        (True, (None, None)),
+        ('LAP', (None, None)),
+        ('nan', (None, None)),
+        ('inf', (None, None)),
+        ('1e3', (None, None)),
+        ('DNF', (None, None)),
+    ]
+
+    def test_parse_gap(self):
+        for value, expected in self.cases:
+            with self.subTest(value=value):
+                self.assertEqual(parse_gap(value), expected)
+
+    def test_parse_gap_list(self):
+        self.assertEqual(parse_gap_list(None), (None, None))
+        self.assertEqual(parse_gap_list(['1.5', '+1 LAP', None]), ([1.5, None, None], [None, 1, None]))
+
+    def test_format_gap(self):
+        self.assertEqual(format_gap(1.5, None), 1.5)
+        self.assertEqual(format_gap(None, 1), '+1 LAP')
+        self.assertEqual(format_gap(None, 2), '+2 LAPS')
+        self.assertIsNone(format_gap(None, None))
+
+
+class AsofPositionsTests(SimpleTestCase):
+    # (índice do piloto, epoch_ms, posição); as linhas não precisam vir ordenadas
+    positions = np.array([
+        (0, 1000, 3), (0, 3000, 2), (0, 5000, 1),
+        (1, 2000, 5), (1, 4000, 4),
+    ], dtype=np.float64)
+
+    def asof(self, *ends):
+        return asof_positions(self.positions, np.array(ends, dtype=np.float64).reshape(-1, 2))
+
+    def test_end_before_first_sample(self):
+        self.assertTrue(np.isnan(self.asof((0, 999))[0]))
+        # O piloto 1 só tem posição a partir de 2000; a do piloto 0 em 1000 não vale para ele
+        self.assertTrue(np.isnan(self.asof((1, 1500))[0]))
+
+    def test_exact_match(self):
+        np.testing.assert_array_equal(self.asof((0, 3000), (1, 2000)), [2, 5])
+
+    def test_last_position_before_end(self):
+        np.testing.assert_array_equal(self.asof((0, 2999), (0, 4500), (1, 3999), (1, 10 ** 6)), [3, 2, 5, 4])
+
+    def test_does_not_spill_into_next_driver(self):
+        # Depois da última amostra do piloto 0 vale a dele, não a primeira do piloto 1
+        np.testing.assert_array_equal(self.asof((0, 10 ** 6)), [1])
+        # Piloto sem nenhuma amostra (índice 2): nunca herda a última do piloto 1
+        self.assertTrue(np.isnan(self.asof((2, 10 ** 6))[0]))
+
+    def test_unsorted_input_and_ends(self):
+        shuffled = self.positions[[4, 0, 3, 2, 1]]
+        ends = np.array([(1, 4000), (0, 1000)], dtype=np.float64)
+        np.testing.assert_array_equal(asof_positions(shuffled, ends), [4, 3])
+
+    def test_empty(self):
+        self.assertEqual(asof_positions(np.empty((0, 3)), np.empty((0, 2))).size, 0)
+        self.assertTrue(np.isnan(asof_positions(np.empty((0, 3)), np.array([(0, 1.0)]))).all())
@@ -0,0 +1,46 @@
+# G:\Learning\F1Data\F1Data_App\core\threaded_views.py
+# Views síncronas (DRF e django.views.View) servidas via ASGI.
+# Sem isso o Django executa toda view sync com sync_to_async(thread_sensitive=True), ou seja,
+# numa única thread por processo: uma consulta lenta enfileira todas as outras requisições.
+# threaded_view transforma a view numa view async que roda o código sync num pool de threads
+# próprio (SYNC_VIEW_THREADS, do tamanho do pool de conexões do ORM), várias ao mesmo tempo.
+# Cada thread devolve a conexão do ORM (ao pool ou por CONN_MAX_AGE) ao fim da requisição.
+# Só para views que não fazem streaming: a resposta sai da thread já renderizada.
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import SyncToAsync
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    # Criado no primeiro uso, dentro do worker (depois do fork do gunicorn)
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.SYNC_VIEW_THREADS, thread_name_prefix='f1data-view')
+        return _executor
+
+
+def threaded_view(view):
+    """View async equivalente à view sync 'view' (resultado de as_view()), executada em get_executor()."""
+    def run(request, *args, **kwargs):
+        try:
+            response = view(request, *args, **kwargs)
+            # Respostas do DRF (e TemplateResponse) renderizam depois da view; aqui ainda na thread
+            if callable(getattr(response, 'render', None)):
+                response = response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await SyncToAsync(run, thread_sensitive=False, executor=get_executor())(request, *args, **kwargs)
+
+    return wrapper
@@ -1,23 +1,50 @@
 # G:\Learning\F1Data\F1Data_App\core/urls.py
+from django.conf import settings
 from django.urls import path
 from . import views
+from .threaded_views import threaded_view
+
+
+def read_view(view_class):
+    """Via ASGI a view sync roda no pool de threads de core/threaded_views.py (não na thread única de views sync)."""
+    view = view_class.as_view()
+    return threaded_view(view) if settings.ASYNC_VIEWS else view
+
+
+# Via ASGI (settings.ASYNC_VIEWS) os endpoints de telemetria usam as views async
+if settings.ASYNC_VIEWS:
+    CarDataView, LocationView, MinMaxLocationDateView = views.AsyncCarDataListBySessionAndDriver, views.AsyncLocationListBySessionAndDriver, views.AsyncMinMaxLocationDate
+else:
+    CarDataView, LocationView, MinMaxLocationDateView = views.CarDataListBySessionAndDriver, views.LocationListBySessionAndDriver, views.MinMaxLocationDate
 
 urlpatterns = [
     # Endpoint para os filtros de Meeting (anos e meetings por ano)
-    path('filters/meetings/', views.MeetingFilterAPIView.as_view(), name='meeting-filter'),
-    path('sessions-by-meeting/', views.SessionListByMeeting.as_view(), name='sessions-by-meeting'),
-    path('drivers-by-session/', views.DriversListBySession.as_view(), name='drivers-by-session'),
-    path('weather-by-session/', views.WeatherListBySession.as_view(), name='weather-by-session'),
-    path('session-results-by-session/', views.SessionResultListBySession.as_view(), name='session-results-by-session'),
-    path('laps-by-session-and-driver/', views.LapsListBySessionAndDriver.as_view(), name='laps-by-session-and-driver'),
-    path('pit-by-session-and-driver/', views.PitListBySessionAndDriver.as_view(), name='pit-by-session-and-driver'),
-    path('stints-by-session-and-driver/', views.StintListBySessionAndDriver.as_view(), name='stints-by-session-and-driver'),
-    path('position-by-session-and-driver/', views.PositionListBySessionAndDriver.as_view(), name='position-by-session-and-driver'),
-    path('intervals-by-session-and-driver/', views.IntervalsListBySessionAndDriver.as_view(), name='intervals-by-session-and-driver'),
-    path('race-control-by-session/', views.RaceControlListBySession.as_view(), name='race-control-by-session'),
-    path('team-radio-by-session-and-driver/', views.TeamRadioListBySessionAndDriver.as_view(), name='team-radio-by-session-and-driver'),
-    path('car-data-by-session-and-driver/', views.CarDataListBySessionAndDriver.as_view(), name='car-data-by-session-and-driver'),
-    path('location-by-session-and-driver/', views.LocationListBySessionAndDriver.as_view(), name='location-by-session-and-driver'),
-    path('circuit/', views.CircuitDetailByCircuitID.as_view(), name='circuit-detail'),
-    path('min-max-location-date/', views.MinMaxLocationDate.as_view(), name='min-max-location-date'),
+    path('filters/meetings/', read_view(views.MeetingFilterAPIView), name='meeting-filter'),
+    path('sessions-by-meeting/', read_view(views.SessionListByMeeting), name='sessions-by-meeting'),
+    path('drivers-by-session/', read_view(views.DriversListBySession), name='drivers-by-session'),
+    path('weather-by-session/', read_view(views.WeatherListBySession), name='weather-by-session'),
+    path('session-results-by-session/', read_view(views.SessionResultListBySession), name='session-results-by-session'),
+    path('laps-by-session-and-driver/', read_view(views.LapsListBySessionAndDriver), name='laps-by-session-and-driver'),
+    path('pit-by-session-and-driver/', read_view(views.PitListBySessionAndDriver), name='pit-by-session-and-driver'),
+    path('stints-by-session-and-driver/', read_view(views.StintListBySessionAndDriver), name='stints-by-session-and-driver'),
+    path('position-by-session-and-driver/', read_view(views.PositionListBySessionAndDriver), name='position-by-session-and-driver'),
+    path('position-chart/', read_view(views.PositionChartBySession), name='position-chart'),
+    path('intervals-by-session-and-driver/', read_view(views.IntervalsListBySessionAndDriver), name='intervals-by-session-and-driver'),
+    path('gap-chart/', read_view(views.GapChartBySession), name='gap-chart'),
+    path('race-control-by-session/', read_view(views.RaceControlListBySession), name='race-control-by-session'),
+    path('team-radio-by-session-and-driver/', read_view(views.TeamRadioListBySessionAndDriver), name='team-radio-by-session-and-driver'),
+    path('car-data-by-session-and-driver/', CarDataView.as_view(), name='car-data-by-session-and-driver'),
+    path('location-by-session-and-driver/', LocationView.as_view(), name='location-by-session-and-driver'),
+    path('lap-telemetry/', read_view(views.LapTelemetryBySessionAndDriver), name='lap-telemetry'),
+    path('lap-comparison/', read_view(views.LapComparison), name='lap-comparison'),
+    path('location-replay-by-session/', read_view(views.LocationReplayBySession), name='location-replay-by-session'),
+    path('replay-frame/', read_view(views.ReplayFrameBySession), name='replay-frame'),
+    path('circuit/', read_view(views.CircuitDetailByCircuitID), name='circuit-detail'),
+    path('circuit-outline/', read_view(views.CircuitOutlineByCircuitKey), name='circuit-outline'),
+    path('min-max-location-date/', MinMaxLocationDateView.as_view(), name='min-max-location-date'),
+    path('session-bundle/', read_view(views.SessionBundleBySession), name='session-bundle'),
+    path('live-timing/', views.LiveTimingStream.as_view(), name='live-timing'),
+    # Probes de liveness/readiness do Kubernetes
+    path('healthz/', views.LivenessView.as_view(), name='healthz'),
+    path('readyz/', views.ReadinessView.as_view(), name='readyz'),
 ]
\ No newline at end of file
@@ -4,6 +4,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+import asyncio
 import logging
 logger = logging.getLogger(__name__)
 
@@ -12,16 +13,51 @@ from django.utils.timezone import make_aware, is_naive, get_current_timezone
 
 #from django.utils import timezone as django_timezone
 
-from django.db.models import F, Case, When, Value, IntegerField, Min, Max
+from django.conf import settings
+from django.db import DatabaseError, OperationalError, connection
+from django.db.models import F, Case, When, Value, IntegerField
 from django.db.models.functions import Cast
-import math
-from django.http import JsonResponse
+import numpy as np
+import msgpack
+import psycopg
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.views import View
+from asgiref.sync import sync_to_async
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
 from django.contrib.postgres.fields import ArrayField
 
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import ValidationError, NotFound
  
-from .models import Meetings, Sessions, Drivers, Weather, SessionResult, Laps, Pit, Stint, Position, Intervals, RaceControl, TeamRadio, CarData, Location, Circuit
+from .models import Meetings, Sessions, Drivers, Weather, Laps, Pit, Stint, Position, Intervals, TeamRadio, CarData, Location, Circuit, CircuitOutline
+
+from .telemetry import (
+    TelemetryParamError, parse_int_param, parse_max_points, parse_date_param, resolve_window, aresolve_window, format_cursor,
+    epoch_ms_expression, epoch_ms_to_datetime, iter_chunks, stream_json_array, astream_json_array, telemetry_extents,
+    NEXT_CURSOR_HEADER, STREAM_CHUNK_SIZE
+)
+from .columnar import (
+    wants_columnar, pack_columnar, build_columns, iter_columnar_frames, aiter_columnar_frames, encode_matrix,
+    COLUMNAR_CONTENT_TYPE, COLUMNAR_FORMAT
+)
+from . import async_db, live
+from .downsampling import lttb_indices, path_indices
+from .classification import session_classification
+from .race_control import race_control_rows
+from .extents import as_extent, atelemetry_extent, extent_queryset, telemetry_extent
+from .derived import DERIVED_CHANNELS, derived_queryset, join_derived, parse_derived_channels
+from .laps import lap_bounds, parse_lap_numbers
+from .gaps import GAP_CHANNELS, gap_series
+from .position_chart import position_matrix
+from .lap_compare import compare_laps, parse_distance_step, parse_lap_refs
+from .pagination import KeysetPagination
+from .fieldsets import SparseFieldsMixin
+from .fast_json import FastListMixin
+from .response_cache import cache_by_data_version
+from .replay import (
+    parse_hz, build_clock, resample_positions, matrix_to_lists, session_indexes,
+    REPLAY_MAX_WINDOW, REPLAY_EDGE_MARGIN
+)
 
 from .serializers import (
     YearSerializer,
@@ -32,26 +68,14 @@ from .serializers import (
     SessionResultSerializer,
     LapsSerializer, PitSerializer, StintSerializer, PositionSerializer,
     IntervalsSerializer, RaceControlSerializer, TeamRadioSerializer, CarDataSerializer, LocationSerializer,
-    CircuitSerializer, MinMaxDateSerializer, PitSerializer
+    CircuitSerializer, CircuitOutlineSerializer, MinMaxDateSerializer, PitSerializer, TelemetryExtentSerializer
 )
 
-# --- CONSTANTES GLOBAIS PARA ORDENAÇÃO ---
-# (Certifique-se de que estas estejam no TOPO do arquivo, abaixo das importações)
-POS_MAX_FINISHER = 99 
-
-# Bases para STATUS (valores ABSOLUTOS de rank baixo)
-STATUS_NC_BASE = 100 # Not Classified (manter para fallback, mas o user disse que não vai ocorrer)
-STATUS_DNF_BASE = 200 # Did Not Finish
-STATUS_DNS_BASE = 300 # Did Not Start (agora inclui NULLs)
-STATUS_DSQ_BASE = 400 # Disqualified (O MAIOR valor = O PIOR RANK)
-POS_NULL_BASE = 500 # Para strings inesperadas que não são status conhecidos
-
-# Bases para Qualificação
-BASE_Q2 = 1000 
-BASE_Q1 = 2000 
-BASE_NO_TIME = 9000 # Base para DNQ / Sem tempo em Qualificação
-
-MAX_LAPS_VAL = 1000 
+# --- CONSTANTES GLOBAIS ---
+# Cache do traçado do circuito no cliente (30 dias)
+CIRCUIT_OUTLINE_MAX_AGE = 30 * 24 * 60 * 60
+# Tempo máximo da consulta da readiness (abaixo do timeoutSeconds da probe)
+READINESS_TIMEOUT = 2
 # --- FIM DAS CONSTANTES GLOBAIS ---
 
 # API para obter anos e meetings filtrados
@@ -76,7 +100,8 @@ class MeetingFilterAPIView(APIView):
             return Response({'available_years': list(distinct_years)}, status=status.HTTP_200_OK)
 
 # Endpoint para listar sessões filtradas por meeting_key
-class SessionListByMeeting(generics.ListAPIView):
+@method_decorator(cache_by_data_version('sessions', key_param='meeting_key'), name='dispatch')
+class SessionListByMeeting(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = SessionSerializer 
 
     def get_queryset(self):
@@ -90,7 +115,8 @@ class SessionListByMeeting(generics.ListAPIView):
         return Sessions.objects.none()
 
 # Endpoint para listar drivers filtradas por session_key
-class DriversListBySession(generics.ListAPIView):
+@method_decorator(cache_by_data_version('drivers'), name='dispatch')
+class DriversListBySession(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = DriversSerializer 
 
     def get_queryset(self):
@@ -104,8 +130,11 @@ class DriversListBySession(generics.ListAPIView):
         return Drivers.objects.none()
     
 #Endpoint para listar condições climáticas (Weather) filtradas por session_key
-class WeatherListBySession(generics.ListAPIView):
+@method_decorator(cache_by_data_version('weather'), name='dispatch')
+class WeatherListBySession(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = WeatherSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = 'session_date'
 
     def get_queryset(self):
         session_key = self.request.query_params.get('session_key', None)
@@ -118,6 +147,7 @@ class WeatherListBySession(generics.ListAPIView):
         return Weather.objects.none()
     
 # Endpoint para listar resultados de sessões filtradas por session_key
+@method_decorator(cache_by_data_version('session_results', 'drivers'), name='dispatch')
 class SessionResultListBySession(APIView):
     def get(self, request, *args, **kwargs):
         session_key = request.query_params.get('session_key')
@@ -130,159 +160,19 @@ class SessionResultListBySession(APIView):
         except ValueError:
             return Response({"error": "session_key deve ser um número inteiro."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            session_obj = Sessions.objects.get(session_key=session_key)
-            session_type = session_obj.session_type
-        except Sessions.DoesNotExist:
+        results = session_classification(session_key)
+        if results is None:
             return Response({"error": f"Sessão com session_key {session_key} não encontrada."}, status=status.HTTP_404_NOT_FOUND)
 
-        session_results_queryset = SessionResult.objects.filter(session_key=session_key)
-
-        def _calculate_sort_position_value(item_data, current_session_type):
-            pos_str = item_data['position'] 
-            is_dnf = item_data['dnf']
-            is_dns = item_data['dns']
-            is_dsq = item_data['dsq']
-            num_laps = item_data['number_of_laps'] if item_data['number_of_laps'] is not None else 0 
-
-            try:
-                position_numeric_value = int(pos_str)
-                return position_numeric_value 
-            except (ValueError, TypeError): # Se pos_str não é um número (ex: 'DQ', 'NC', None)
-                
-                if current_session_type == 'Race':
-                    # Ordem: Normal -> DNF (por laps) -> DNS (inclui NULLs) -> DSQ (último)
-                    if is_dnf or pos_str == 'DNF': # DNF (por laps)
-                        return STATUS_DNF_BASE - num_laps
-                    elif is_dns or pos_str == 'DNS' or pos_str is None: # DNS (agora inclui NULLs)
-                        return STATUS_DNS_BASE - num_laps
-                    elif is_dsq or pos_str == 'DQ': # DSQ (ÚLTIMO)
-                        return STATUS_DSQ_BASE - num_laps
-                    # else: Fallback para strings não capturadas (User disse que NC não haverá)
-                    # Usamos POS_NULL_BASE para qualquer outra coisa inesperada
-                    else: 
-                        return POS_NULL_BASE - num_laps
-                
-                elif current_session_type == 'Practice': # Lógica para Practice (já existente)
-                    # Assume que non-numéricos/null/status são agrupados após finishers e ordenados por laps
-                    return (POS_MAX_FINISHER + 1) + (MAX_LAPS_VAL - num_laps)
-                
-                elif current_session_type == 'Qualifying': # Lógica para Qualifying (já existente)
-                    q3_time = item_data['duration'][0] if item_data['duration'] and len(item_data['duration']) > 0 and item_data['duration'][0] is not None else None
-                    q2_time = item_data['duration'][1] if item_data['duration'] and len(item_data['duration']) > 1 and item_data['duration'][1] is not None else None
-                    q1_time = item_data['duration'][2] if item_data['duration'] and len(item_data['duration']) > 2 and item_data['duration'][2] is not None else None
-
-                    try:
-                        q3_time_float = float(q3_time) if q3_time is not None else math.inf
-                    except (ValueError, TypeError): q3_time_float = math.inf
-                    
-                    try:
-                        q2_time_float = float(q2_time) if q2_time is not None else math.inf
-                    except (ValueError, TypeError): q2_time_float = math.inf
-                    
-                    try:
-                        q1_time_float = float(q1_time) if q1_time is not None else math.inf
-                    except (ValueError, TypeError): q1_time_float = math.inf
-
-                    if q3_time_float != math.inf:
-                        return q3_time_float
-                    elif q2_time_float != math.inf:
-                        return BASE_Q2 + q2_time_float 
-                    elif q1_time_float != math.inf:
-                        return BASE_Q1 + q1_time_float 
-                    else: # Se não tem tempo em nenhuma etapa, vai para o final (DNQ)
-                        return BASE_NO_TIME + (MAX_LAPS_VAL - num_laps)
-
-                else: # Fallback para outros tipos de sessão não especificados (vão para o final)
-                    return POS_NULL_BASE - num_laps
-        
-        driver_numbers_in_session = session_results_queryset.values_list('driver_number', flat=True).distinct()
-        
-        drivers_data = {
-            d.driver_number: d
-            for d in Drivers.objects.filter(driver_number__in=driver_numbers_in_session)
-        }
-
-        combined_results = []
-        for sr in session_results_queryset:
-            driver_obj = drivers_data.get(sr.driver_number)
-            
-            combined_item = {
-                'session_type': session_type, 
-                'position': sr.position, 
-                'calculated_position': _calculate_sort_position_value(
-                    { 
-                        'position': sr.position, 'dnf': sr.dnf, 'dns': sr.dns, 'dsq': sr.dsq,
-                        'number_of_laps': sr.number_of_laps, 'duration': sr.duration 
-                    },
-                    session_type 
-                ), 
-                'driver_number': sr.driver_number,
-                'number_of_laps': sr.number_of_laps,
-                'dnf': sr.dnf,
-                'dns': sr.dns,
-                'dsq': sr.dsq,
-                'duration': sr.duration, 
-                'gap_to_leader': sr.gap_to_leader, 
-                
-                'broadcast_name': driver_obj.broadcast_name if driver_obj and driver_obj.broadcast_name is not None else 'Desconhecido',
-                'team_name': driver_obj.team_name if driver_obj and driver_obj.team_name is not None else 'Desconhecido',
-                'headshot_url': driver_obj.headshot_url if driver_obj and driver_obj.headshot_url is not None else None,
-                
-                'meeting_key': sr.meeting_key,
-                'session_key': sr.session_key,
-                'pos_q1': None, # Inicializa pos_q1
-                'pos_q2': None, # Inicializa pos_q2
-            }
-            combined_results.append(combined_item)
-
-        # --- LÓGICA DE CÁLCULO DE POS Q1/Q2 (APENAS PARA QUALIFYING) ---
-        if session_type == 'Qualifying':
-            # 1. Calcular Pos Q1
-            q1_participants_data = [] 
-            for idx, item in enumerate(combined_results):
-                q1_time_val = item['duration'][2] if item['duration'] and len(item['duration']) > 2 else None
-                if q1_time_val is not None: 
-                    try:
-                        q1_time_float = float(q1_time_val)
-                        q1_participants_data.append({'original_index': idx, 'time': q1_time_float})
-                    except (ValueError, TypeError):
-                        pass 
-
-            q1_participants_data.sort(key=lambda x: x['time'])
-
-            for rank, participant in enumerate(q1_participants_data, 1):
-                original_item_index = participant['original_index']
-                combined_results[original_item_index]['pos_q1'] = rank
-
-            # 2. Calcular Pos Q2
-            q2_participants_data = [] 
-            for idx, item in enumerate(combined_results):
-                q2_time_val = item['duration'][1] if item['duration'] and len(item['duration']) > 1 else None
-                if q2_time_val is not None: 
-                    try:
-                        q2_time_float = float(q2_time_val)
-                        q2_participants_data.append({'original_index': idx, 'time': q2_time_float})
-                    except (ValueError, TypeError):
-                        pass
-
-            q2_participants_data.sort(key=lambda x: x['time'])
-
-            for rank, participant in enumerate(q2_participants_data, 1):
-                original_item_index = participant['original_index']
-                combined_results[original_item_index]['pos_q2'] = rank
-        # --- FIM DA LÓGICA DE CÁLCULO DE POS Q1/Q2 ---
-
-        # 6. Ordenação Final Completa em Python (Mantida como estava)
-        final_sorted_results = sorted(combined_results, key=lambda x: x['calculated_position'])
-
-        # 7. Serializar e Retornar a Resposta
-        serializer = SessionResultSerializer(final_sorted_results, many=True)
+        serializer = SessionResultSerializer(results, many=True, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 # Endpoint para listar voltas (Laps) filtradas por session_key
-class LapsListBySessionAndDriver(generics.ListAPIView):
+@method_decorator(cache_by_data_version('laps'), name='dispatch')
+class LapsListBySessionAndDriver(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = LapsSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = 'lap_number'
 
     def get_queryset(self):
         session_key = self.request.query_params.get('session_key')
@@ -298,7 +188,8 @@ class LapsListBySessionAndDriver(generics.ListAPIView):
         return Laps.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('lap_number')
 
 # Endpoint para listar paradas (Pit Stops) filtradas por session_key e driver_number
-class PitListBySessionAndDriver(generics.ListAPIView):
+@method_decorator(cache_by_data_version('pit'), name='dispatch')
+class PitListBySessionAndDriver(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = PitSerializer
 
     def get_queryset(self):
@@ -315,7 +206,8 @@ class PitListBySessionAndDriver(generics.ListAPIView):
         return Pit.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('pit_stop_time')
 
 #Endpoint para listar stints filtradas por session_key e driver_number
-class StintListBySessionAndDriver(generics.ListAPIView):
+@method_decorator(cache_by_data_version('stint'), name='dispatch')
+class StintListBySessionAndDriver(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = StintSerializer
 
     def get_queryset(self):
@@ -332,8 +224,11 @@ class StintListBySessionAndDriver(generics.ListAPIView):
         return Stint.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('stint_number')
 
 #Endpoint para listar posições (Position) filtradas por session_key e driver_number
-class PositionListBySessionAndDriver(generics.ListAPIView):
+@method_decorator(cache_by_data_version('position'), name='dispatch')
+class PositionListBySessionAndDriver(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = PositionSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = 'date'
 
     def get_queryset(self):
         session_key = self.request.query_params.get('session_key')
@@ -346,11 +241,40 @@ class PositionListBySessionAndDriver(generics.ListAPIView):
         except ValueError:
             raise generics.ValidationError({"error": "Os parâmetros 'session_key' e 'driver_number' devem ser números inteiros."})
         
-        return Position.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('position')
+        return Position.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('date')
+
+# Gráfico de posições volta a volta: matriz piloto x volta de todos os pilotos da sessão
+# (core/position_chart.py). 'positions'[i][n] é a posição de 'drivers'[i] ao fim da volta n
+# (n = 0 é a largada, até 'max_lap'); null onde o piloto não completou a volta. Com ?format=msgpack a matriz
+# vem como um único array <i1 (formato colunar de core/columnar.py, com 'shape').
+@method_decorator(cache_by_data_version('position', 'laps', vary_headers=('Accept',)), name='dispatch')
+class PositionChartBySession(View):
+    def get(self, request):
+        try:
+            session_key = parse_int_param(request.GET, 'session_key')
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        drivers, matrix = position_matrix(session_key)
+        if not matrix.size:
+            return JsonResponse({'error': f"Nenhuma volta com início conhecido para session_key={session_key}."}, status=404)
+        data = {'session_key': session_key, 'drivers': drivers, 'max_lap': matrix.shape[1] - 1}
+        if wants_columnar(request):
+            data['format'] = COLUMNAR_FORMAT
+            data['positions'] = encode_matrix(matrix, '<i1')
+            response = HttpResponse(msgpack.packb(data, use_bin_type=True), content_type=COLUMNAR_CONTENT_TYPE)
+        else:
+            data['positions'] = [[None if np.isnan(p) else int(p) for p in row] for row in matrix.tolist()]
+            response = JsonResponse(data)
+        response['Vary'] = 'Accept'
+        return response
     
 #Endpoint para listar intervalos (Intervals) filtrados por session_key e driver_number
-class IntervalsListBySessionAndDriver(generics.ListAPIView):
+@method_decorator(cache_by_data_version('intervals'), name='dispatch')
+class IntervalsListBySessionAndDriver(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = IntervalsSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = 'date'
 
     def get_queryset(self):
         session_key = self.request.query_params.get('session_key')
@@ -363,9 +287,48 @@ class IntervalsListBySessionAndDriver(generics.ListAPIView):
         except ValueError:
             raise generics.ValidationError({"error": "Os parâmetros 'session_key' e 'driver_number' devem ser números inteiros."})
         
-        return Intervals.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('lap_number')
+        return Intervals.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('date')
+
+# Gráfico de gaps: séries numéricas (gap para o líder e intervalo, em segundos ou voltas de atraso)
+# de todos os pilotos da sessão numa única resposta, a partir das colunas convertidas na
+# importação (core/gaps.py). JSON por padrão; com ?format=msgpack cada série vem no formato
+# colunar de core/columnar.py.
+@method_decorator(cache_by_data_version('intervals', vary_headers=('Accept',)), name='dispatch')
+class GapChartBySession(View):
+    def get(self, request):
+        try:
+            session_key = parse_int_param(request.GET, 'session_key')
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        series = gap_series(session_key)
+        if wants_columnar(request):
+            data = {
+                'format': COLUMNAR_FORMAT,
+                'session_key': session_key,
+                'series': [
+                    {'driver_number': driver_number, 'count': len(rows), 'columns': build_columns(rows, GAP_CHANNELS)}
+                    for driver_number, rows in series.items()
+                ],
+            }
+            response = HttpResponse(msgpack.packb(data, use_bin_type=True), content_type=COLUMNAR_CONTENT_TYPE)
+        else:
+            fields = ('date', *GAP_CHANNELS)
+            data = {
+                'session_key': session_key,
+                'series': [
+                    {'driver_number': driver_number, **dict(zip(fields, map(list, zip(*rows))))}
+                    for driver_number, rows in series.items()
+                ],
+            }
+            for entry in data['series']:
+                entry['date'] = [epoch_ms_to_datetime(value) for value in entry['date']]
+            response = JsonResponse(data)
+        response['Vary'] = 'Accept'
+        return response
 
 #Endpoint para listar informações de controle de corrida (RaceControl) filtradas por session_key
+@method_decorator(cache_by_data_version('race_control', 'drivers', poll_params=('since',)), name='dispatch')
 class RaceControlListBySession(APIView): # HERDA DE APIView, NÃO generics.ListAPIView como estava antes.
     def get(self, request, *args, **kwargs):
         session_key = request.query_params.get('session_key')
@@ -378,47 +341,29 @@ class RaceControlListBySession(APIView): # HERDA DE APIView, NÃO generics.ListA
         except ValueError:
             return Response({"error": "O parâmetro 'session_key' deve ser um número inteiro."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Buscar dados de RaceControl filtrados por session_key
-        race_control_queryset = RaceControl.objects.filter(session_key=session_key).order_by('session_date')
-
-        driver_numbers_in_rc = [
-            rc.driver_number for rc in race_control_queryset if rc.driver_number is not None
-        ]
-        unique_driver_numbers_in_rc = list(set(driver_numbers_in_rc))
-
-        drivers_data = {
-            d.driver_number: d
-            for d in Drivers.objects.filter(driver_number__in=unique_driver_numbers_in_rc)
-        }
+        # 'since' (opcional): só mensagens com session_date a partir dele, para polling incremental.
+        # O cabeçalho X-Next-Date traz o valor a ser usado como 'since' na próxima requisição (com
+        # microssegundos). Como o filtro é inclusivo, as mensagens desse instante voltam na próxima
+        # resposta e o cliente descarta as que já tem; nenhuma mensagem com a mesma data se perde.
+        try:
+            since, _ = parse_date_param(request.query_params, 'since')
+        except TelemetryParamError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = race_control_rows(session_key, since)
+        last_date = rows[-1]['session_date_value'] if rows else since
+        serializer = RaceControlSerializer(rows, many=True, context={'request': request})
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        if last_date is not None:
+            response[NEXT_CURSOR_HEADER] = format_cursor(last_date)
+        return response
 
-        combined_rc_results = []
-        for rc_item in race_control_queryset:
-            driver_obj = drivers_data.get(rc_item.driver_number) # Retorna Driver object ou None
-            
-            formatted_session_date = rc_item.session_date.strftime('%Y-%m-%d %H:%M:%S') if rc_item.session_date else None
-
-            combined_rc_item = {
-                'meeting_key': rc_item.meeting_key,
-                'session_key': rc_item.session_key,
-                'session_date': formatted_session_date, # Data formatada
-                'driver_number': rc_item.driver_number,
-                'broadcast_name': driver_obj.broadcast_name if driver_obj and driver_obj.broadcast_name is not None else None, # NULL se driver_number for NULL ou driver não encontrado
-                'team_name': driver_obj.team_name if driver_obj and driver_obj.team_name is not None else 'Desconhecido',
-                'lap_number': rc_item.lap_number,
-                'category': rc_item.category,
-                'flag': rc_item.flag,
-                'scope': rc_item.scope, # Campo 'scope'
-                'sector': rc_item.sector,
-                'message': rc_item.message,
-            }
-            combined_rc_results.append(combined_rc_item)
-        
-        serializer = RaceControlSerializer(combined_rc_results, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-        
 # Endpoint para listar Team Radio filtradas por session_key e driver_number
-class TeamRadioListBySessionAndDriver(generics.ListAPIView):
+@method_decorator(cache_by_data_version('team_radio'), name='dispatch')
+class TeamRadioListBySessionAndDriver(FastListMixin, SparseFieldsMixin, generics.ListAPIView):
     serializer_class = TeamRadioSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = 'date'
 
     def get_queryset(self):
         session_key = self.request.query_params.get('session_key')
@@ -433,70 +378,322 @@ class TeamRadioListBySessionAndDriver(generics.ListAPIView):
         
         return TeamRadio.objects.filter( session_key=session_key, driver_number=driver_number ).order_by('date')
 
-# Endpoint para listar dados do carro (CarData) filtrados por session_key e driver_number
-class CarDataListBySessionAndDriver(View):
+# Base para os endpoints de séries temporais (CarData e Location) filtrados por session_key e driver_number.
+# A resposta cobre no máximo uma janela de MAX_WINDOW (core/telemetry.py); o início da próxima janela
+# vai no cabeçalho X-Next-Date (ausente na última janela).
+# Com ?format=msgpack (ou Accept: application/vnd.msgpack) a resposta sai no formato colunar
+# binário de core/columnar.py; JSON continua sendo o padrão.
+# Com ?max_points=N a janela é reduzida no servidor para no máximo N pontos (core/downsampling.py).
+# Com ?derived=canal1,canal2 (ou all) a resposta inclui os canais derivados pré-calculados de
+# core/derived.py; a janela é lida inteira (sem streaming) para casar as amostras.
+class TelemetryWindowView(View):
+    model = None
+    channels = {}  # {campo: dtype do formato colunar}
+    derived_channels = {} # Canais derivados disponíveis ({nome: dtype}); vazio = não aceita ?derived=
+
+    dataset = None # Dataset em TelemetryExtent ('cardata' ou 'location')
+
+    def telemetry_params(self, request):
+        """(session_key, driver_number, max_points) a partir da query."""
+        session_key = parse_int_param(request.GET, 'session_key')
+        driver_number = parse_int_param(request.GET, 'driver_number')
+        return session_key, driver_number, parse_max_points(request.GET)
+
+    def derived_params(self, request):
+        names = parse_derived_channels(request.GET)
+        if names and not self.derived_channels:
+            raise TelemetryParamError("O parâmetro 'derived' só está disponível no endpoint de car_data.")
+        return names
+
+    def use_derived(self, names):
+        """Acrescenta os canais derivados pedidos aos canais da resposta (só nesta instância da view)."""
+        self.channels = {**self.channels, **{name: self.derived_channels[name] for name in names}}
+
+    def epoch_rows(self, queryset):
+        return queryset.annotate(epoch_ms=epoch_ms_expression()).values_list('epoch_ms', *self.channels)
+
     def get(self, request):
-        session_key = request.GET.get('session_key')
-        driver_number = request.GET.get('driver_number')
-        start_date_str = request.GET.get('start_date')
-        end_date_str = request.GET.get('end_date')
+        try:
+            session_key, driver_number, max_points = self.telemetry_params(request)
+            derived = self.derived_params(request)
+            queryset = self.model.objects.filter(session_key=session_key, driver_number=driver_number)
+            # Início e continuação da janela pelos extremos pré-calculados (sem sondar a telemetria)
+            extent = as_extent(extent_queryset(self.dataset, session_key, driver_number).first())
+            window = resolve_window(request.GET, queryset, extent=extent)
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        queryset = window.apply(queryset).order_by('date')
+        next_cursor = format_cursor(window.next)
+        columnar = wants_columnar(request)
+
+        if derived:
+            rows = list(self.epoch_rows(queryset))
+            if rows:
+                rows = join_derived(rows, derived_queryset(session_key, driver_number, rows[0][0], rows[-1][0]), derived)
+            self.use_derived(derived)
+            response = self.downsampled_response(rows, max_points, columnar, next_cursor)
+
+        elif max_points:
+            # O downsampling precisa da janela inteira; ela é lida uma vez como arrays e reduzida
+            response = self.downsampled_response(list(self.epoch_rows(queryset)), max_points, columnar, next_cursor)
+
+        # Streaming com cursor do lado do servidor: memória e tempo até o primeiro byte
+        # não dependem do tamanho da janela
+        elif columnar:
+            frames = iter_columnar_frames(iter_chunks(self.epoch_rows(queryset)), self.channels, next_cursor)
+            response = StreamingHttpResponse(frames, content_type=COLUMNAR_CONTENT_TYPE)
+        else:
+            rows = queryset.values('date', *self.channels)
+            response = StreamingHttpResponse(stream_json_array(iter_chunks(rows)), content_type='application/json')
+
+        return self.finalize_response(response, next_cursor)
+
+    def downsampled_response(self, rows, max_points, columnar, next_cursor):
+        rows = self.downsample_rows(rows, max_points)
+        if columnar:
+            return HttpResponse(pack_columnar(rows, self.channels, next_cursor), content_type=COLUMNAR_CONTENT_TYPE)
+        return JsonResponse(self.json_rows(rows), safe=False)
+
+    def downsample_rows(self, rows, max_points):
+        """Linhas de epoch_rows reduzidas para no máximo max_points (None = sem redução)."""
+        if not max_points or len(rows) <= max_points:
+            return rows
+        keep = self.downsample_indices(np.array(rows, dtype=np.float64), max_points)
+        if keep is None:
+            return rows
+        return [rows[i] for i in keep]
+
+    def json_rows(self, rows):
+        """Linhas de epoch_rows -> dicts no formato JSON dos endpoints ('date' como datetime)."""
+        fields = ('date', *self.channels)
+        return [dict(zip(fields, (epoch_ms_to_datetime(row[0]), *row[1:]))) for row in rows]
+
+    def finalize_response(self, response, next_cursor):
+        response['Vary'] = 'Accept'
+        if next_cursor:
+            response[NEXT_CURSOR_HEADER] = next_cursor
+        return response
+
+    def downsample_indices(self, data, max_points):
+        """
+        Índices das linhas mantidas, ou None para não reduzir (padrão das subclasses sem algoritmo).
+        'data' é um array (n, 1 + canais) com epoch_ms na coluna 0 e os canais na ordem de self.channels.
+        """
+        return None
+
+# Versão async de TelemetryWindowView, usada quando a API roda via ASGI (settings.ASYNC_VIEWS).
+# Mesmos parâmetros e mesmas respostas; as consultas rodam no pool async de core/async_db.py,
+# então uma janela lenta não prende um worker enquanto o banco responde.
+class AsyncTelemetryWindowView(TelemetryWindowView):
+    async def get(self, request):
+        try:
+            session_key, driver_number, max_points = self.telemetry_params(request)
+            derived = self.derived_params(request)
+            queryset = self.model.objects.filter(session_key=session_key, driver_number=driver_number)
+            extent = as_extent(await async_db.fetch_one(extent_queryset(self.dataset, session_key, driver_number)))
+            window = await aresolve_window(request.GET, queryset, extent=extent)
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        queryset = window.apply(queryset).order_by('date')
+        next_cursor = format_cursor(window.next)
+        columnar = wants_columnar(request)
+
+        if derived:
+            rows = await async_db.fetch_all(self.epoch_rows(queryset))
+            if rows:
+                blocks = await async_db.fetch_all(derived_queryset(session_key, driver_number, rows[0][0], rows[-1][0]))
+                rows = join_derived(rows, blocks, derived)
+            self.use_derived(derived)
+            response = self.downsampled_response(rows, max_points, columnar, next_cursor)
+        elif max_points:
+            rows = await async_db.fetch_all(self.epoch_rows(queryset))
+            response = self.downsampled_response(rows, max_points, columnar, next_cursor)
+        elif columnar:
+            chunks = async_db.iter_chunks(self.epoch_rows(queryset), STREAM_CHUNK_SIZE)
+            response = StreamingHttpResponse(aiter_columnar_frames(chunks, self.channels, next_cursor), content_type=COLUMNAR_CONTENT_TYPE)
+        else:
+            fields = ('date', *self.channels)
+            chunks = async_db.iter_chunks(queryset.values_list(*fields), STREAM_CHUNK_SIZE)
+            response = StreamingHttpResponse(astream_json_array(chunks, fields), content_type='application/json')
 
-        if not session_key or not driver_number:
-            return JsonResponse({'error': 'session_key e driver_number são obrigatórios'}, status=400)
-
-        # Converter datas para datetime naive (sem timezone)
-        start_date = parse_datetime(start_date_str) if start_date_str else None
-        end_date = parse_datetime(end_date_str) if end_date_str else None
-
-        # Remover timezone se presente
-        if start_date and start_date.tzinfo:
-            start_date = start_date.replace(tzinfo=None)
-        if end_date and end_date.tzinfo:
-            end_date = end_date.replace(tzinfo=None)
-
-        # Filtrar dados
-        queryset = CarData.objects.filter(session_key=session_key, driver_number=driver_number)
-        if start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(date__lte=end_date)
-
-        # Selecionar os campos relevantes e ordenar por data
-        data = list(queryset.order_by('date').values(
-            'date', 'speed', 'n_gear', 'drs', 'throttle', 'brake', 'rpm'
-        ))
-        return JsonResponse(data, safe=False)
+        return self.finalize_response(response, next_cursor)
+
+class CarDataTelemetry:
+    model = CarData
+    dataset = 'cardata'
+    channels = {'speed': '<i2', 'n_gear': '<i1', 'drs': '<i1', 'throttle': '<i1', 'brake': '<i1', 'rpm': '<i4'}
+    derived_channels = DERIVED_CHANNELS
+
+    def downsample_indices(self, data, max_points):
+        # LTTB sobre a velocidade; os demais canais seguem os mesmos índices
+        return lttb_indices(data[:, 0], data[:, 1], max_points)
+
+class LocationTelemetry:
+    model = Location
+    dataset = 'location'
+    channels = {'x': '<i4', 'y': '<i4'}
+
+    def downsample_indices(self, data, max_points):
+        # Traçado x/y: decimação por distância percorrida
+        return path_indices(data[:, 1], data[:, 2], max_points)
+
+# Endpoint para listar dados do carro (CarData) filtrados por session_key e driver_number
+@method_decorator(cache_by_data_version('cardata', 'derived', vary_headers=('Accept',)), name='dispatch')
+class CarDataListBySessionAndDriver(CarDataTelemetry, TelemetryWindowView):
+    pass
+
+@method_decorator(cache_by_data_version('cardata', 'derived', vary_headers=('Accept',)), name='get')
+class AsyncCarDataListBySessionAndDriver(CarDataTelemetry, AsyncTelemetryWindowView):
+    pass
     
 # Endpoint para listar localizações (Location) filtradas por session_key e driver_number    
-class LocationListBySessionAndDriver(View):
-    def get(self, request):
-        session_key = request.GET.get('session_key')
-        driver_number = request.GET.get('driver_number')
-        start_date_str = request.GET.get('start_date')
-        end_date_str = request.GET.get('end_date')
+@method_decorator(cache_by_data_version('location', vary_headers=('Accept',)), name='dispatch')
+class LocationListBySessionAndDriver(LocationTelemetry, TelemetryWindowView):
+    pass
 
-        if not session_key or not driver_number:
-            return JsonResponse({'error': 'session_key e driver_number são obrigatórios'}, status=400)
-
-        # Converter datas para datetime naive (sem timezone)
-        start_date = parse_datetime(start_date_str) if start_date_str else None
-        end_date = parse_datetime(end_date_str) if end_date_str else None
-
-        # Remover qualquer info de timezone, se por acaso vier
-        if start_date and start_date.tzinfo:
-            start_date = start_date.replace(tzinfo=None)
-        if end_date and end_date.tzinfo:
-            end_date = end_date.replace(tzinfo=None)
-
-        # Filtrar dados
-        queryset = Location.objects.filter(session_key=session_key, driver_number=driver_number)
-        if start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(date__lte=end_date)
-        data = list(queryset.order_by('date').values('date', 'x', 'y'))
-        return JsonResponse(data, safe=False)
+@method_decorator(cache_by_data_version('location', vary_headers=('Accept',)), name='get')
+class AsyncLocationListBySessionAndDriver(LocationTelemetry, AsyncTelemetryWindowView):
+    pass
                                         
+# Endpoint de telemetria por volta: car_data e location de uma ou mais voltas de um piloto
+# (?lap_number=12 ou ?lap_number=3,4,10). Os limites de cada volta vêm da tabela laps
+# (core/laps.py) e cada volta é uma varredura de range no índice (session_key, driver_number, date).
+# Aceita ?max_points=N (por volta e por dataset) e o formato colunar (?format=msgpack), como os
+# endpoints por janela.
+LAP_TELEMETRY_VIEWS = {'car_data': CarDataListBySessionAndDriver, 'location': LocationListBySessionAndDriver}
+
+@method_decorator(cache_by_data_version('laps', 'cardata', 'location', vary_headers=('Accept',)), name='dispatch')
+class LapTelemetryBySessionAndDriver(View):
+    def get(self, request):
+        try:
+            session_key = parse_int_param(request.GET, 'session_key')
+            driver_number = parse_int_param(request.GET, 'driver_number')
+            lap_numbers = parse_lap_numbers(request.GET)
+            max_points = parse_max_points(request.GET)
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        bounds = lap_bounds(session_key, driver_number, lap_numbers)
+        missing = [n for n in lap_numbers if n not in bounds]
+        if missing:
+            return JsonResponse({'error': f"Voltas sem início conhecido para session_key={session_key}, driver_number={driver_number}: {', '.join(map(str, missing))}."}, status=404)
+
+        columnar = wants_columnar(request)
+        telemetry = {name: view_class() for name, view_class in LAP_TELEMETRY_VIEWS.items()}
+        laps = []
+        for lap_number in lap_numbers:
+            lap = bounds[lap_number]
+            entry = {'lap_number': lap_number, 'date_start': lap.start, 'date_end': lap.end, 'lap_duration': lap.lap_duration}
+            for name, view in telemetry.items():
+                queryset = view.model.objects.filter(
+                    session_key=session_key, driver_number=driver_number, date__gte=lap.start, date__lt=lap.end,
+                ).order_by('date')
+                rows = view.downsample_rows(list(view.epoch_rows(queryset)), max_points)
+                entry[name] = build_columns(rows, view.channels) if columnar else view.json_rows(rows)
+            laps.append(entry)
+
+        data = {'session_key': session_key, 'driver_number': driver_number, 'laps': laps}
+        if columnar:
+            for entry in laps:
+                entry['date_start'] = format_cursor(entry['date_start'])
+                entry['date_end'] = format_cursor(entry['date_end'])
+            data['format'] = COLUMNAR_FORMAT
+            response = HttpResponse(msgpack.packb(data, use_bin_type=True), content_type=COLUMNAR_CONTENT_TYPE)
+        else:
+            response = JsonResponse(data)
+        response['Vary'] = 'Accept'
+        return response
+
+# Comparação de voltas alinhadas por distância (core/lap_compare.py):
+# ?laps=session_key:driver_number:lap_number,... (2 a 6 voltas, de sessões e pilotos quaisquer; a
+# primeira é a referência) e ?step= (metros, padrão 5). Devolve a grade de distância, o tempo
+# acumulado, os canais de car_data reamostrados e o delta para a referência de cada volta.
+# As voltas podem ser de sessões diferentes, então o cache é por par de voltas (em lap_compare),
+# não pelo decorator de resposta, que identifica uma única sessão.
+class LapComparison(View):
+    def get(self, request):
+        try:
+            refs = parse_lap_refs(request.GET)
+            step = parse_distance_step(request.GET)
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        data, missing = compare_laps(refs, step)
+        if missing:
+            laps = ', '.join(f"{lap.session_key}:{lap.driver_number}:{lap.lap_number}" for lap in missing)
+            return JsonResponse({'error': f"Voltas sem limites ou telemetria suficientes para a comparação: {laps}."}, status=404)
+        return JsonResponse(data)
+
+# Endpoint de replay: posições de todos os pilotos de uma sessão num relógio comum (?hz=, padrão 4 Hz),
+# para uma janela de até REPLAY_MAX_WINDOW. Aceita os mesmos parâmetros de janela e formato
+# (JSON ou msgpack) dos endpoints por piloto. 'positions' tem formato (tempo, piloto, [x, y]).
+class LocationReplayBySession(View):
+    def get(self, request):
+        try:
+            session_key = parse_int_param(request.GET, 'session_key')
+            hz = parse_hz(request.GET)
+            queryset = Location.objects.filter(session_key=session_key)
+            window = resolve_window(request.GET, queryset, max_window=REPLAY_MAX_WINDOW)
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        drivers, matrix, clock = [], np.empty((0, 0, 2)), np.empty(0)
+        if window.start and window.end:
+            rows = list(
+                queryset.filter(date__gte=window.start - REPLAY_EDGE_MARGIN, date__lt=window.end + REPLAY_EDGE_MARGIN)
+                .annotate(epoch_ms=epoch_ms_expression())
+                .order_by('driver_number', 'date')
+                .values_list('driver_number', 'epoch_ms', 'x', 'y')
+            )
+            clock = build_clock(window.start.timestamp() * 1000, window.end.timestamp() * 1000, hz)
+            drivers, matrix = resample_positions(rows, clock)
+
+        next_cursor = format_cursor(window.next)
+        payload = {
+            'session_key': session_key,
+            't0': int(clock[0]) if clock.size else None,
+            'hz': hz,
+            'count': int(clock.size),
+            'drivers': drivers,
+            'next': next_cursor,
+        }
+        if wants_columnar(request):
+            payload['positions'] = encode_matrix(matrix, '<i4')
+            response = HttpResponse(msgpack.packb(payload, use_bin_type=True), content_type=COLUMNAR_CONTENT_TYPE)
+        else:
+            payload['positions'] = matrix_to_lists(matrix)
+            response = JsonResponse(payload)
+
+        response['Vary'] = 'Accept'
+        if next_cursor:
+            response[NEXT_CURSOR_HEADER] = next_cursor
+        return response
+
+# Endpoint de frame do replay: estado de todos os carros (posição x/y, velocidade, marcha, volta,
+# posição de corrida e intervalo) num instante 't'. Servido pelo índice em memória da sessão
+# (core/replay.py), montado no primeiro acesso e remontado quando as versões dos dados da sessão
+# mudam; depois disso cada busca é só busca binária.
+class ReplayFrameBySession(View):
+    def get(self, request):
+        try:
+            session_key = parse_int_param(request.GET, 'session_key')
+            t, _ = parse_date_param(request.GET, 't')
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        if t is None:
+            return JsonResponse({'error': "O parâmetro 't' é obrigatório."}, status=400)
+
+        index = session_indexes.get(session_key)
+        if index is None:
+            return JsonResponse({'error': f"Sessão não encontrada: session_key={session_key}."}, status=404)
+        return JsonResponse({
+            'session_key': session_key,
+            't': format_cursor(t),
+            'cars': index.frame(t.timestamp() * 1000),
+        })
+
 #Endpoint para listar circuitos filtrados por circuit_key
 class CircuitDetailByCircuitID(generics.RetrieveAPIView):
     serializer_class = CircuitSerializer
@@ -515,6 +712,33 @@ class CircuitDetailByCircuitID(generics.RetrieveAPIView):
         except Circuit.DoesNotExist:
             raise ValidationError({"error": f"Circuito com circuitid={circuit_key} não encontrado."})
 
+# Endpoint para o traçado simplificado do circuito (derivado da location), filtrado por circuit_key.
+# O traçado é calculado na importação da location (ou pelo comando build_circuit_outline); aqui
+# só é lido. Depois de calculado não muda, então a resposta 200 pode ficar em cache no cliente por
+# bastante tempo (erros e 404 não, para o traçado aparecer assim que for calculado).
+class CircuitOutlineByCircuitKey(generics.RetrieveAPIView):
+    serializer_class = CircuitOutlineSerializer
+
+    def get_object(self):
+        circuit_key = self.request.query_params.get('circuit_key', None)
+        if circuit_key is None:
+            raise ValidationError({"error": "O parâmetro 'circuit_key' é obrigatório."})
+        try:
+            circuit_key = int(circuit_key)
+        except ValueError:
+            raise ValidationError({"error": "O parâmetro 'circuit_key' deve ser um número inteiro."})
+
+        outline = CircuitOutline.objects.filter(circuit_key=circuit_key).first()
+        if outline is None:
+            raise NotFound({"error": f"Traçado não disponível para circuit_key={circuit_key}."})
+        return outline
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code == 200:
+            patch_cache_control(response, public=True, max_age=CIRCUIT_OUTLINE_MAX_AGE)
+        return response
+
 # NOVO ENDPOINT: para obter as datas MIN e MAX de location
 class MinMaxLocationDate(APIView):
     def get(self, request, *args, **kwargs):
@@ -530,20 +754,115 @@ class MinMaxLocationDate(APIView):
         except ValueError:
             raise ValidationError({"error": "Parâmetros inválidos. 'session_key' e 'driver_number' devem ser inteiros."})
 
+        # Extremos pré-calculados em TelemetryExtent (uma linha pela chave única, sem agregar a location)
         try:
-            dates = Location.objects.filter(
-                session_key=session_key,
-                driver_number=driver_number
-            ).aggregate(min_date=Min('date'), max_date=Max('date'))
+            extent = telemetry_extent('location', session_key, driver_number)
         except OperationalError:
             return Response({"error": "Erro no banco de dados ao buscar as datas Min/Max."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        min_date = dates.get('min_date')
-        max_date = dates.get('max_date')
-
-        if min_date is None or max_date is None:
+        if extent['min_date'] is None or extent['max_date'] is None:
             return Response({'min_date': None, 'max_date': None}, status=status.HTTP_200_OK)
 
         # Usar o novo serializer para formatar a resposta
-        serializer = MinMaxDateSerializer({'min_date': min_date, 'max_date': max_date})
+        serializer = MinMaxDateSerializer(extent)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+# Versão async de MinMaxLocationDate (settings.ASYNC_VIEWS): lê TelemetryExtent (ou sonda a
+# telemetria, para pilotos sem extremos calculados) pelo pool de core/async_db.py.
+class AsyncMinMaxLocationDate(View):
+    async def get(self, request):
+        try:
+            session_key = parse_int_param(request.GET, 'session_key')
+            driver_number = parse_int_param(request.GET, 'driver_number')
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        extent = await atelemetry_extent('location', session_key, driver_number)
+        if extent['min_date'] is None or extent['max_date'] is None:
+            return JsonResponse({'min_date': None, 'max_date': None})
+
+        serializer = MinMaxDateSerializer(extent)
+        return JsonResponse(serializer.data)
+
+# Endpoint "bundle" da sessão: tudo o que o dashboard precisa na abertura de uma sessão numa
+# única resposta (sessão, circuito, pilotos, clima, resultados, race control e os extremos da
+# telemetria de cada piloto). Cada parte é uma consulta indexada; a resposta inteira fica no
+# cache de respostas e só é remontada quando algum dos datasets é reimportado.
+@method_decorator(cache_by_data_version('sessions', 'drivers', 'weather', 'session_results', 'race_control', 'location', 'cardata'), name='dispatch')
+class SessionBundleBySession(APIView):
+    def get(self, request, *args, **kwargs):
+        session_key = request.query_params.get('session_key')
+
+        if not session_key:
+            return Response({"error": "session_key is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            session_key = int(session_key)
+        except ValueError:
+            return Response({"error": "O parâmetro 'session_key' deve ser um número inteiro."}, status=status.HTTP_400_BAD_REQUEST)
+
+        session = Sessions.objects.filter(session_key=session_key).first()
+        if session is None:
+            return Response({"error": f"Sessão com session_key {session_key} não encontrada."}, status=status.HTTP_404_NOT_FOUND)
+
+        circuit = Circuit.objects.filter(circuitid=session.circuit_key).first() if session.circuit_key is not None else None
+
+        return Response({
+            'session': SessionSerializer(session).data,
+            'circuit': CircuitSerializer(circuit).data if circuit else None,
+            'drivers': DriversSerializer(Drivers.objects.filter(session_key=session_key).order_by('driver_number'), many=True).data,
+            'weather': WeatherSerializer(Weather.objects.filter(session_key=session_key).order_by('session_date'), many=True).data,
+            'session_results': SessionResultSerializer(session_classification(session_key), many=True).data,
+            'race_control': RaceControlSerializer(race_control_rows(session_key), many=True).data,
+            'telemetry_extents': TelemetryExtentSerializer(telemetry_extents(session_key), many=True).data,
+        }, status=status.HTTP_200_OK)
+
+# Live timing (Server-Sent Events) de uma sessão: posições, intervalos, voltas e mensagens de
+# race control novas, enviadas assim que os importadores gravam (core/live.py).
+# Eventos: 'ready', um por dataset ('position', 'intervals', 'laps', 'race_control') com
+# {"session_key", "rows"} no formato dos endpoints REST, e 'resync' quando o cliente ficou para trás.
+# Uma volta já enviada volta a aparecer em 'laps' quando é atualizada (tempo e setores chegam depois).
+# Precisa do servidor ASGI: o LISTEN e as conexões abertas vivem no event loop do processo.
+class LiveTimingStream(View):
+    async def get(self, request):
+        if not settings.ASYNC_VIEWS:
+            return JsonResponse({'error': 'O live timing só está disponível com o servidor ASGI.'}, status=503)
+        try:
+            session_key = parse_int_param(request.GET, 'session_key')
+        except TelemetryParamError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        response = StreamingHttpResponse(live.event_stream(session_key), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no' # Sem buffer no nginx
+        return response
+
+# Probes do Kubernetes (_manifests/base/appserver-deployment.yaml).
+# Liveness: só confirma que o processo responde (não consulta o banco, para que uma queda do
+# PostgreSQL não reinicie todos os pods). Readiness: o pod só recebe tráfego se conseguir uma
+# conexão do pool e executar uma consulta.
+# As duas são async: via ASGI respondem direto no event loop, sem esperar vaga na thread das views
+# sync (um pod ocupado com consultas lentas continua respondendo à liveness).
+class LivenessView(View):
+    async def get(self, request):
+        return JsonResponse({'status': 'ok'})
+
+class ReadinessView(View):
+    async def get(self, request):
+        try:
+            # Via ASGI a consulta sai do pool async (o mesmo das views de telemetria); via WSGI
+            # cada requisição roda num event loop novo, então usa a conexão do ORM
+            if settings.ASYNC_VIEWS:
+                check = async_db.fetch_one(Meetings.objects.values_list('pk'))
+            else:
+                check = sync_to_async(self.check_orm)()
+            await asyncio.wait_for(check, READINESS_TIMEOUT)
+        except (DatabaseError, psycopg.Error, OSError, TimeoutError) as e:
+            logger.warning("Readiness: banco indisponível: %r", e)
+            return JsonResponse({'status': 'unavailable', 'error': 'Banco de dados indisponível.'}, status=503)
+        return JsonResponse({'status': 'ok'})
+
+    @staticmethod
+    def check_orm():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
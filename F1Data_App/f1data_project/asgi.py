@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'f1data_project.settings')
+# Via ASGI os endpoints de telemetria usam as views async (core/async_db.py);
+# as demais views sync rodam numa thread por requisição.
+# Servidor: uvicorn f1data_project.asgi:application --host 0.0.0.0 --port 8000 (ver Dockerfile)
+os.environ.setdefault('ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
@@ -25,7 +25,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-6-%)vne&hanmp1gd-##u3*717$oo*to99&17&_v5acja@5qe@3'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# DEBUG_MODE vem do ConfigMap/overlay do Kubernetes ('0' em produção)
+DEBUG = os.environ.get('DEBUG_MODE', '1') == '1'
 
 ALLOWED_HOSTS = ['*']
 
@@ -86,9 +87,23 @@ DATABASES = {
         'PORT': os.environ.get('DB_PORT'),
         'PASSWORD': os.environ.get('DB_PASSWORD'),
         'OPTIONS': {'client_encoding': 'UTF8'},
+        # Verifica se a conexão ainda está viva antes de reutilizá-la (pool ou conexão persistente)
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Pool de conexões do ORM (psycopg 3), um por processo: cada requisição pega uma conexão já
+# aberta em vez de abrir uma nova. DB_POOL=0 volta para conexões persistentes por thread.
+# Conexões por processo: DB_POOL_MAX_SIZE (ORM) + ASYNC_DB_POOL_MAX_SIZE (views async).
+if os.environ.get('DB_POOL', '1').lower() in ('1', 'true'):
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 5)),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -145,4 +160,49 @@ CORS_ALLOWED_ORIGINS = [
     "http://192.168.0.53:30080",
     "http://192.168.0.53:30080",
     "http://norbiato.ddns.net:7000",
-]
\ No newline at end of file
+]
+# Cabeçalhos de resposta que o frontend precisa ler via fetch (cursor das janelas de telemetria)
+CORS_EXPOSE_HEADERS = [
+    "X-Next-Date",
+]
+
+# Cache das respostas da API (core/response_cache.py).
+# Local em memória por padrão; com REDIS_URL definido, usa um Redis (ou compatível) compartilhado
+# entre os processos/réplicas. As entradas são invalidadas pela versão dos dados da sessão
+# (tabela data_version, incrementada pelos importadores), não por tempo.
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'f1data-api',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+API_RESPONSE_CACHE = 'default'
+API_RESPONSE_CACHE_TIMEOUT = 7 * 24 * 60 * 60  # Só para liberar espaço; a validade vem da versão dos dados
+# Cache-Control enviado ao navegador: 'no-cache' (sempre revalida com o ETag, resposta 304 barata)
+# enquanto a sessão pode receber dados; max-age longo só quando a sessão (ou todas as sessões do
+# meeting) terminou há mais de API_FINISHED_SESSION_GRACE, quando os importadores já passaram
+API_FINISHED_SESSION_GRACE = 24 * 60 * 60  # segundos depois do date_end
+API_FINISHED_SESSION_MAX_AGE = 24 * 60 * 60  # max-age (segundos) das sessões terminadas
+API_RESPONSE_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Respostas maiores não vão para o cache (nem são comprimidas)
+
+# Views async (core/async_db.py). O asgi.py liga ASYNC_VIEWS, então com o servidor ASGI
+# (uvicorn, ver Dockerfile) os endpoints de telemetria usam as versões async; via WSGI/runserver
+# continuam as versões sync. O pool async é por processo e separado das conexões do ORM.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False').lower() in ('1', 'true')
+ASYNC_DB_POOL_MIN_SIZE = int(os.environ.get('ASYNC_DB_POOL_MIN_SIZE', 2))
+ASYNC_DB_POOL_MAX_SIZE = int(os.environ.get('ASYNC_DB_POOL_MAX_SIZE', 10))
+ASYNC_DB_POOL_TIMEOUT = float(os.environ.get('ASYNC_DB_POOL_TIMEOUT', 30))  # Espera máxima (s) por uma conexão livre
+# Via ASGI as demais views (sync) rodam num pool de threads próprio (core/threaded_views.py), uma
+# requisição por thread; o padrão acompanha o pool do ORM para as threads não esperarem conexão.
+SYNC_VIEW_THREADS = int(os.environ.get('SYNC_VIEW_THREADS', os.environ.get('DB_POOL_MAX_SIZE', 5)))
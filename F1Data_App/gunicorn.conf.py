@@ -0,0 +1,70 @@
+# G:\Learning\F1Data\F1Data_App\gunicorn.conf.py
+# Configuração de produção do servidor da API (carregada automaticamente pelo gunicorn a partir do
+# WORKDIR, ver Dockerfile): gunicorn faz o prefork dos workers e cada worker é um uvicorn servindo
+# f1data_project.asgi (views async de telemetria + views sync em threads).
+#   gunicorn f1data_project.asgi:application
+# O número de workers segue o limite de CPU do container, não os cores do nó.
+import gc
+import math
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+# Carrega Django, models, numpy etc. uma vez no processo mestre antes do fork: o código e os
+# dados de referência somente leitura ficam compartilhados entre os workers (copy-on-write).
+preload_app = True
+
+WORKERS_PER_CPU = float(os.environ.get('GUNICORN_WORKERS_PER_CPU', 2))
+MIN_WORKERS = 2
+
+
+def cpu_limit():
+    """CPUs disponíveis para o container: Downward API, depois cgroup (v2 e v1), depois os cores visíveis."""
+    millicores = os.environ.get('CPU_LIMIT_MILLICORES') # resourceFieldRef limits.cpu com divisor 1m
+    if millicores:
+        return int(millicores) / 1000
+
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return len(os.sched_getaffinity(0))
+
+
+# WEB_CONCURRENCY (convenção do gunicorn) tem precedência sobre o cálculo
+workers = int(os.environ.get('WEB_CONCURRENCY') or max(MIN_WORKERS, math.ceil(cpu_limit() * WORKERS_PER_CPU)))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Recicla workers periodicamente (com jitter para não reiniciarem todos juntos)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+
+
+def pre_fork(server, worker):
+    # Nenhuma conexão aberta no mestre pode ser herdada pelos workers
+    from django.db import connections
+    connections.close_all()
+    # Tira os objetos do preload da coleta de lixo: o GC não toca nas páginas compartilhadas
+    # e elas não são copiadas para cada worker
+    gc.freeze()